@@ -1,7 +1,7 @@
 from django.db import models
 from utils.helper import OptimalImageField
 from django_ckeditor_5.fields import CKEditor5Field
-from dashboard.models import BaseModel
+from dashboard.models import LIVE, BaseModel, TimeOrderedBaseModel, indexed_is_deleted
 # Create your models here.
 
 class AcademyBlog(BaseModel):
@@ -24,6 +24,12 @@ class AcademyBlog(BaseModel):
         verbose_name = 'Blog'
         verbose_name_plural = 'Blogs'
         ordering = ('-date_added',)
+        indexes = [
+            # Keyset pagination and public listing order
+            models.Index(fields=['-date_added', '-id'], name='academy_blogs_keyset_idx', condition=LIVE),
+            # Detail pages
+            models.Index(fields=['slug'], name='academy_blogs_slug_live_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.title if self.title else str(self.id)
@@ -38,16 +44,21 @@ class AcademyFAQ(BaseModel):
         verbose_name = 'FAQ'
         verbose_name_plural = "FAQs"
         ordering = ('-date_added',)
+        indexes = [
+            # Public listing order
+            models.Index(fields=['-date_added', '-id'], name='academy_faq_live_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.question if self.question else str(self.id)
     
     
-class AcademyEnquiry(BaseModel):
+class AcademyEnquiry(TimeOrderedBaseModel):
     name = models.CharField(max_length=255, blank=True, null=True)
     number = models.CharField(max_length=100, blank=True, null=True)
     email = models.EmailField(blank=True, null=True)
     program = models.CharField(max_length=255, blank=True, null=True)
+    is_deleted = indexed_is_deleted()
 
     class Meta:
         db_table = "academy.enquiry"
@@ -57,7 +68,7 @@ class AcademyEnquiry(BaseModel):
     def __str__(self):
         return self.name if self.name else str(self.id)
     
-class AcademyGallery(BaseModel):
+class AcademyGallery(TimeOrderedBaseModel):
     image = OptimalImageField(
         upload_to='academy/gallery/',
         size_threshold_kb=600,  
@@ -71,6 +82,10 @@ class AcademyGallery(BaseModel):
         verbose_name = 'Gallery'
         verbose_name_plural = 'Galleries'
         ordering = ('-date_added',)
+        indexes = [
+            # Keyset pagination and public listing order
+            models.Index(fields=['-date_added', '-id'], name='academy_gallery_keyset_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.image_alt if self.image_alt else str(self.id)
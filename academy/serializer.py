@@ -1,48 +1,57 @@
 from rest_framework import serializers
 from .models import *
+from utils.fragments import FragmentCacheListSerializer
+from utils.media import MediaURLSerializerMixin
+from utils.sparse import SparseFieldsetMixin
 
 
-class AcademyBlogSerializer(serializers.ModelSerializer):
+class AcademyBlogSerializer(SparseFieldsetMixin, MediaURLSerializerMixin, serializers.ModelSerializer):
     date_added = serializers.SerializerMethodField()
     class Meta:
         model = AcademyBlog
         fields = ['id', 'title', 'image', 'image_alt', 'introduction', 'slug', 'date_added']
+        listing_fields = ['id', 'title', 'image', 'image_alt', 'slug', 'date_added']
+        list_serializer_class = FragmentCacheListSerializer
 
     def get_date_added(self, obj):
         return obj.date_added.strftime("%d %b %Y") if obj.date_added else None
 
 
-class AcademyRelatedBlogSerializer(serializers.ModelSerializer):
+class AcademyRelatedBlogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     date_added = serializers.SerializerMethodField()
     class Meta:
         model = AcademyBlog
         fields = ['id', 'title', 'slug', 'date_added']
+        listing_fields = fields
 
     def get_date_added(self, obj):
         return obj.date_added.strftime("%d %b %Y") if obj.date_added else None
 
 
-class AcademyBlogDetailSerializer(serializers.ModelSerializer):
+class AcademyBlogDetailSerializer(SparseFieldsetMixin, MediaURLSerializerMixin, serializers.ModelSerializer):
     date_added = serializers.SerializerMethodField()
 
     class Meta:
         model = AcademyBlog
         fields = ['id', 'title', 'image', 'image_alt', 'introduction', 'slug',
             'description', 'meta_title', 'meta_description', 'date_added']
+        listing_fields = ['id', 'title', 'image', 'image_alt', 'slug', 'meta_title', 'meta_description', 'date_added']
 
     def get_date_added(self, obj):
         return obj.date_added.strftime("%d %b %Y") if obj.date_added else None
 
 
-class AcademyFAQSerializer(serializers.ModelSerializer):
+class AcademyFAQSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = AcademyFAQ
         fields = ['id', 'question', 'answer']
+        listing_fields = ['id', 'question']
 
-class AcademyGallerySerializer(serializers.ModelSerializer):
+class AcademyGallerySerializer(SparseFieldsetMixin, MediaURLSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = AcademyGallery
         fields = ['id', 'image', 'image_alt']
+        listing_fields = fields
         
 class AcademyEnquirySerializer(serializers.ModelSerializer):
     date_added = serializers.SerializerMethodField()
@@ -1,3 +1,35 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from academy import models as academy_model
+from client.tests import API_TEST_SETTINGS, QueryBudgetTestMixin
+
+
+@override_settings(**API_TEST_SETTINGS)
+class AcademyQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for n in range(12):
+            academy_model.AcademyFAQ.objects.create(question=f'Question {n}?', answer='<p>Answer</p>')
+            academy_model.AcademyBlog.objects.create(
+                title=f'Blog {n}', introduction='<p>Intro</p>', description='<p>Body</p>', slug=f'blog-{n}',
+            )
+            academy_model.AcademyGallery.objects.create(image=f'academy/gallery/{n}.webp')
+
+    def test_faq(self):
+        self.get_within_budget('/api/v1/academy/faq/')
+
+    def test_blogs(self):
+        self.get_within_budget('/api/v1/academy/blogs/?page=2')
+
+    def test_blogs_cursor(self):
+        self.get_within_budget('/api/v1/academy/blogs/?cursor=')
+
+    def test_blog_detail(self):
+        self.get_within_budget('/api/v1/academy/blog/blog-3')
+
+    def test_gallery(self):
+        self.get_within_budget('/api/v1/academy/gallery/')
+
+    def test_gallery_cursor(self):
+        self.get_within_budget('/api/v1/academy/gallery/?cursor=')
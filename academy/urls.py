@@ -1,10 +1,11 @@
 from django.urls import path
 from . import views
+from client.asyncviews import api_view
 urlpatterns = [
-path('faq/', views.AcademyFaqAPIView.as_view(), name='faq-get'),
-    path('blogs/', views.AcademyBlogsAPIView.as_view(), name='blog-get'),
-    path('blog/<slug:slug>', views.AcademyBlogsAPIView.as_view(), name='blog-details'),
-    path('gallery/', views.GalleryAPIView.as_view(), name='gallery-get'),
+path('faq/', api_view(views.AcademyFaqAPIView), name='faq-get'),
+    path('blogs/', api_view(views.AcademyBlogsAPIView), name='blog-get'),
+    path('blog/<slug:slug>', api_view(views.AcademyBlogsAPIView), name='blog-details'),
+    path('gallery/', api_view(views.GalleryAPIView), name='gallery-get'),
     path('enquiry/', views.AcademyEnquiryAPIView.as_view(), name="user-enquiry"),
 
 ]
@@ -8,10 +8,15 @@ from academy import serializer as academy_serializer
 from academy import models as academy_model
 
 from django.conf import settings
-from django.core.mail import send_mail
 from django.template.loader import get_template
 
-from client.views import CustomPageNumberPagination
+from client.views import CustomPageNumberPagination, keyset_response_data
+from client.caching import add_surrogate_keys, cached_response
+from utils import surrogate
+from utils.concurrency import run_concurrently
+from utils.mail import send_mail_in_background
+from utils.pagination import KeysetPagination, keyset_query_budget
+from utils.prefetch import plan_queryset
 
 import logging
 
@@ -26,62 +31,12 @@ class AcademyBlogsAPIView(APIView):
     pagination_class = CustomPageNumberPagination
     model = academy_model.AcademyBlog
     serializers_class = academy_serializer.AcademyBlogSerializer
+    cache_models = (academy_model.AcademyBlog,)
+    query_budget = 2
 
     def get(self, request, slug = None):
         try:
-            if slug:
-                instance = self.get_object(slug)
-                if not instance:
-                    return Response({
-                        "StatusCode": 6002,
-                        "details": "Error",
-                        "message": "Blog not found",
-                    }, status=status.HTTP_404_NOT_FOUND)
-
-                serializer = academy_serializer.AcademyBlogDetailSerializer(
-                    instance, 
-                    context={'request': request}
-                )
-
-                related_blogs = self.model.objects.filter(is_deleted=False).exclude(slug=slug)[:3]
-                related_serializer = academy_serializer.AcademyRelatedBlogSerializer(
-                    related_blogs, 
-                    many=True, 
-                    context={'request': request}
-                )
-                response_data = {
-                    "StatusCode": 6000,
-                    "details": "Success",
-                    "data": serializer.data,
-                    "related_blogs": related_serializer.data,
-                    "message": "Academy blog details retrieved successfully"
-                }
-                return Response(response_data, status=status.HTTP_200_OK)
-
-            queryset = self.model.objects.filter(is_deleted=False)
-            paginator = self.pagination_class()
-            page = paginator.paginate_queryset(queryset, request)
-
-            serializer = self.serializers_class(
-                    page, 
-                    many=True, 
-                    context={'request': request}
-                )
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "pagination": {
-                        "total_items": paginator.page.paginator.count,
-                        "total_pages": paginator.page.paginator.num_pages,
-                        "current_page": paginator.page.number,
-                        "next": paginator.get_next_link(),
-                        "previous": paginator.get_previous_link()
-                    },
-                "message" : "Academy blog's data fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request, slug))
         except Exception as e:
             logger.error(f"Error retrieving Blog's: {str(e)}")
             return Response({
@@ -92,9 +47,80 @@ class AcademyBlogsAPIView(APIView):
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_response_data(self, request, slug = None):
+        if slug:
+            # The detail and the related blogs are independent queries
+            instance, related_blogs = run_concurrently(
+                lambda: self.get_object(slug),
+                lambda: self.get_related_blogs(request, slug),
+            )
+            if not instance:
+                return {
+                    "StatusCode": 6002,
+                    "details": "Error",
+                    "message": "Blog not found",
+                }, status.HTTP_404_NOT_FOUND
+
+            # Related blogs change whenever any blog does
+            add_surrogate_keys(request, surrogate.object_key(self.model, instance.pk), surrogate.model_key(self.model))
+            serializer = academy_serializer.AcademyBlogDetailSerializer(
+                instance,
+                context={'request': request}
+            )
+            response_data = {
+                "StatusCode": 6000,
+                "details": "Success",
+                "data": serializer.data,
+                "related_blogs": related_blogs,
+                "message": "Academy blog details retrieved successfully"
+            }
+            return response_data, status.HTTP_200_OK
+
+        queryset = plan_queryset(
+            self.model.live.all(), self.serializers_class,
+            required=('date_added',), context={'request': request}
+        )
+        if KeysetPagination.is_requested(request):
+            return keyset_response_data(request, queryset, self.serializers_class, "Academy blog's data fetched successfully")
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(queryset, request)
+
+        serializer = self.serializers_class(
+                page,
+                many=True,
+                context={'request': request}
+            )
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "pagination": {
+                    "total_items": paginator.page.paginator.count,
+                    "total_pages": paginator.page.paginator.num_pages,
+                    "current_page": paginator.page.number,
+                    "next": paginator.get_next_link(),
+                    "previous": paginator.get_previous_link()
+                },
+            "message" : "Academy blog's data fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
+
+    def get_related_blogs(self, request, slug):
+        related_blogs = plan_queryset(
+            self.model.live.exclude(slug=slug),
+            academy_serializer.AcademyRelatedBlogSerializer,
+            context={'request': request}
+        )[:3]
+        return academy_serializer.AcademyRelatedBlogSerializer(related_blogs, many=True, context={'request': request}).data
+
     def get_object(self, slug):
         try:
-            return self.model.objects.filter(slug=slug).first()
+            return plan_queryset(
+                self.model.live.filter(slug=slug), academy_serializer.AcademyBlogDetailSerializer,
+                context={'request': self.request}
+            ).first()
         except Exception as e:
             logger.error(f"Error retrieving object: {str(e)}")
             return None
@@ -103,18 +129,12 @@ class AcademyFaqAPIView(APIView):
     """
     API view for fetching academy faq data for users.
     """
+    cache_models = (academy_model.AcademyFAQ,)
+    query_budget = 1
+
     def get(self, request):
         try:
-            queryset = academy_model.AcademyFAQ.objects.filter(is_deleted=False)
-            serializer = academy_serializer.AcademyFAQSerializer(queryset, many=True, context={'request': request})
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "message" : "Academy faq data fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request))
         except Exception as e:
             logger.error(f"Error retrieving academy faq data: {str(e)}")
             return Response({
@@ -124,6 +144,21 @@ class AcademyFaqAPIView(APIView):
                 "message": "Failed to retrieve academy faq data",
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def get_response_data(self, request):
+        queryset = plan_queryset(
+            academy_model.AcademyFAQ.live.all(), academy_serializer.AcademyFAQSerializer,
+            context={'request': request}
+        )
+        serializer = academy_serializer.AcademyFAQSerializer(queryset, many=True, context={'request': request})
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "message" : "Academy faq data fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
             
 class GalleryAPIView(APIView):
     """
@@ -131,19 +166,12 @@ class GalleryAPIView(APIView):
     """
     models = academy_model.AcademyGallery
     serializers_class = academy_serializer.AcademyGallerySerializer
+    cache_models = (academy_model.AcademyGallery,)
+    query_budget = keyset_query_budget(1)
+
     def get(self, request):
         try:
-
-            queryset = self.models.objects.filter(is_deleted=False)
-            serializer = self.serializers_class(queryset, many=True, context={'request': request})
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "message" : "Gallery images fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request))
         except Exception as e:
             logger.error(f"Error retrieving Gallery: {str(e)}")
             return Response({
@@ -153,6 +181,23 @@ class GalleryAPIView(APIView):
                 "message": "Failed to retrieve Gallery",
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def get_response_data(self, request):
+        queryset = plan_queryset(
+            self.models.live.all(), self.serializers_class,
+            required=('date_added',), context={'request': request}
+        )
+        if KeysetPagination.is_requested(request):
+            return keyset_response_data(request, queryset, self.serializers_class, "Gallery images fetched successfully")
+        serializer = self.serializers_class(queryset, many=True, context={'request': request})
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "message" : "Gallery images fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
                     
 class AcademyEnquiryAPIView(APIView):
     def post(self,request):
@@ -169,7 +214,7 @@ class AcademyEnquiryAPIView(APIView):
                     'date_added': serializer.data['date_added']
                 }
                 template = get_template('academy_enquiry.html').render(context, request=request)
-                send_mail(
+                send_mail_in_background(
                     'Enquiry Data from academy.adbox.in',
                     None, 
                     settings.EMAIL_HOST_USER,
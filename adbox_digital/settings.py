@@ -12,7 +12,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 from datetime import timedelta
-from decouple import Config,config
+from decouple import Config,config,Csv
 from django.conf import settings
 import os
 
@@ -53,15 +53,38 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'utils.profiling.ProfilingMiddleware',
+    'utils.compression.CompressionMiddleware',
+    'utils.queries.QueryInstrumentationMiddleware',
+    'utils.routing.RouteGroupMiddleware',
+    'utils.replicas.ReplicaRoutingMiddleware',
+    'utils.routing.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'corsheaders.middleware.CorsMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'utils.routing.CsrfViewMiddleware',
+    'utils.routing.AuthenticationMiddleware',
+    'utils.routing.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Route groups (utils.routing). The public API is anonymous and read-only, so
+# its GETs skip sessions, CSRF, auth, messages and JWT parsing. Everything
+# else, the admin and dashboard API included, runs the full stack.
+ROUTE_GROUPS = {
+    'public-api': {
+        'prefixes': ['/api/v1/client/', '/api/v1/academy/'],
+        'methods': ['GET', 'HEAD', 'OPTIONS'],
+        'skip_middleware': [
+            'django.contrib.sessions.middleware.SessionMiddleware',
+            'django.middleware.csrf.CsrfViewMiddleware',
+            'django.contrib.auth.middleware.AuthenticationMiddleware',
+            'django.contrib.messages.middleware.MessageMiddleware',
+        ],
+        'authenticate': False,
+        'read_replica': True,
+    },
+}
+
 ROOT_URLCONF = 'adbox_digital.urls'
 
 TEMPLATES = [
@@ -86,14 +109,29 @@ WSGI_APPLICATION = 'adbox_digital.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# With DB_POOL each worker process keeps up to DB_POOL_MAX_SIZE connections
+# open and shares them between its threads (utils.db_pool); connections go
+# back to the pool at the end of each request. Without it, DB_CONN_MAX_AGE
+# keeps one persistent connection per thread, health-checked before reuse.
+DB_POOL = config('DB_POOL', default=True, cast=bool)
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'utils.db_backends.postgresql' if DB_POOL else 'django.db.backends.postgresql',
         'NAME': config('dbname'),                      
         'USER': config('dbuser'),
         'PASSWORD': config('dbpass'),
         'HOST': config('dbhost'),
         'PORT': '5432',
+        'CONN_MAX_AGE': 0 if DB_POOL else config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        'POOL': {
+            'MAX_SIZE': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'TIMEOUT': config('DB_POOL_TIMEOUT', default=10, cast=float),
+            'MAX_IDLE': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+            'MAX_LIFETIME': config('DB_POOL_MAX_LIFETIME', default=3600, cast=float),
+            'CHECK_INTERVAL': config('DB_POOL_CHECK_INTERVAL', default=30, cast=float),
+        },
     }
 }  
 
@@ -159,12 +197,172 @@ CORS_ALLOWED_ORIGINS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'utils.routing.RouteGroupJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'utils.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
 
+# Caches. The default cache keeps a small per-process LRU in front of the
+# shared cache at REDIS_URL. Invalidation between workers goes through the
+# shared tier, so without REDIS_URL nothing is cached at all; tests pair
+# TwoTierCache with a LocMemCache L2 and its LOCAL_L2 option instead.
+REDIS_URL = config('REDIS_URL', default='')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'utils.cache_backends.TwoTierCache',
+        'OPTIONS': {
+            'L2': 'shared',
+            'L1_MAX_ENTRIES': config('CACHE_L1_MAX_ENTRIES', default=1024, cast=int),
+            'L1_TIMEOUT': config('CACHE_L1_TIMEOUT', default=30, cast=float),
+            'SYNC_INTERVAL': config('CACHE_SYNC_INTERVAL', default=1, cast=float),
+        },
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'adbox',
+    },
+} if REDIS_URL else {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    },
+}
+
+# Public API response cache. Entries are invalidated on writes to the tables
+# they read from, and stale copies are kept around to serve while rebuilding.
+# Invalidation only reaches every worker through a shared cache, so it is
+# off unless REDIS_URL is set.
+API_RESPONSE_CACHE = config('API_RESPONSE_CACHE', default=bool(REDIS_URL), cast=bool)
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=60 * 60, cast=int)
+API_CACHE_STALE_TIMEOUT = config('API_CACHE_STALE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
+# Lifetime of results cached with BaseModel.objects...cached(); they are also
+# invalidated on any write to the tables they read.
+QUERYSET_CACHE_TIMEOUT = config('QUERYSET_CACHE_TIMEOUT', default=60 * 5, cast=int)
+
+# Per-row serializer output; keys include date_updated so edits never need
+# an explicit invalidation.
+FRAGMENT_CACHE_TIMEOUT = config('FRAGMENT_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
+# CDN surrogate-key purging. Public responses carry Surrogate-Key/Cache-Tag
+# headers; saves and deletes purge the matching keys at CDN_PURGE_URL.
+CDN_PURGE_URL = config('CDN_PURGE_URL', default='')
+CDN_PURGE_TOKEN = config('CDN_PURGE_TOKEN', default='')
+CDN_PURGE_DEBOUNCE = config('CDN_PURGE_DEBOUNCE', default=2.0, cast=float)
+CDN_PURGE_MAX_DELAY = config('CDN_PURGE_MAX_DELAY', default=10.0, cast=float)
+CDN_SURROGATE_MAX_AGE = config('CDN_SURROGATE_MAX_AGE', default=60 * 60 * 24 * 30, cast=int)
+
+# Static JSON prebuild of the public API (manage.py build_static_api). With
+# STATIC_API_AUTOBUILD on, saves regenerate the affected files in the background.
+STATIC_API_ROOT = config('STATIC_API_ROOT', default=os.path.join(BASE_DIR, 'static_api'))
+STATIC_API_HOST = config('STATIC_API_HOST', default='localhost')
+STATIC_API_SCHEME = config('STATIC_API_SCHEME', default='https')
+STATIC_API_AUTOBUILD = config('STATIC_API_AUTOBUILD', default=False, cast=bool)
+STATIC_API_DEBOUNCE = config('STATIC_API_DEBOUNCE', default=2.0, cast=float)
+
+# Boot-time warmup (utils.startup), run by wsgi.py and asgi.py before a
+# worker takes traffic: loads the URLconf and serializers and requests
+# WARMUP_PATHS in-process, as WARMUP_HOST, to fill the worker's caches.
+WARMUP_ON_BOOT = config('WARMUP_ON_BOOT', default=False, cast=bool)
+WARMUP_HOST = config('WARMUP_HOST', default=STATIC_API_HOST)
+WARMUP_SCHEME = config('WARMUP_SCHEME', default=STATIC_API_SCHEME)
+WARMUP_PATHS = [
+    '/api/v1/client/homepage/',
+    '/api/v1/client/brand/',
+    '/api/v1/client/our-metrics/',
+    '/api/v1/client/testimonial/',
+    '/api/v1/client/faq/',
+    '/api/v1/client/seo/',
+    '/api/v1/client/services/',
+    '/api/v1/client/blogs/',
+    '/api/v1/academy/faq/',
+    '/api/v1/academy/blogs/',
+]
+
+# Edge nodes: serve the public content from a read-only SQLite snapshot
+# written by manage.py publish_snapshot. Replacing the file is picked up on
+# the next request. Writes (enquiries, applications) still use 'default'.
+DATABASE_ROUTERS = []
+SNAPSHOT_MODE = config('SNAPSHOT_MODE', default=False, cast=bool)
+SNAPSHOT_PATH = config('SNAPSHOT_PATH', default=os.path.join(BASE_DIR, 'snapshot', 'content.sqlite3'))
+SNAPSHOT_MMAP_SIZE = config('SNAPSHOT_MMAP_SIZE', default=256 * 1024 * 1024, cast=int)
+if SNAPSHOT_MODE:
+    DATABASES['snapshot'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        # immutable: no locking or change detection, the file is only ever replaced
+        'NAME': f"file:{SNAPSHOT_PATH}?mode=ro&immutable=1",
+        'OPTIONS': {'uri': True},
+    }
+    DATABASE_ROUTERS.append('client.routers.SnapshotRouter')
+
+# Read replicas (utils.replicas): the public API reads from them, everything
+# else and every write uses the primary. A client that writes is pinned to
+# the primary for DATABASE_PIN_SECONDS, which should exceed the lag allowed.
+DB_REPLICA_HOSTS = config('DB_REPLICA_HOSTS', default='', cast=Csv())
+for n, host in enumerate(DB_REPLICA_HOSTS, 1):
+    DATABASES[f'replica{n}'] = {**DATABASES['default'], 'HOST': host, 'TEST': {'MIRROR': 'default'}}
+DATABASE_REPLICAS = [f'replica{n}' for n in range(1, len(DB_REPLICA_HOSTS) + 1)]
+DATABASE_REPLICA_SELECTION = config('DATABASE_REPLICA_SELECTION', default='round-robin')
+DATABASE_REPLICA_MAX_LAG = config('DATABASE_REPLICA_MAX_LAG', default=5, cast=float)
+DATABASE_REPLICA_LAG_INTERVAL = config('DATABASE_REPLICA_LAG_INTERVAL', default=2, cast=float)
+DATABASE_PIN_SECONDS = config('DATABASE_PIN_SECONDS', default=15, cast=int)
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS.append('client.routers.ReplicaRouter')
+
+# /api/v1/client/batch/: paths per batch. They run on the
+# API_SECTION_WORKERS pool below.
+BATCH_MAX_REQUESTS = config('BATCH_MAX_REQUESTS', default=20, cast=int)
+
+# Async public API views for ASGI deployments (client.asyncviews): cache
+# hits are served on the event loop. Independent sections of a payload
+# (homepage, detail + related) are fetched on up to API_SECTION_WORKERS
+# threads; 1 fetches them one after the other.
+ASYNC_API_VIEWS = config('ASYNC_API_VIEWS', default=False, cast=bool)
+API_SECTION_WORKERS = config('API_SECTION_WORKERS', default=4, cast=int)
+
+# Per-request query counting (utils.queries). Views declare query_budget;
+# going over it is logged, or raised with QUERY_BUDGET_STRICT (use in tests).
+QUERY_INSTRUMENTATION = config('QUERY_INSTRUMENTATION', default=True, cast=bool)
+QUERY_SERVER_TIMING = config('QUERY_SERVER_TIMING', default=True, cast=bool)
+QUERY_BUDGET_STRICT = config('QUERY_BUDGET_STRICT', default=False, cast=bool)
+
+# JSON encoder behind utils.renderers.FastJSONRenderer: auto (orjson when
+# installed), orjson or stdlib.
+JSON_RENDERER_BACKEND = config('JSON_RENDERER_BACKEND', default='auto')
+
+# Per-request CPU profiling (utils.profiling): requests carrying a token
+# from the admin's profiles page, plus a random PROFILING_SAMPLE_RATE share
+# of all requests, are profiled into PROFILING_DIR.
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_DIR = config('PROFILING_DIR', default=os.path.join(BASE_DIR, 'profiles'))
+PROFILING_MAX_FILES = config('PROFILING_MAX_FILES', default=200, cast=int)
+PROFILING_TOKEN_MAX_AGE = config('PROFILING_TOKEN_MAX_AGE', default=60 * 60, cast=int)
+
+# Response compression (utils.compression). Encodings in order of
+# preference; br needs the brotli package. Cached payloads are compressed
+# once at the higher API_CACHED_COMPRESSION_LEVELS.
+API_COMPRESSION_ENCODINGS = config('API_COMPRESSION_ENCODINGS', default='br,gzip', cast=Csv())
+API_COMPRESSION_MIN_SIZE = config('API_COMPRESSION_MIN_SIZE', default=1024, cast=int)
+API_COMPRESSION_CONTENT_TYPES = ['application/json', 'application/xml', 'text/xml', 'text/plain', 'text/csv']
+API_COMPRESSION_LEVELS = {'gzip': 6, 'br': 4}
+API_CACHED_COMPRESSION_LEVELS = {'gzip': 9, 'br': 9}
+
+# Absolute media URLs in API payloads (utils.media). Empty MEDIA_BASE_URL
+# uses the request's scheme and host. Per-variant host lists shard files
+# across hosts, each file always on the same one.
+MEDIA_BASE_URL = config('MEDIA_BASE_URL', default='')
+MEDIA_VARIANT_HOSTS = {
+    'image': config('MEDIA_IMAGE_HOSTS', default='', cast=Csv()),
+    'file': config('MEDIA_FILE_HOSTS', default='', cast=Csv()),
+}
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=365),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=730),
@@ -211,6 +409,8 @@ EMAIL_PORT = 587
 EMAIL_HOST_USER = config('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 EMAIL_USE_TLS = True
+# Enquiry mails are sent on this many background threads (utils.mail).
+MAIL_WORKERS = config('MAIL_WORKERS', default=2, cast=int)
 
 JAZZMIN_SETTINGS = {
     "site_title": "Adbox Admin",
@@ -224,6 +424,7 @@ JAZZMIN_SETTINGS = {
         {"model": "dashboard.Enquiry"},
         {"app": "dashboard"},
         {"app": "academy"},
+        {"name": "Profiles", "url": "profile-list", "permissions": ["auth.view_user"]},
     ],
     "icons": {
         "auth": "fas fa-users-cog",
@@ -20,6 +20,9 @@ from django.conf import settings
 from django.views.static import serve
 from django.shortcuts import redirect
 from django.views.generic.base import TemplateView
+from utils import profiling
+from utils.startup import lazy_view
+from utils.surrogate import serve_media
 
 admin.site.site_header = "Adbox Admin"
 admin.site.site_title = "Adbox Admin"
@@ -28,13 +31,16 @@ admin.site.index_title = "Welcome to Adbox Admin Portal"
 
 urlpatterns = [
     path('', lambda request: redirect('/admin/')),
+    path('admin/profiles/', admin.site.admin_view(profiling.profile_list), name='profile-list'),
+    path('admin/profiles/<str:name>', admin.site.admin_view(profiling.profile_download), name='profile-download'),
     path('admin/', admin.site.urls),
-    path("ckeditor5/", include('django_ckeditor_5.urls')),
+    # Only the admin uploads images; loading the view lazily keeps Pillow out of worker boot
+    path("ckeditor5/image_upload/", lazy_view('django_ckeditor_5.views.upload_file'), name="ck_editor_5_upload_file"),
     path('api/v1/client/', include('client.urls')),
     path('api/v1/dashboard/', include('dashboard.urls')),
     path('api/v1/academy/', include('academy.urls')),
     path("robots.txt",TemplateView.as_view(template_name="robots.txt", content_type="text/plain"),),
 
-    re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
+    re_path(r'^media/(?P<path>.*)$', serve_media, {'document_root': settings.MEDIA_ROOT}),
     re_path(r'^static/(?P<path>.*)$', serve, {'document_root': settings.STATIC_ROOT}),
 ]
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class ClientConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'client'
+
+    def ready(self):
+        from django.conf import settings
+
+        from . import signals  # noqa: F401
+
+        if settings.SNAPSHOT_MODE:
+            from .snapshot import enable_snapshot_mode
+
+            enable_snapshot_mode()
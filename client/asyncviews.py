@@ -0,0 +1,85 @@
+"""
+Async versions of the cached public API views, for ASGI deployments.
+
+Under ASGI, Django runs a sync view on a worker thread for every request.
+``AsyncCachedViewMixin`` makes a view's ``get`` a coroutine that serves
+payloads this process already holds in its cache straight from the event
+loop, with no thread hop; only on a miss does it run the view's regular
+``get`` on a worker thread. ``api_view`` picks the async or the sync class
+for a URL depending on ``ASYNC_API_VIEWS``.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from client.caching import local_cached_response
+from utils.routing import get_route_group
+
+from inspect import isawaitable
+
+_async_classes = {}
+
+
+class AsyncCachedViewMixin:
+    """
+    Serve cache hits on the event loop and fall back to the sync ``get``.
+
+    The view's ``get`` must go through ``cached_response`` with its
+    ``cache_models``. Views that compute them from the request define
+    ``get_cache_models(request)`` instead, returning ``None`` when the
+    request is invalid.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        # APIView.dispatch, awaiting the handler
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            group = get_route_group(request._request)
+            if group is not None and not group.get('authenticate', True):
+                # Anonymous: authentication does no I/O
+                self.initial(request, *args, **kwargs)
+            else:
+                await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def get(self, request, *args, **kwargs):
+        if hasattr(self, 'get_cache_models'):
+            models = self.get_cache_models(request)
+        else:
+            models = self.cache_models
+        response = local_cached_response(request, models) if models is not None else None
+        if response is None:
+            response = await sync_to_async(super().get)(request, *args, **kwargs)
+        return response
+
+
+def async_view_class(view_class):
+    """``view_class`` with ``AsyncCachedViewMixin`` applied."""
+    if view_class not in _async_classes:
+        _async_classes[view_class] = type(
+            f"Async{view_class.__name__}", (AsyncCachedViewMixin, view_class), {'__module__': view_class.__module__}
+        )
+    return _async_classes[view_class]
+
+
+def api_view(view_class, **initkwargs):
+    """``view_class.as_view()``, async when ``ASYNC_API_VIEWS`` is on."""
+    if settings.ASYNC_API_VIEWS:
+        view_class = async_view_class(view_class)
+    return view_class.as_view(**initkwargs)
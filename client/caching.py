@@ -0,0 +1,88 @@
+from django.conf import settings
+from rest_framework.response import Response
+
+from utils.cache import content_cache, get_local_table_versions, get_table_versions
+from utils.compression import compress_variants
+from utils.renderers import PreEncodedJSON, encode_json
+from utils import surrogate
+
+import hashlib
+
+
+def request_cache_key(request):
+    """Cache key for a GET request, including host since payloads embed absolute URLs."""
+    url = request.build_absolute_uri()
+    return "api-response:v2:" + hashlib.md5(url.encode()).hexdigest()
+
+
+def cached_value(key, models, builder, prepare=None):
+    """
+    Return ``builder()`` through the shared content cache.
+
+    The value is cached against the write versions of ``models``, so any save
+    or delete on those tables invalidates it, and concurrent misses are
+    coalesced so only one caller recomputes it. With ``API_RESPONSE_CACHE``
+    off, ``builder()`` is called every time. ``prepare``, when given, turns a
+    built value into the one to store, and only runs when it is stored.
+    """
+    if not settings.API_RESPONSE_CACHE:
+        return builder()
+    if prepare is not None:
+        build, builder = builder, lambda: prepare(build())
+    version = get_table_versions([model._meta.db_table for model in models])
+    return content_cache.get(key, builder, version=version)
+
+
+def add_surrogate_keys(request, *keys):
+    """
+    Tag the response being built with ``keys``.
+
+    Detail payloads call this with the object key of the row they render;
+    responses that add no keys are tagged with the list keys of their models.
+    """
+    request.surrogate_keys.update(keys)
+
+
+def cached_response(request, models, builder):
+    """
+    Serve a view's payload through the shared content cache.
+
+    ``builder`` returns ``(response_data, status_code)``. The payload is cached
+    already encoded, so cache hits skip serialization and JSON encoding. The
+    surrogate keys collected while building are cached with it and sent on
+    every response so the CDN can purge it precisely. Payloads that are
+    stored are cached with their compressed variants too, so hits aren't
+    compressed again either; uncached ones are left to
+    ``CompressionMiddleware``.
+    """
+    def build():
+        request.surrogate_keys = set()
+        response_data, status_code = builder()
+        keys = request.surrogate_keys or {surrogate.model_key(model) for model in models}
+        return encode_json(response_data), status_code, sorted(keys), {}
+
+    def precompress(built):
+        content, status_code, keys, _ = built
+        return content, status_code, keys, compress_variants(content)
+
+    content, status_code, keys, variants = cached_value(request_cache_key(request), models, build, precompress)
+    return surrogate.tag_response(Response(PreEncodedJSON(content, variants), status=status_code), keys)
+
+
+def local_cached_response(request, models):
+    """
+    ``cached_response`` for a payload this process already holds, or ``None``.
+
+    Does no I/O, so async views call it on the event loop and only go to a
+    worker thread on a miss.
+    """
+    if not settings.API_RESPONSE_CACHE:
+        return None
+    version = get_local_table_versions([model._meta.db_table for model in models])
+    if version is None:
+        return None
+    cached = content_cache.get_local(request_cache_key(request), version=version)
+    if cached is None:
+        return None
+    content, status_code, keys, variants = cached
+    return surrogate.tag_response(Response(PreEncodedJSON(content, variants), status=status_code), keys)
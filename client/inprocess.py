@@ -0,0 +1,43 @@
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import resolve
+
+from io import BytesIO
+from urllib.parse import urlsplit
+
+
+def build_get_request(path, host, scheme='https', meta=None):
+    """A bare GET request for ``path`` as if it had arrived at ``host``."""
+    url = urlsplit(path)
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'SCRIPT_NAME': '',
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'SERVER_NAME': host.split(':')[0],
+        'SERVER_PORT': '443' if scheme == 'https' else '80',
+        'HTTP_HOST': host,
+        'wsgi.url_scheme': scheme,
+        'wsgi.input': BytesIO(),
+    }
+    environ.update(meta or {})
+    return WSGIRequest(environ)
+
+
+def call_get(path, host, scheme='https', meta=None):
+    """
+    Run the view behind ``path`` in-process and return its response unrendered.
+
+    The request skips the middleware stack, so this is only meant for the
+    public, anonymous GET endpoints. Raises ``Resolver404`` for unknown paths.
+    """
+    request = build_get_request(path, host, scheme=scheme, meta=meta)
+    match = resolve(request.path_info)
+    return match.func(request, *match.args, **match.kwargs)
+
+
+def render_get(path, host, scheme='https', meta=None):
+    """Like ``call_get`` but with the response rendered to bytes."""
+    response = call_get(path, host, scheme=scheme, meta=meta)
+    if callable(getattr(response, 'render', None)):
+        response.render()
+    return response
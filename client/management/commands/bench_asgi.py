@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+
+from client.inprocess import build_get_request
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import asyncio
+import statistics
+import time
+
+
+def _percentile(latencies, fraction):
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load public API paths in-process through the WSGI and the ASGI handler at the "
+        "same concurrency and compare throughput and latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--host', default='localhost')
+        parser.add_argument('paths', nargs='*', default=[
+            '/api/v1/client/homepage/',
+            '/api/v1/client/blogs/',
+            '/api/v1/client/faq/',
+            '/api/v1/academy/blogs/',
+        ])
+
+    def run_wsgi(self, paths, host, total, concurrency):
+        handler = WSGIHandler()
+        environs = [build_get_request(path, host, scheme='http').environ for path in paths]
+
+        def start_response(status, headers):
+            pass
+
+        def call(n):
+            started = time.perf_counter()
+            response = handler(dict(environs[n % len(environs)]), start_response)
+            body = b''.join(response)
+            response.close()
+            return time.perf_counter() - started, response.status_code, body
+
+        for n in range(len(paths)):
+            call(n)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            started = time.perf_counter()
+            results = list(executor.map(call, range(total)))
+            return time.perf_counter() - started, results
+
+    def run_asgi(self, paths, host, total, concurrency):
+        application = get_asgi_application()
+
+        async def call(n):
+            url = urlsplit(paths[n % len(paths)])
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+                'method': 'GET', 'scheme': 'http', 'root_path': '',
+                'path': url.path, 'raw_path': url.path.encode(), 'query_string': url.query.encode(),
+                'headers': [(b'host', host.encode())],
+                'client': ('127.0.0.1', 0), 'server': (host, 80),
+            }
+            received = False
+
+            async def receive():
+                nonlocal received
+                if not received:
+                    received = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                # The client stays connected until the handler stops listening
+                await asyncio.Event().wait()
+
+            messages = []
+
+            async def send(message):
+                messages.append(message)
+
+            started = time.perf_counter()
+            await application(scope, receive, send)
+            body = b''.join(message.get('body', b'') for message in messages[1:])
+            return time.perf_counter() - started, messages[0]['status'], body
+
+        async def run():
+            for n in range(len(paths)):
+                await call(n)
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def limited(n):
+                async with semaphore:
+                    return await call(n)
+
+            started = time.perf_counter()
+            results = await asyncio.gather(*(limited(n) for n in range(total)))
+            return time.perf_counter() - started, results
+
+        return asyncio.run(run())
+
+    def handle(self, *args, **options):
+        paths, host = options['paths'], options['host']
+        total, concurrency = options['requests'], options['concurrency']
+        self.stdout.write(
+            f"{total} requests over {len(paths)} paths, {concurrency} concurrent, "
+            f"ASYNC_API_VIEWS={settings.ASYNC_API_VIEWS}"
+        )
+        self.stdout.write(f"{'handler':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+
+        bodies = {}
+        for name, run in (('wsgi', self.run_wsgi), ('asgi', self.run_asgi)):
+            elapsed, results = run(paths, host, total, concurrency)
+            latencies = [latency for latency, _, _ in results]
+            errors = sum(1 for _, status_code, _ in results if status_code >= 500)
+            bodies[name] = [body for _, _, body in results[:len(paths)]]
+            self.stdout.write(
+                f"{name:<8}{total / elapsed:>10.0f}{statistics.median(latencies) * 1000:>10.2f}"
+                f"{_percentile(latencies, 0.99) * 1000:>10.2f}{errors:>8}"
+            )
+        if bodies['wsgi'] != bodies['asgi']:
+            self.stdout.write(self.style.ERROR("WSGI and ASGI responses differ"))
@@ -0,0 +1,47 @@
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from client.inprocess import build_get_request
+
+import timeit
+
+
+class Command(BaseCommand):
+    help = "Time public API requests through the full middleware stack with and without route groups."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--host', default='localhost')
+        parser.add_argument('paths', nargs='*', default=[
+            '/api/v1/client/brand/',
+            '/api/v1/client/faq/',
+            '/api/v1/client/blogs/',
+            '/api/v1/academy/faq/',
+        ])
+
+    def time_request(self, handler, environ, iterations, repeat):
+        def start_response(status, headers):
+            pass
+
+        def run():
+            response = handler(dict(environ), start_response)
+            b''.join(response)
+            response.close()
+
+        # Warm the response cache so the view itself costs little
+        run()
+        return min(timeit.repeat(run, number=iterations, repeat=repeat)) / iterations * 1e6
+
+    def handle(self, *args, **options):
+        iterations, repeat = options['iterations'], options['repeat']
+        handler = WSGIHandler()
+        self.stdout.write(f"{'path':<32}{'full':>10}{'grouped':>10}{'saved':>10}")
+        self.stdout.write(f"(us per request, best of {repeat} x {iterations})")
+        for path in options['paths']:
+            environ = build_get_request(path, options['host'], scheme='http').environ
+            with override_settings(ROUTE_GROUPS={}):
+                full = self.time_request(handler, environ, iterations, repeat)
+            grouped = self.time_request(handler, environ, iterations, repeat)
+            self.stdout.write(f"{path:<32}{full:>10.1f}{grouped:>10.1f}{full - grouped:>10.1f}")
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from client.inprocess import call_get
+from dashboard import models as dashboard_model
+from utils.renderers import FastJSONRenderer, PreEncodedJSON, encode_json, orjson
+
+import json
+import timeit
+
+
+def _scaled(data, scale):
+    """``data`` with every list in ``data['data']`` repeated ``scale`` times."""
+    if scale <= 1 or not isinstance(data.get('data'), list):
+        return data
+    return dict(data, data=data['data'] * scale)
+
+
+class Command(BaseCommand):
+    help = "Compare DRF's JSONRenderer with FastJSONRenderer on real API payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000)
+        parser.add_argument('--scale', type=int, default=1,
+                            help="Repeat list payloads this many times to model larger tables.")
+        parser.add_argument('--host', default='localhost')
+
+    def get_payloads(self, host, scale):
+        paths = [
+            ('services listing', '/api/v1/client/services/'),
+            ('blogs page', '/api/v1/client/blogs/'),
+            ('homepage bundle', '/api/v1/client/homepage/'),
+        ]
+        case_study = dashboard_model.CaseStudy.objects.filter(is_deleted=False).values_list('slug', flat=True).first()
+        if case_study:
+            paths.append(('case-study detail', f'/api/v1/client/case-study/{case_study}'))
+        blog = dashboard_model.Blog.objects.filter(is_deleted=False).values_list('slug', flat=True).first()
+        if blog:
+            paths.append(('blog detail', f'/api/v1/client/blog/{blog}'))
+
+        payloads = []
+        for name, path in paths:
+            data = call_get(path, host).data
+            if isinstance(data, PreEncodedJSON):
+                data = data.decode()
+            payloads.append((name, _scaled(data, scale)))
+        return payloads
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        drf = JSONRenderer()
+        fast = FastJSONRenderer()
+        encoders = [
+            ('drf', lambda data: drf.render(data)),
+            ('stdlib', lambda data: encode_json(data, backend='stdlib')),
+        ]
+        if orjson is not None:
+            encoders.append(('orjson', lambda data: encode_json(data, backend='orjson')))
+        else:
+            self.stdout.write(self.style.WARNING("orjson is not installed, skipping it"))
+
+        header = f"{'payload':<20}{'bytes':>9}" + ''.join(f"{name:>12}" for name, _ in encoders) + f"{'pre-encoded':>14}"
+        self.stdout.write(f"{header}\n(us per render, {iterations} iterations, backend in use: "
+                          f"{settings.JSON_RENDERER_BACKEND})")
+        for name, data in self.get_payloads(options['host'], options['scale']):
+            content = drf.render(data)
+            timings = []
+            for _, encode in encoders:
+                seconds = timeit.timeit(lambda: encode(data), number=iterations)
+                timings.append(seconds / iterations * 1e6)
+            cached = PreEncodedJSON(content)
+            passthrough = timeit.timeit(lambda: fast.render(cached), number=iterations) / iterations * 1e6
+            row = f"{name:<20}{len(content):>9}" + ''.join(f"{timing:>12.1f}" for timing in timings)
+            self.stdout.write(f"{row}{passthrough:>14.2f}")
+            if any(json.loads(encode(data)) != json.loads(content) for _, encode in encoders):
+                self.stdout.write(self.style.ERROR(f"  {name}: encoders disagree on the payload"))
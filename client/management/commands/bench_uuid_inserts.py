@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand
+from django.db import connections, models, transaction
+from django.utils import timezone
+
+from utils.ids import uuid7
+
+import time
+import uuid
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare insert throughput into a UUID primary key with random (uuid4) and "
+        "time-ordered (uuid7) ids, in scratch tables that are dropped afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200000)
+        parser.add_argument('--batch', type=int, default=1000)
+        parser.add_argument('--payload', type=int, default=200, help="Bytes of text per row.")
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--keep', action='store_true', help="Keep the scratch tables.")
+
+    def index_size(self, connection, table):
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_indexes_size(%s)", [table])
+            return cursor.fetchone()[0]
+
+    def run(self, connection, name, generate, options):
+        quote = connection.ops.quote_name
+        table = f"bench_{name}_inserts"
+        id_field = models.UUIDField()
+        date_field = models.DateTimeField()
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {quote(table)}")
+            cursor.execute(
+                f"CREATE TABLE {quote(table)} (id {id_field.db_type(connection)} PRIMARY KEY, "
+                f"date_added {date_field.db_type(connection)} NOT NULL, payload TEXT NOT NULL)"
+            )
+        sql = f"INSERT INTO {quote(table)} (id, date_added, payload) VALUES (%s, %s, %s)"
+        payload = 'x' * options['payload']
+        rows, batch = options['rows'], options['batch']
+
+        rates = []
+        started = time.perf_counter()
+        try:
+            for start in range(0, rows, batch):
+                now = date_field.get_db_prep_value(timezone.now(), connection)
+                params = [
+                    (id_field.get_db_prep_value(generate(), connection), now, payload)
+                    for _ in range(min(batch, rows - start))
+                ]
+                batch_started = time.perf_counter()
+                with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                    cursor.executemany(sql, params)
+                rates.append(len(params) / (time.perf_counter() - batch_started))
+            elapsed = time.perf_counter() - started
+            size = self.index_size(connection, table)
+        finally:
+            if not options['keep']:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP TABLE IF EXISTS {quote(table)}")
+
+        tenth = max(1, len(rates) // 10)
+        return {
+            'rows/s': rows / elapsed,
+            'first 10%': sum(rates[:tenth]) / tenth,
+            'last 10%': sum(rates[-tenth:]) / tenth,
+            'index MB': size / 2 ** 20 if size is not None else None,
+        }
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        self.stdout.write(
+            f"{options['rows']} rows in batches of {options['batch']} on {connection.vendor} "
+            f"(rows/s; index size on PostgreSQL only)"
+        )
+        columns = ['rows/s', 'first 10%', 'last 10%', 'index MB']
+        self.stdout.write(f"{'id':<8}" + ''.join(f"{column:>12}" for column in columns))
+        for name, generate in (('uuid4', uuid.uuid4), ('uuid7', uuid7)):
+            result = self.run(connection, name, generate, options)
+            self.stdout.write(f"{name:<8}" + ''.join(
+                f"{result[column]:>12.1f}" if result[column] is not None else f"{'-':>12}" for column in columns
+            ))
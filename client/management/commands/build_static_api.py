@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from client.prebuild import GROUPS, GROUPS_BY_NAME, StaticAPIBuilder
+
+import time
+
+
+class Command(BaseCommand):
+    help = "Prebuild the public API as static JSON files under STATIC_API_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--group', action='append', dest='groups', default=[],
+                            help="Only build this path group (repeatable).")
+        parser.add_argument('--root', help="Output directory, defaults to STATIC_API_ROOT.")
+        parser.add_argument('--host', help="Host the absolute URLs are built for, defaults to STATIC_API_HOST.")
+        parser.add_argument('--scheme', help="Scheme of the absolute URLs, defaults to STATIC_API_SCHEME.")
+        parser.add_argument('--list', action='store_true', help="List the path groups and exit.")
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for group in GROUPS:
+                models = ', '.join(model.__name__ for model in group.models)
+                self.stdout.write(f"{group.name}: {models}")
+            return
+
+        unknown = [name for name in options['groups'] if name not in GROUPS_BY_NAME]
+        if unknown:
+            raise CommandError(f"Unknown group(s): {', '.join(unknown)}")
+        groups = [GROUPS_BY_NAME[name] for name in options['groups']] or GROUPS
+
+        builder = StaticAPIBuilder(root=options['root'], host=options['host'], scheme=options['scheme'])
+        started = time.monotonic()
+        written = 0
+        for group in groups:
+            count = builder.build_group(group)
+            written += count
+            self.stdout.write(f"{group.name}: {count} file(s)")
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} file(s) to {builder.root} in {time.monotonic() - started:.2f}s"
+        ))
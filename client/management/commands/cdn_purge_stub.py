@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+
+
+class PurgeStubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        try:
+            keys = json.loads(body).get('surrogate_keys', [])
+        except ValueError:
+            keys = []
+        self.server.command.stdout.write(f"Purged {len(keys)} keys: {' '.join(keys)}")
+        payload = json.dumps({"status": "ok", "purged": len(keys)}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = "Run a local stand-in for the CDN purge endpoint that logs every purge it receives."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8787)
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer((options['host'], options['port']), PurgeStubHandler)
+        server.command = self
+        self.stdout.write(
+            f"Listening on http://{options['host']}:{options['port']}/ "
+            f"(set CDN_PURGE_URL to this address)"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
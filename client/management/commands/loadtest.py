@@ -0,0 +1,284 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from academy.models import AcademyBlog, AcademyGallery
+from client.inprocess import build_get_request
+from dashboard.models import Blog, CaseStudy, Enquiry, Gallery, JobPost, Services
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit
+import glob
+import http.client
+import json
+import os
+import re
+import resource
+import statistics
+import subprocess
+import threading
+import time
+
+SERVER_TIMING_QUERIES = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+MODES = ('inprocess', 'http')
+
+
+def _percentile(latencies, fraction):
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _rss_mb(pid='self'):
+    """Resident memory of a local process in MB, or ``None`` when it can't be read."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if pid == 'self':
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return None
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=settings.BASE_DIR, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+class Command(BaseCommand):
+    help = (
+        "Load the public API endpoints in-process and/or over HTTP at a set concurrency and "
+        "report latency percentiles, throughput, queries, response size and memory per "
+        "endpoint. In-process runs flush the configured caches before each endpoint to "
+        "time its first, uncached request; point them at a benchmark environment. Results "
+        "are saved as JSON to compare across commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=MODES + ('both',), default='inprocess')
+        parser.add_argument('--url', default='http://localhost:8000', help="Server for --mode http.")
+        parser.add_argument('--keep-alive', action='store_true', help="Reuse one HTTP connection per client thread.")
+        parser.add_argument('--server-pid', type=int, help="Local server process, to report its memory.")
+        parser.add_argument('--host', default='localhost', help="Host header for in-process requests.")
+        parser.add_argument('--requests', type=int, default=200, help="Requests per endpoint.")
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--accept-encoding', default='br, gzip')
+        parser.add_argument('--output', default=os.path.join(settings.BASE_DIR, 'benchmarks'))
+        parser.add_argument('--no-save', action='store_true')
+        parser.add_argument('--compare', help="Earlier result file to compare with, or 'latest'.")
+        parser.add_argument('paths', nargs='*', help="Endpoints to load (default: every public listing and a detail of each).")
+
+    def default_paths(self):
+        def slug(model):
+            return model.live.order_by('-date_added').values_list('slug', flat=True).first() or 'missing'
+
+        blog_pages = max(1, -(-Blog.live.count() // 10))
+        job = JobPost.live.order_by('-date_added').values_list('pk', flat=True).first()
+        paths = [
+            '/api/v1/client/homepage/',
+            '/api/v1/client/brand/',
+            '/api/v1/client/our-metrics/',
+            '/api/v1/client/testimonial/',
+            '/api/v1/client/faq/',
+            '/api/v1/client/blogs/',
+            f'/api/v1/client/blogs/?page={blog_pages}',
+            f'/api/v1/client/blog/{slug(Blog)}',
+            '/api/v1/client/gallery/',
+            '/api/v1/client/our-approach/',
+            '/api/v1/client/our-proces/',
+            '/api/v1/client/seo/',
+            '/api/v1/client/services/',
+            '/api/v1/client/services/?is_home=1',
+            f'/api/v1/client/services/{slug(Services)}',
+            '/api/v1/client/case-study/',
+            f'/api/v1/client/case-study/{slug(CaseStudy)}',
+            '/api/v1/client/job-post/',
+            '/api/v1/client/dynamic-sitemap/',
+            '/api/v1/academy/faq/',
+            '/api/v1/academy/blogs/',
+            f'/api/v1/academy/blog/{slug(AcademyBlog)}',
+            '/api/v1/academy/gallery/',
+        ]
+        if job:
+            paths.append(f'/api/v1/client/job-post/{job}')
+        return paths
+
+    def dataset(self):
+        return {
+            model._meta.label: model._base_manager.count()
+            for model in (Blog, Gallery, CaseStudy, Services, JobPost, Enquiry, AcademyBlog, AcademyGallery)
+        }
+
+    def inprocess_caller(self, options):
+        handler = WSGIHandler()
+        meta = {'HTTP_ACCEPT_ENCODING': options['accept_encoding']}
+
+        def start_response(status, headers):
+            pass
+
+        def call(path):
+            environ = build_get_request(path, options['host'], scheme='http', meta=meta).environ
+            started = time.perf_counter()
+            response = handler(environ, start_response)
+            size = sum(len(chunk) for chunk in response)
+            response.close()
+            return time.perf_counter() - started, response.status_code, size, response.get('Server-Timing', '')
+
+        return call
+
+    def http_caller(self, options):
+        url = urlsplit(options['url'])
+        connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        local = threading.local()
+        headers = {'Accept-Encoding': options['accept_encoding']}
+        if not options['keep_alive']:
+            headers['Connection'] = 'close'
+
+        def call(path):
+            # A new connection per request, as a proxy in front of the app
+            # makes them, unless --keep-alive keeps one per client thread
+            if getattr(local, 'connection', None) is None:
+                local.connection = connection_class(url.hostname, url.port, timeout=30)
+            started = time.perf_counter()
+            try:
+                local.connection.request('GET', path, headers=headers)
+                response = local.connection.getresponse()
+                size = len(response.read())
+            except (OSError, http.client.HTTPException):
+                local.connection.close()
+                local.connection = None
+                return time.perf_counter() - started, 599, 0, ''
+            if not options['keep_alive']:
+                local.connection.close()
+                local.connection = None
+            return time.perf_counter() - started, response.status, size, response.getheader('Server-Timing', '')
+
+        return call
+
+    def clear_caches(self):
+        for alias in settings.CACHES:
+            caches[alias].clear()
+
+    def run_path(self, mode, call, path, options):
+        if mode == 'inprocess':
+            # The first request after a flush shows the uncached cost
+            self.clear_caches()
+        first = call(path)
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            started = time.perf_counter()
+            results = list(executor.map(call, [path] * options['requests']))
+            elapsed = time.perf_counter() - started
+
+        latencies = [latency for latency, _, _, _ in results]
+        queries = [
+            int(match.group(2)) for match in
+            (SERVER_TIMING_QUERIES.search(timing) for _, _, _, timing in results) if match
+        ]
+        first_queries = SERVER_TIMING_QUERIES.search(first[3])
+        return {
+            'requests': len(results),
+            'errors': sum(1 for _, status, _, _ in results if status >= 500),
+            'status': first[1],
+            'throughput': len(results) / elapsed,
+            'first_ms': first[0] * 1000,
+            'first_queries': int(first_queries.group(2)) if first_queries else None,
+            'p50_ms': statistics.median(latencies) * 1000,
+            'p95_ms': _percentile(latencies, 0.95) * 1000,
+            'p99_ms': _percentile(latencies, 0.99) * 1000,
+            'queries': statistics.median(queries) if queries else None,
+            'bytes': first[2],
+            'rss_mb': _rss_mb() if mode == 'inprocess' else (
+                _rss_mb(options['server_pid']) if options['server_pid'] else None
+            ),
+        }
+
+    def write_results(self, mode, results):
+        self.stdout.write(f"\n{mode}")
+        self.stdout.write(
+            f"{'path':<46}{'req/s':>8}{'first':>8}{'p50':>8}{'p95':>8}{'p99':>8}"
+            f"{'q first':>8}{'q':>5}{'KB':>8}{'RSS MB':>8}{'err':>5}"
+        )
+        for path, result in results.items():
+            def fmt(value, width, spec):
+                return f"{value:>{width}{spec}}" if value is not None else f"{'-':>{width}}"
+
+            self.stdout.write(
+                f"{path[:45]:<46}{result['throughput']:>8.0f}{result['first_ms']:>8.1f}{result['p50_ms']:>8.1f}"
+                f"{result['p95_ms']:>8.1f}{result['p99_ms']:>8.1f}{fmt(result['first_queries'], 8, '')}"
+                f"{fmt(result['queries'], 5, '.0f')}{result['bytes'] / 1024:>8.1f}"
+                f"{fmt(result['rss_mb'], 8, '.0f')}{result['errors']:>5}"
+            )
+
+    def load_previous(self, compare, output):
+        if compare != 'latest':
+            path = compare
+        else:
+            files = sorted(glob.glob(os.path.join(output, 'loadtest-*.json')))
+            if not files:
+                raise CommandError(f"No earlier results in {output}")
+            path = files[-1]
+        with open(path) as f:
+            return path, json.load(f)
+
+    def write_comparison(self, previous_path, previous, report):
+        self.stdout.write(f"\nChange against {os.path.basename(previous_path)} ({previous['commit']})")
+        self.stdout.write(f"{'path':<46}{'req/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+        for mode, results in report['results'].items():
+            for path, result in results.items():
+                before = previous['results'].get(mode, {}).get(path)
+                if before is None:
+                    continue
+
+                def change(key):
+                    return f"{(result[key] / before[key] - 1) * 100:>+9.0f}%" if before[key] else f"{'-':>10}"
+
+                self.stdout.write(
+                    f"{(mode[0] + ' ' + path)[:45]:<46}{change('throughput')}{change('p50_ms')}"
+                    f"{change('p95_ms')}{change('p99_ms')}"
+                )
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or self.default_paths()
+        modes = MODES if options['mode'] == 'both' else (options['mode'],)
+        previous = self.load_previous(options['compare'], options['output']) if options['compare'] else None
+
+        report = {
+            'commit': _git_commit(),
+            'started': datetime.now().isoformat(timespec='seconds'),
+            'options': {key: options[key] for key in ('requests', 'concurrency', 'accept_encoding', 'url', 'keep_alive')},
+            'database': connection.vendor,
+            'dataset': self.dataset(),
+            'results': {},
+        }
+        self.stdout.write(
+            f"{options['requests']} requests per endpoint, {options['concurrency']} concurrent, "
+            f"{connection.vendor}: " + ', '.join(f"{label} {count}" for label, count in report['dataset'].items())
+        )
+        for mode in modes:
+            call = self.inprocess_caller(options) if mode == 'inprocess' else self.http_caller(options)
+            results = report['results'][mode] = {}
+            for path in paths:
+                results[path] = self.run_path(mode, call, path, options)
+            self.write_results(mode, results)
+
+        if not options['no_save']:
+            os.makedirs(options['output'], exist_ok=True)
+            filename = os.path.join(
+                options['output'], f"loadtest-{datetime.now():%Y%m%d-%H%M%S}-{report['commit']}.json"
+            )
+            with open(filename, 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"\nSaved to {filename}")
+        if previous:
+            self.write_comparison(*previous, report)
@@ -0,0 +1,101 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.utils import load_backend
+
+from utils.db_pool import get_pool_stats
+
+from concurrent.futures import ThreadPoolExecutor
+import statistics
+import time
+
+POOLED_ENGINES = {
+    'django.db.backends.postgresql': 'utils.db_backends.postgresql',
+    'django.db.backends.sqlite3': 'utils.db_backends.sqlite3',
+}
+
+
+def _percentile(latencies, fraction):
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Check a database's connection pool and compare request-sized units of work "
+        "(connect, a few queries, close) with pooled and with direct connections, "
+        "from several threads at once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--queries', type=int, default=3, help="Queries per unit of work.")
+        parser.add_argument('--max-size', type=int, help="Pool size for the pooled run (default: the configured one).")
+
+    def engines(self, engine):
+        pooled = POOLED_ENGINES.get(engine, engine)
+        direct = {value: key for key, value in POOLED_ENGINES.items()}.get(engine, engine)
+        if pooled == direct:
+            raise CommandError(f"No pooled backend for {engine}")
+        return {'direct': direct, 'pooled': pooled}
+
+    def run(self, name, engine, settings_dict, options):
+        settings_dict = {**settings_dict, 'ENGINE': engine, 'CONN_MAX_AGE': 0}
+        if options['max_size']:
+            settings_dict['POOL'] = {**settings_dict.get('POOL', {}), 'MAX_SIZE': options['max_size']}
+        backend = load_backend(engine)
+        # A separate alias, so the harness has its own pool
+        alias = f"{options['database']}-pool-check"
+
+        def unit(n):
+            connection = backend.DatabaseWrapper(settings_dict, alias)
+            started = time.perf_counter()
+            try:
+                with connection.cursor() as cursor:
+                    for _ in range(options['queries']):
+                        cursor.execute("SELECT 1")
+                        cursor.fetchone()
+            finally:
+                connection.close()
+            return time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+            started = time.perf_counter()
+            latencies = list(executor.map(unit, range(options['requests'])))
+            elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{name:<8}{options['requests'] / elapsed:>10.0f}{statistics.median(latencies) * 1000:>10.2f}"
+            f"{_percentile(latencies, 0.99) * 1000:>10.2f}"
+        )
+        return get_pool_stats().get(alias)
+
+    def write_stats(self, alias, stats):
+        self.stdout.write(
+            f"{alias}: {stats['in_use']} in use, {stats['idle']} idle of {stats['max_size']}; "
+            f"{stats['created']} created, {stats['closed']} closed, {stats['reused']} reused of "
+            f"{stats['checkouts']} checkouts; wait avg {stats['wait_avg'] * 1000:.2f}ms, "
+            f"max {stats['wait_max'] * 1000:.2f}ms; {stats['timeouts']} timeouts, "
+            f"{stats['health_check_failures']} failed health checks"
+        )
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        connection = connections[alias]
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        connection.close()
+        live = get_pool_stats().get(alias)
+        if live is None:
+            self.stdout.write(f"{alias} ({connection.settings_dict['ENGINE']}) is not pooled")
+        else:
+            self.write_stats(alias, live)
+
+        self.stdout.write(
+            f"{options['requests']} units of {options['queries']} queries, {options['threads']} threads"
+        )
+        self.stdout.write(f"{'mode':<8}{'units/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        stats = None
+        for name, engine in self.engines(connection.settings_dict['ENGINE']).items():
+            stats = self.run(name, engine, connection.settings_dict, options) or stats
+        self.write_stats(f"{alias}-pool-check", stats)
@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from collections import defaultdict
+import json
+import os
+import re
+import subprocess
+import sys
+
+BOOT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+timings = {'setup': time.perf_counter() - started}
+if sys.argv[1] in ('wsgi', 'warm'):
+    from django.core.wsgi import get_wsgi_application
+    get_wsgi_application()
+    timings['wsgi'] = time.perf_counter() - started
+if sys.argv[1] in ('urls', 'wsgi', 'warm'):
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+    timings['urls'] = time.perf_counter() - started
+if sys.argv[1] == 'warm':
+    from utils.startup import warm_up
+    warm_up()
+    timings['warm'] = time.perf_counter() - started
+print(json.dumps(timings))
+"""
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile what a worker imports on boot with python -X importtime, in a fresh "
+        "interpreter, and list the packages and modules that take longest."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stage', choices=['setup', 'urls', 'wsgi', 'warm'], default='wsgi',
+            help="How far to boot: django.setup(), plus the URLconf, plus the WSGI handler "
+                 "and its middleware (default), plus utils.startup.warm_up().",
+        )
+        parser.add_argument('--top', type=int, default=20)
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT, options['stage']],
+            env=env, capture_output=True, text=True, cwd=settings.BASE_DIR,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+
+        packages = defaultdict(int)
+        modules = []
+        for line in result.stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if match is None:
+                continue
+            own, cumulative, indent, name = match.groups()
+            packages[name.split('.')[0]] += int(own)
+            modules.append((int(cumulative), len(indent) // 2, name))
+
+        self.stdout.write(' '.join(f"{stage} {seconds * 1000:.0f}ms" for stage, seconds in timings.items()))
+        self.stdout.write(f"{len(modules)} modules imported, {sum(packages.values()) / 1000:.0f}ms in total")
+        self.stdout.write(f"\n{'package':<40}{'ms':>10}")
+        for name, own in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f"{name:<40}{own / 1000:>10.1f}")
+        self.stdout.write(f"\n{'module (incl. its imports)':<60}{'ms':>10}{'depth':>7}")
+        for cumulative, depth, name in sorted(modules, reverse=True)[:options['top']]:
+            self.stdout.write(f"{name:<60}{cumulative / 1000:>10.1f}{depth:>7}")
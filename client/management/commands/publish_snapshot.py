@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from client.snapshot import publish_snapshot
+
+import os
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the published public content to a read-only SQLite snapshot. "
+        "The file is replaced atomically; when copying it to edge nodes, upload "
+        "next to SNAPSHOT_PATH and rename into place the same way."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="Snapshot file, defaults to SNAPSHOT_PATH.")
+
+    def handle(self, *args, **options):
+        path = options['output'] or settings.SNAPSHOT_PATH
+        started = time.monotonic()
+        counts = publish_snapshot(path)
+        for label, count in counts.items():
+            self.stdout.write(f"{label}: {count} row(s)")
+        size = os.path.getsize(path) / 1024
+        self.stdout.write(self.style.SUCCESS(
+            f"Published {sum(counts.values())} row(s) to {path} ({size:.0f} KiB) "
+            f"in {time.monotonic() - started:.2f}s"
+        ))
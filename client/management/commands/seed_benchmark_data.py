@@ -0,0 +1,226 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
+from django_ckeditor_5.fields import CKEditor5Field
+
+from utils.cache import bump_table_version
+
+from datetime import timedelta
+import os
+import random
+import time
+
+# Rows per model at --scale 1
+COUNTS = {
+    'dashboard.Brand': 300,
+    'dashboard.Testimonial': 500,
+    'dashboard.FAQ': 200,
+    'dashboard.Blog': 10000,
+    'dashboard.HomepageContent': 1,
+    'dashboard.Gallery': 50000,
+    'dashboard.OurApproach': 20,
+    'dashboard.OurProces': 20,
+    'dashboard.CaseStudy': 500,
+    'dashboard.ExpertiseItem': 2500,
+    'dashboard.CaseStudyImages': 4000,
+    'dashboard.Services': 50,
+    'dashboard.ServiceItems': 500,
+    'dashboard.JobPost': 200,
+    'dashboard.Applications': 20000,
+    'dashboard.Enquiry': 50000,
+    'dashboard.SEO': 500,
+    'academy.AcademyBlog': 2000,
+    'academy.AcademyFAQ': 100,
+    'academy.AcademyEnquiry': 20000,
+    'academy.AcademyGallery': 10000,
+}
+
+# Models that must keep a single row
+SINGLETONS = {'dashboard.HomepageContent'}
+
+WORDS = (
+    "brand strategy digital growth campaign audience content design creative media "
+    "performance marketing search social video story insight launch client team "
+    "experience product platform results research data engagement conversion"
+).split()
+
+PLACEHOLDER_IMAGES = 8
+
+
+def _words(n):
+    return ' '.join(random.choice(WORDS) for _ in range(n))
+
+
+def _rich_text(paragraphs):
+    """HTML shaped like the CKEditor bodies the admin produces."""
+    parts = []
+    for n in range(paragraphs):
+        if n % 3 == 0:
+            parts.append(f"<h2>{_words(5).capitalize()}</h2>")
+        parts.append(
+            f"<p>{_words(40).capitalize()} <strong>{_words(3)}</strong> {_words(30)} "
+            f"<a href=\"https://example.com/{random.choice(WORDS)}\">{_words(2)}</a>.</p>"
+        )
+        if n % 4 == 3:
+            parts.append(f"<ul>{''.join(f'<li>{_words(6)}</li>' for _ in range(4))}</ul>")
+        if n % 5 == 4:
+            image = f"{settings.MEDIA_URL}bench/{random.randrange(PLACEHOLDER_IMAGES)}.webp"
+            parts.append(f"<figure class=\"image\"><img src=\"{image}\" alt=\"{_words(3)}\"></figure>")
+    return ''.join(parts)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the dashboard and academy tables with synthetic rows at production-like "
+        "volumes for benchmarking, with bulk_create. Meant for a benchmark database only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help="Multiplier on the default row counts.")
+        parser.add_argument(
+            '--count', action='append', default=[], metavar='MODEL=N',
+            help="Rows for one model, e.g. --count dashboard.Blog=20000. Repeatable.",
+        )
+        parser.add_argument('--batch', type=int, default=1000)
+        parser.add_argument('--deleted', type=float, default=0.05, help="Share of rows soft-deleted.")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed, for repeatable datasets.")
+        parser.add_argument('--clear', action='store_true', help="Delete the existing rows of these models first.")
+
+    def counts(self, options):
+        counts = {label: max(1, round(count * options['scale'])) for label, count in COUNTS.items()}
+        for override in options['count']:
+            label, _, count = override.partition('=')
+            if label not in COUNTS or not count.isdigit():
+                raise CommandError(f"Invalid --count {override}")
+            counts[label] = int(count)
+        for label in SINGLETONS:
+            counts[label] = min(counts[label], 1)
+        return counts
+
+    def write_placeholders(self):
+        """A few real image files for the seeded rows to point at."""
+        from PIL import Image
+
+        directory = os.path.join(settings.MEDIA_ROOT, 'bench')
+        os.makedirs(directory, exist_ok=True)
+        for n in range(PLACEHOLDER_IMAGES):
+            path = os.path.join(directory, f"{n}.webp")
+            if not os.path.exists(path):
+                color = tuple(random.randrange(256) for _ in range(3))
+                Image.new('RGB', (1200, 800), color).save(path, format='WEBP', quality=80)
+        path = os.path.join(directory, 'file.pdf')
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(b"%PDF-1.4\n%%EOF\n")
+
+    def value(self, model, field, n, parents, options):
+        """A value for ``field`` of the ``n``-th row, or ``None`` to leave the default."""
+        name = field.name
+        if isinstance(field, models.ForeignKey):
+            return parents[field.related_model][n % len(parents[field.related_model])]
+        if name == 'is_deleted':
+            return random.random() < options['deleted']
+        if name == 'date_added':
+            return timezone.now() - timedelta(seconds=random.randrange(3 * 365 * 24 * 3600))
+        if field.primary_key or getattr(field, 'auto_now', False):
+            return None
+        if field.choices:
+            return random.choice(field.choices)[0]
+        if isinstance(field, models.BooleanField):
+            # is_home and the like: a handful of rows, as in production
+            return n < 6
+        if isinstance(field, models.IntegerField):
+            return random.randrange(1, 1000)
+        if isinstance(field, models.ImageField) or (
+            isinstance(field, models.FileField) and field.upload_to and 'image' in name
+        ):
+            return f"bench/{random.randrange(PLACEHOLDER_IMAGES)}.webp"
+        if isinstance(field, models.FileField):
+            if name in ('logo', 'icon'):
+                return f"bench/{random.randrange(PLACEHOLDER_IMAGES)}.webp"
+            return 'bench/file.pdf'
+        if isinstance(field, models.SlugField):
+            return f"bench-{model._meta.model_name}-{n}"
+        if isinstance(field, models.EmailField):
+            return f"bench{n}@example.com"
+        if isinstance(field, models.URLField):
+            return f"https://example.com/{model._meta.model_name}/{n}"
+        if isinstance(field, CKEditor5Field):
+            return _rich_text(random.randint(2, 12))
+        if isinstance(field, models.TextField):
+            return _words(random.randint(10, 60)).capitalize()
+        if isinstance(field, models.CharField):
+            if name == 'path':
+                return f"/bench/{model._meta.model_name}/{n}/"
+            return f"{_words(random.randint(2, 6)).capitalize()} {n}"[:field.max_length]
+        return None
+
+    def seed(self, model, count, parents, options):
+        fields = [
+            field for field in model._meta.concrete_fields
+            if not (field.primary_key and not isinstance(field, models.UUIDField))
+        ]
+        pks = []
+        for start in range(0, count, options['batch']):
+            objs = []
+            for n in range(start, min(start + options['batch'], count)):
+                values = {}
+                for field in fields:
+                    value = self.value(model, field, n, parents, options)
+                    if value is not None:
+                        values[field.attname if isinstance(field, models.ForeignKey) else field.name] = value
+                objs.append(model(**values))
+            model.objects.bulk_create(objs, batch_size=options['batch'])
+            pks.extend(obj.pk for obj in objs)
+        return pks
+
+    def ordered_models(self, counts):
+        """Models to seed, parents before the models pointing at them."""
+        pending = [apps.get_model(label) for label in counts]
+        ordered = []
+        while pending:
+            for model in pending:
+                parents = {
+                    field.related_model for field in model._meta.concrete_fields
+                    if isinstance(field, models.ForeignKey)
+                }
+                if not parents - set(ordered) - {model}:
+                    ordered.append(model)
+                    pending.remove(model)
+                    break
+            else:
+                raise CommandError(f"Circular foreign keys between {pending}")
+        return ordered
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        counts = self.counts(options)
+        ordered = self.ordered_models(counts)
+        self.write_placeholders()
+
+        if options['clear']:
+            with transaction.atomic():
+                for model in reversed(ordered):
+                    model._base_manager.all().delete()
+
+        parents = {}
+        started = time.perf_counter()
+        for model in ordered:
+            label = model._meta.label
+            if label in SINGLETONS and model._base_manager.exists():
+                parents[model] = list(model._base_manager.values_list('pk', flat=True))
+                continue
+            model_started = time.perf_counter()
+            with transaction.atomic():
+                pks = self.seed(model, counts[label], parents, options)
+            parents[model] = pks
+            self.stdout.write(f"{label:<32}{len(pks):>8} rows {time.perf_counter() - model_started:>8.1f}s")
+
+        # bulk_create sends no signals, so invalidate the cached payloads explicitly
+        for model in ordered:
+            bump_table_version(model._meta.db_table)
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {sum(len(pks) for pks in parents.values())} rows in {time.perf_counter() - started:.1f}s"
+        ))
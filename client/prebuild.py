@@ -0,0 +1,250 @@
+"""
+Static JSON prebuild of the public client and academy API.
+
+Every public GET endpoint is rendered in-process and written under
+``STATIC_API_ROOT`` so a front proxy or CDN can serve the files directly:
+
+    /api/v1/client/blogs/            -> api/v1/client/blogs/index.json
+    /api/v1/client/blogs/?page=2     -> api/v1/client/blogs/index__page=2.json
+    /api/v1/client/blog/<slug>       -> api/v1/client/blog/<slug>.json
+
+Only successful responses are written; a path that no longer renders (a
+deleted blog, a removed page) has its file removed. Paths are grouped by the
+models they depend on, so a save regenerates just the affected groups, and
+for detail groups just the affected rows.
+"""
+from django.conf import settings
+from django.db import connections, transaction
+
+from dashboard import models as dashboard_model
+from academy import models as academy_model
+from client.inprocess import render_get
+from client.views import CustomPageNumberPagination
+from utils.batching import DebouncedBatch
+
+from collections import defaultdict
+from urllib.parse import quote, urlsplit
+import math
+import os
+import tempfile
+
+CLIENT = '/api/v1/client/'
+ACADEMY = '/api/v1/academy/'
+
+
+def _page_paths(base, model):
+    count = model.live.count()
+    pages = max(1, math.ceil(count / CustomPageNumberPagination.page_size))
+    return [base] + [f"{base}?page={number}" for number in range(1, pages + 1)]
+
+
+def _slug_paths(base, model):
+    slugs = model.live.values_list('slug', flat=True)
+    return [f"{base}{slug}" for slug in slugs]
+
+
+def _seo_paths():
+    paths = dashboard_model.SEO.live.values_list('path', flat=True)
+    return [f"{CLIENT}seo/"] + [f"{CLIENT}seo/?path={quote(path, safe='')}" for path in paths]
+
+
+def _shows_in_related(model, instance, deleted):
+    """Whether ``instance`` appears (or appeared) in the related blogs of other details."""
+    if deleted or instance.is_deleted:
+        return True
+    latest = model.live.values_list('pk', flat=True)[:4]
+    return instance.pk in set(latest)
+
+
+class PathGroup:
+    """
+    Public paths that depend on the same models.
+
+    ``paths()`` lists every path of the group. ``paths_for(instance, deleted)``
+    lists the paths affected by a change to ``instance``, or ``None`` when the
+    whole group has to be rebuilt. Detail groups set ``directory`` so files of
+    rows that no longer exist can be swept.
+    """
+
+    def __init__(self, name, models, paths, paths_for=None, directory=None):
+        self.name = name
+        self.models = tuple(models)
+        self._paths = paths
+        self._paths_for = paths_for
+        self.directory = directory
+
+    def paths(self):
+        return list(self._paths())
+
+    def paths_for(self, instance, deleted=False):
+        if self._paths_for is None:
+            return None
+        try:
+            return self._paths_for(instance, deleted)
+        except Exception:
+            return None
+
+
+def _detail_group(name, base, model, child_models=(), parent_field=None):
+    def paths_for(instance, deleted):
+        if isinstance(instance, model):
+            if model is dashboard_model.Blog or model is academy_model.AcademyBlog:
+                if _shows_in_related(model, instance, deleted):
+                    return None
+            return [f"{base}{instance.slug}"]
+        return [f"{base}{getattr(instance, parent_field).slug}"]
+
+    return PathGroup(name, (model, *child_models), lambda: _slug_paths(base, model),
+                     paths_for=paths_for, directory=base)
+
+
+GROUPS = [
+    PathGroup('brand', [dashboard_model.Brand], lambda: [f"{CLIENT}brand/"]),
+    PathGroup('our-metrics', [dashboard_model.HomepageContent], lambda: [f"{CLIENT}our-metrics/"]),
+    PathGroup('testimonial', [dashboard_model.Testimonial], lambda: [f"{CLIENT}testimonial/"]),
+    PathGroup('faq', [dashboard_model.FAQ], lambda: [f"{CLIENT}faq/"]),
+    PathGroup('gallery', [dashboard_model.Gallery],
+              lambda: [f"{CLIENT}gallery/", f"{CLIENT}gallery/?is_home=1"]),
+    PathGroup('our-approach', [dashboard_model.OurApproach], lambda: [f"{CLIENT}our-approach/"]),
+    PathGroup('our-proces', [dashboard_model.OurProces], lambda: [f"{CLIENT}our-proces/"]),
+    PathGroup('seo', [dashboard_model.SEO], _seo_paths),
+    PathGroup('homepage', [dashboard_model.Brand, dashboard_model.HomepageContent, dashboard_model.Testimonial,
+                           dashboard_model.FAQ, dashboard_model.Services, dashboard_model.Gallery,
+                           dashboard_model.OurApproach, dashboard_model.OurProces],
+              lambda: [f"{CLIENT}homepage/"]),
+    PathGroup('blogs', [dashboard_model.Blog], lambda: _page_paths(f"{CLIENT}blogs/", dashboard_model.Blog)),
+    _detail_group('blog', f"{CLIENT}blog/", dashboard_model.Blog),
+    PathGroup('services', [dashboard_model.Services, dashboard_model.ServiceItems],
+              lambda: [f"{CLIENT}services/", f"{CLIENT}services/?is_home=1"]),
+    _detail_group('service', f"{CLIENT}services/", dashboard_model.Services,
+                  child_models=[dashboard_model.ServiceItems], parent_field='services'),
+    PathGroup('case-studies', [dashboard_model.CaseStudy], lambda: [f"{CLIENT}case-study/"]),
+    _detail_group('case-study', f"{CLIENT}case-study/", dashboard_model.CaseStudy,
+                  child_models=[dashboard_model.ExpertiseItem, dashboard_model.CaseStudyImages],
+                  parent_field='case_study'),
+    PathGroup('job-posts', [dashboard_model.JobPost], lambda: [f"{CLIENT}job-post/"]),
+    PathGroup('job-post', [dashboard_model.JobPost],
+              lambda: [f"{CLIENT}job-post/{pk}" for pk in
+                       dashboard_model.JobPost.live.values_list('pk', flat=True)],
+              paths_for=lambda instance, deleted: [f"{CLIENT}job-post/{instance.pk}"],
+              directory=f"{CLIENT}job-post/"),
+    PathGroup('sitemap', [dashboard_model.Services, dashboard_model.CaseStudy, dashboard_model.Blog],
+              lambda: [f"{CLIENT}dynamic-sitemap/"]),
+    PathGroup('academy-faq', [academy_model.AcademyFAQ], lambda: [f"{ACADEMY}faq/"]),
+    PathGroup('academy-blogs', [academy_model.AcademyBlog],
+              lambda: _page_paths(f"{ACADEMY}blogs/", academy_model.AcademyBlog)),
+    _detail_group('academy-blog', f"{ACADEMY}blog/", academy_model.AcademyBlog),
+    PathGroup('academy-gallery', [academy_model.AcademyGallery], lambda: [f"{ACADEMY}gallery/"]),
+]
+
+GROUPS_BY_NAME = {group.name: group for group in GROUPS}
+
+
+def write_atomic(filename, content):
+    """Replace ``filename`` with ``content`` so readers never see a partial file."""
+    directory = os.path.dirname(filename)
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, prefix='.tmp-', delete=False) as temp:
+        temp.write(content)
+        temp.flush()
+        os.fsync(temp.fileno())
+    os.chmod(temp.name, 0o644)
+    os.replace(temp.name, filename)
+
+
+class StaticAPIBuilder:
+    """Render public API paths to JSON files under ``root``."""
+
+    def __init__(self, root=None, host=None, scheme=None):
+        self.root = root or settings.STATIC_API_ROOT
+        self.host = host or settings.STATIC_API_HOST
+        self.scheme = scheme or settings.STATIC_API_SCHEME
+
+    def output_path(self, path):
+        url = urlsplit(path)
+        name = url.path.lstrip('/')
+        if not name or name.endswith('/'):
+            name += 'index'
+        if url.query:
+            name += '__' + quote(url.query, safe='=&')
+        return os.path.join(self.root, name + '.json')
+
+    def render(self, path):
+        """Write ``path`` to its file, or remove the file if it no longer renders."""
+        filename = self.output_path(path)
+        response = render_get(path, self.host, scheme=self.scheme)
+        if response.status_code == 200:
+            write_atomic(filename, response.content)
+            return True
+        if os.path.exists(filename):
+            os.remove(filename)
+        return False
+
+    def sweep(self, group, paths):
+        """Remove detail files of ``group`` whose rows are gone."""
+        directory = os.path.dirname(self.output_path(group.directory))
+        if not os.path.isdir(directory):
+            return 0
+        keep = {os.path.basename(self.output_path(path)) for path in paths}
+        removed = 0
+        for name in os.listdir(directory):
+            if name.endswith('.json') and not name.startswith('index') and name not in keep:
+                os.remove(os.path.join(directory, name))
+                removed += 1
+        return removed
+
+    def build_group(self, group, paths=None):
+        everything = paths is None
+        if everything:
+            paths = group.paths()
+        written = sum(self.render(path) for path in paths)
+        if group.directory:
+            self.sweep(group, paths if everything else group.paths())
+        return written
+
+    def build(self, groups=None):
+        groups = GROUPS if groups is None else groups
+        return sum(self.build_group(group) for group in groups)
+
+    def regenerate(self, items):
+        """Rebuild ``(group name, path)`` items; a ``None`` path means the whole group."""
+        by_group = defaultdict(set)
+        for name, path in items:
+            by_group[name].add(path)
+        try:
+            for name, paths in by_group.items():
+                group = GROUPS_BY_NAME[name]
+                self.build_group(group, None if None in paths else sorted(paths))
+        finally:
+            # Runs on the batch thread, which owns its own connections
+            connections.close_all()
+
+
+_regenerator = None
+
+
+def schedule_regeneration(instance, deleted=False, using=None):
+    """
+    Queue the files affected by a change to ``instance`` for regeneration.
+
+    Affected paths are worked out now, while the instance still carries its
+    slug, and queued once the change is committed.
+    """
+    global _regenerator
+    model = type(instance)
+    items = set()
+    for group in GROUPS:
+        if model in group.models:
+            paths = group.paths_for(instance, deleted)
+            if paths is None:
+                items.add((group.name, None))
+            else:
+                items.update((group.name, path) for path in paths)
+    if not items:
+        return
+    if _regenerator is None:
+        _regenerator = DebouncedBatch(
+            StaticAPIBuilder().regenerate,
+            debounce=settings.STATIC_API_DEBOUNCE, name='static-api',
+        )
+    transaction.on_commit(lambda: _regenerator.add(items), using=using)
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from client.snapshot import SNAPSHOT_ALIAS, SNAPSHOT_MODELS
+from utils.replicas import get_routing_state
+
+
+class SnapshotRouter:
+    """
+    Serve reads of the public content models from the read-only snapshot.
+
+    Writes, and reads of every other model, stay on the default database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model in SNAPSHOT_MODELS:
+            return SNAPSHOT_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == SNAPSHOT_ALIAS:
+            return False
+        return None
+
+
+class ReplicaRouter:
+    """
+    Send the reads of public API requests to a read replica (see utils.replicas).
+
+    Every write goes to the primary and pins the rest of the request to it.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = get_routing_state()
+        if state is None:
+            return None
+        return state.db_for_read()
+
+    def db_for_write(self, model, **hints):
+        state = get_routing_state()
+        if state is not None:
+            state.wrote = True
+        # Not the instance's own alias: it may have been read from a replica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from dashboard.models import BaseModel
+
+
+@receiver([post_save, post_delete])
+def regenerate_static_api(sender, instance, signal, **kwargs):
+    """Rebuild the prebuilt JSON files that depend on the changed row."""
+    if settings.STATIC_API_AUTOBUILD and isinstance(instance, BaseModel):
+        from client.prebuild import schedule_regeneration
+
+        schedule_regeneration(instance, deleted=signal is post_delete, using=kwargs.get('using'))
@@ -0,0 +1,208 @@
+"""
+Read-only SQLite snapshots of the public content.
+
+``publish_snapshot`` copies every non-deleted row the client and academy API
+read into a fresh SQLite file and atomically moves it into place. Nodes
+running with ``SNAPSHOT_MODE`` on route reads of those models to the
+``snapshot`` database (see ``client.routers.SnapshotRouter``), which opens the
+file read-only and memory-mapped. A new file is picked up on the next request
+without a restart: connections still reading the old file are closed and the
+cached responses derived from it are invalidated.
+"""
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from dashboard import models as dashboard_model
+from academy import models as academy_model
+from utils.cache import bump_table_version
+
+import os
+import tempfile
+import threading
+
+SNAPSHOT_ALIAS = 'snapshot'
+
+SNAPSHOT_MODELS = (
+    dashboard_model.Brand,
+    dashboard_model.Testimonial,
+    dashboard_model.FAQ,
+    dashboard_model.Blog,
+    dashboard_model.HomepageContent,
+    dashboard_model.Gallery,
+    dashboard_model.OurApproach,
+    dashboard_model.OurProces,
+    dashboard_model.CaseStudy,
+    dashboard_model.ExpertiseItem,
+    dashboard_model.CaseStudyImages,
+    dashboard_model.Services,
+    dashboard_model.ServiceItems,
+    dashboard_model.JobPost,
+    dashboard_model.SEO,
+    academy_model.AcademyBlog,
+    academy_model.AcademyFAQ,
+    academy_model.AcademyGallery,
+)
+
+
+def _build_connection(path):
+    """A connection to a new SQLite file, registered for this thread only."""
+    connection = DatabaseWrapper({
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'USER': '',
+        'PASSWORD': '',
+        'HOST': '',
+        'PORT': '',
+        'ATOMIC_REQUESTS': False,
+        'AUTOCOMMIT': True,
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': False,
+        'OPTIONS': {},
+        'TIME_ZONE': None,
+        'TEST': {},
+    }, alias='snapshot-build')
+    # schema_editor() and atomic() look connections up by alias
+    connections[connection.alias] = connection
+    return connection
+
+
+def _published_rows(model):
+    """Non-deleted rows of ``model`` whose parents are published too."""
+    queryset = model._base_manager.using('default').filter(is_deleted=False)
+    for field in model._meta.concrete_fields:
+        if field.is_relation and field.related_model in SNAPSHOT_MODELS:
+            queryset = queryset.filter(**{f"{field.name}__is_deleted": False})
+    return queryset.order_by()
+
+
+def _copy_rows(connection, model, chunk_size=500):
+    fields = model._meta.concrete_fields
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(model._meta.db_table),
+        ', '.join(quote(field.column) for field in fields),
+        ', '.join('%s' for _ in fields),
+    )
+    rows = _published_rows(model).values_list(*(field.attname for field in fields))
+    count = 0
+    batch = []
+    with connection.cursor() as cursor:
+        # Values are prepared directly so no save()/pre_save hooks run
+        for row in rows.iterator(chunk_size=chunk_size):
+            batch.append([
+                field.get_db_prep_save(value, connection=connection)
+                for field, value in zip(fields, row)
+            ])
+            if len(batch) >= chunk_size:
+                cursor.executemany(sql, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+            count += len(batch)
+    return count
+
+
+def _create_indexes(connection, model):
+    """Indexes for the public listing queries: live rows, newest first."""
+    quote = connection.ops.quote_name
+    table = model._meta.db_table
+    name = quote(f"snapshot_{table.replace('.', '_')}_live")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE INDEX {name} ON {quote(table)} "
+            f"({quote('is_deleted')}, {quote('date_added')} DESC, {quote('id')})"
+        )
+
+
+def publish_snapshot(path=None):
+    """
+    Export the public content to ``path`` and return ``{model label: rows}``.
+
+    The file is built next to ``path`` and moved over it in one rename, so
+    readers either see the previous snapshot or the complete new one.
+    """
+    path = path or settings.SNAPSHOT_PATH
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-', suffix='.sqlite3')
+    os.close(descriptor)
+
+    counts = {}
+    connection = _build_connection(temp_path)
+    try:
+        with connection.schema_editor() as editor:
+            for model in SNAPSHOT_MODELS:
+                editor.create_model(model)
+        with connection.constraint_checks_disabled():
+            for model in SNAPSHOT_MODELS:
+                counts[model._meta.label] = _copy_rows(connection, model)
+        for model in SNAPSHOT_MODELS:
+            _create_indexes(connection, model)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+            cursor.execute('VACUUM')
+        connection.close()
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except Exception:
+        connection.close()
+        os.remove(temp_path)
+        raise
+    finally:
+        del connections[connection.alias]
+    return counts
+
+
+def _file_identity(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns)
+
+
+_current_identity = None
+_identity_lock = threading.Lock()
+
+
+def on_snapshot_connection(sender, connection, **kwargs):
+    """Remember which file a snapshot connection opened and memory-map it."""
+    if connection.alias != SNAPSHOT_ALIAS:
+        return
+    connection.snapshot_identity = _file_identity(settings.SNAPSHOT_PATH)
+    connection.connection.execute(f"PRAGMA mmap_size = {int(settings.SNAPSHOT_MMAP_SIZE)}")
+    connection.connection.execute('PRAGMA query_only = 1')
+
+
+def check_snapshot(**kwargs):
+    """
+    Switch to a newly published snapshot file.
+
+    Runs at the start of each request. The stat is cheap; when the file was
+    replaced, this thread's connection to the old one is closed so the next
+    query opens the new file, and the first thread of the process to notice
+    invalidates everything cached from the previous snapshot.
+    """
+    global _current_identity
+    identity = _file_identity(settings.SNAPSHOT_PATH)
+    connection = connections[SNAPSHOT_ALIAS]
+    if connection.connection is not None and getattr(connection, 'snapshot_identity', None) != identity:
+        connection.close()
+
+    if identity != _current_identity:
+        with _identity_lock:
+            if identity == _current_identity:
+                return
+            previous, _current_identity = _current_identity, identity
+        if previous is not None:
+            for model in SNAPSHOT_MODELS:
+                bump_table_version(model._meta.db_table, using=SNAPSHOT_ALIAS)
+
+
+def enable_snapshot_mode():
+    connection_created.connect(on_snapshot_connection, dispatch_uid='snapshot-connection')
+    request_started.connect(check_snapshot, dispatch_uid='snapshot-check')
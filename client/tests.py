@@ -1,3 +1,1186 @@
-from django.test import TestCase
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from django_ckeditor_5.fields import CKEditor5Field
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import InvalidToken
 
-# Create your tests here.
+from academy import serializer as academy_serializer
+from client.prebuild import StaticAPIBuilder
+from client.routers import ReplicaRouter, SnapshotRouter
+from client.snapshot import SNAPSHOT_ALIAS, check_snapshot, on_snapshot_connection, publish_snapshot
+from client.views import BatchAPIView
+from dashboard import models as dashboard_model
+from dashboard import serializer as dashboard_serializer
+from utils.cache import bump_table_version, get_table_versions
+from utils.compression import compress_variants
+from utils import ids
+from utils.db_pool import ConnectionPool, PoolTimeout
+from utils.media import MediaURLSerializerMixin
+from utils.prefetch import plan_queryset
+from utils.queries import assert_query_budget, view_query_budget
+from utils.renderers import FastJSONRenderer, PreEncodedJSON
+from utils.replicas import PIN_COOKIE, ReplicaRoutingMiddleware, get_routing_state, routed_as
+from utils.routing import (
+    AuthenticationMiddleware, CsrfViewMiddleware, MessageMiddleware, RouteGroupJWTAuthentication,
+    RouteGroupMiddleware, SessionMiddleware, match_route_group,
+)
+from utils.sparse import SparseFieldsetMixin
+from utils import surrogate
+
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+import base64
+import contextlib
+import gzip
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+LOCAL_CACHES = {
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tests-shared',
+    },
+    # Two workers' view of the same shared cache
+    'worker1': {
+        'BACKEND': 'utils.cache_backends.TwoTierCache',
+        'OPTIONS': {'L2': 'shared', 'LOCAL_L2': True, 'SYNC_INTERVAL': 0},
+    },
+    'worker2': {
+        'BACKEND': 'utils.cache_backends.TwoTierCache',
+        'OPTIONS': {'L2': 'shared', 'LOCAL_L2': True, 'SYNC_INTERVAL': 0},
+    },
+}
+
+# Settings for request tests: strict budgets and a cold response cache.
+# Sections run one after the other, as pool threads can't see rows written
+# in the test's transaction.
+API_TEST_SETTINGS = {
+    'CACHES': {**LOCAL_CACHES, 'default': LOCAL_CACHES['worker1']},
+    'API_RESPONSE_CACHE': True,
+    'QUERY_INSTRUMENTATION': True,
+    'QUERY_BUDGET_STRICT': True,
+    'API_SECTION_WORKERS': 1,
+    'DATABASE_REPLICAS': [],
+}
+
+
+class QueryBudgetTestMixin:
+    """Requests that fail when they run more queries than their view declares."""
+
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+
+    def get_within_budget(self, path):
+        budget = view_query_budget(path)
+        self.assertIsNotNone(budget, f"{path} declares no query budget")
+        with assert_query_budget(budget):
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class TwoTierCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        caches['shared'].clear()
+        self.worker1 = caches['worker1']
+        self.worker2 = caches['worker2']
+
+    def test_set_invalidates_other_workers(self):
+        self.worker1.set('key', 'old')
+        self.assertEqual(self.worker2.get('key'), 'old')
+        self.worker1.set('key', 'new')
+        self.assertEqual(self.worker2.get('key'), 'new')
+
+    def test_delete_and_incr_invalidate_other_workers(self):
+        self.worker1.set('counter', 1)
+        self.worker1.set('gone', 'value')
+        self.assertEqual(self.worker2.get_many(['counter', 'gone']), {'counter': 1, 'gone': 'value'})
+        self.worker1.incr('counter')
+        self.worker1.delete('gone')
+        self.assertEqual(self.worker2.get_many(['counter', 'gone']), {'counter': 2})
+
+    def test_repeated_reads_are_served_from_l1(self):
+        self.worker1.set('key', 'value')
+        before = self.worker2.get_stats()
+        self.worker2.get('key')
+        self.worker2.get('key')
+        after = self.worker2.get_stats()
+        self.assertEqual(after['l1_hits'] - before['l1_hits'], 1)
+        self.assertEqual(after['l2_hits'] - before['l2_hits'], 1)
+
+    def test_clear_flushes_other_workers(self):
+        self.worker1.set('key', 'value')
+        self.worker2.get('key')
+        self.worker1.clear()
+        self.assertIsNone(self.worker2.get('key'))
+
+    def test_local_l2_is_refused_outside_tests(self):
+        cache_settings = {
+            **LOCAL_CACHES,
+            'worker1': {'BACKEND': 'utils.cache_backends.TwoTierCache', 'OPTIONS': {'L2': 'shared'}},
+        }
+        with self.settings(CACHES=cache_settings):
+            with self.assertRaises(ImproperlyConfigured):
+                caches['worker1'].get('key')
+
+
+@override_settings(
+    CACHES={**LOCAL_CACHES, 'default': LOCAL_CACHES['worker1']},
+    DATABASE_REPLICAS=['replica1'], DATABASE_REPLICA_MAX_LAG=0.2,
+)
+class ReplicaLagBumpTests(SimpleTestCase):
+
+    def test_writes_share_one_delayed_bump_per_table(self):
+        threads = threading.active_count()
+        for _ in range(50):
+            bump_table_version('lag_test_a')
+            bump_table_version('lag_test_b')
+        self.assertLessEqual(threading.active_count(), threads + 1)
+        versions = get_table_versions(['lag_test_a', 'lag_test_b'])
+
+        time.sleep(1)
+        bumped = get_table_versions(['lag_test_a', 'lag_test_b'])
+        for before, after in zip(versions, bumped):
+            # A burst straddling the end of a lag window gets one more bump
+            self.assertIn(after - before, (1, 2))
+
+
+@override_settings(**API_TEST_SETTINGS)
+class BatchTests(TestCase):
+    path = '/api/v1/client/batch/'
+
+    @classmethod
+    def setUpTestData(cls):
+        for n in range(3):
+            dashboard_model.FAQ.objects.create(question=f'Question {n}?', answer='<p>Answer</p>')
+            dashboard_model.Brand.objects.create(name=f'Brand {n}', logo=f'brands/{n}.png')
+            dashboard_model.Blog.objects.create(
+                title=f'Blog {n}', introduction='<p>Intro</p>', description='<p>Body</p>', slug=f'blog-{n}',
+            )
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def batch(self, paths):
+        body = json.dumps({'paths': paths})
+        budget = BatchAPIView.query_budget(RequestFactory().post(self.path, body, content_type='application/json'))
+        with assert_query_budget(budget):
+            response = self.client.post(self.path, body, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_budget_is_the_sum_of_the_batched_views(self):
+        paths = ['/api/v1/client/faq/', '/api/v1/client/blog/blog-1', '/api/v1/client/homepage/?sections=brand,faq']
+        request = RequestFactory().post(self.path, json.dumps({'paths': paths}), content_type='application/json')
+        self.assertEqual(BatchAPIView.query_budget(request), 1 + 2 + 2)
+        items = self.batch(paths).json()['data']
+        self.assertEqual([item['status'] for item in items], [200, 200, 200])
+        self.assertEqual(items[1]['body']['data']['slug'], 'blog-1')
+
+    def test_only_public_api_paths_are_run(self):
+        items = self.batch(['/admin/', self.path, '/api/v1/client/faq/']).json()['data']
+        self.assertEqual([item['status'] for item in items], [400, 400, 200])
+        self.assertEqual([item['body'] for item in items[:2]], [None, None])
+
+    def test_failing_items_keep_their_own_status(self):
+        items = self.batch(['/api/v1/client/nope/', '/api/v1/client/enquiry/', '/api/v1/client/blog/missing']).json()['data']
+        self.assertEqual([item['status'] for item in items], [404, 405, 404])
+
+    def test_invalid_batches_are_rejected(self):
+        for body in ({'paths': '/api/v1/client/faq/'}, {'paths': [1]}, {'paths': ['/api/v1/client/faq/'] * 21}):
+            with self.subTest(body=body):
+                response = self.client.post(self.path, json.dumps(body), content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+
+    def test_cached_bodies_are_embedded_as_json(self):
+        expected = self.client.get('/api/v1/client/faq/').json()
+        for backend in ('orjson', 'stdlib'):
+            with self.subTest(backend=backend), self.settings(JSON_RENDERER_BACKEND=backend):
+                # The FAQ list now comes from the response cache as PreEncodedJSON
+                response = self.batch(['/api/v1/client/faq/'])
+                self.assertEqual(response.json()['data'][0]['body'], expected)
+
+
+@override_settings(**API_TEST_SETTINGS)
+class SurrogateKeyTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.blog = dashboard_model.Blog.objects.create(
+            title='Blog', introduction='<p>Intro</p>', description='<p>Body</p>', slug='blog', image='blogs/blog.webp',
+        )
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def test_cached_responses_keep_their_keys(self):
+        for _ in range(2):
+            response = self.client.get('/api/v1/client/blog/blog')
+            self.assertEqual(set(response['Surrogate-Key'].split()), {'blogs', f'blogs/{self.blog.pk}'})
+            self.assertEqual(set(response['Cache-Tag'].split(',')), {'blogs', f'blogs/{self.blog.pk}'})
+        self.assertEqual(self.client.get('/api/v1/client/blogs/')['Surrogate-Key'], 'blogs')
+
+    def test_saves_queue_one_debounced_purge(self):
+        # A fresh URL gets a fresh dispatcher
+        purge_url = f'https://cdn.test/purge/{uuid.uuid4()}'
+        with self.settings(CDN_PURGE_URL=purge_url, CDN_PURGE_DEBOUNCE=0.05, CDN_PURGE_MAX_DELAY=1), \
+                mock.patch.object(surrogate.PurgeDispatcher, '_send') as send:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.blog.title = 'Edited'
+                self.blog.save()
+                dashboard_model.FAQ.objects.create(question='Question?', answer='<p>Answer</p>')
+            self.assertEqual(send.call_count, 0)
+            time.sleep(0.5)
+        send.assert_called_once()
+        keys = send.call_args.args[0]
+        self.assertEqual(keys, sorted(keys))
+        self.assertLessEqual({'blogs', f'blogs/{self.blog.pk}', 'media/blogs/blog.webp', 'faq'}, set(keys))
+
+    def test_purges_are_sent_in_batches(self):
+        dispatcher = surrogate.PurgeDispatcher('https://cdn.test/purge', token='secret', batch_size=2)
+        with mock.patch('urllib.request.urlopen') as urlopen:
+            dispatcher.enqueue({'a', 'b', 'c'})
+            dispatcher.flush()
+        batches = [json.loads(call.args[0].data) for call in urlopen.call_args_list]
+        self.assertEqual(batches, [{'surrogate_keys': ['a', 'b']}, {'surrogate_keys': ['c']}])
+        self.assertEqual(urlopen.call_args.args[0].get_header('Authorization'), 'Bearer secret')
+
+
+@override_settings(**API_TEST_SETTINGS)
+class QuerySetCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for n in range(3):
+            dashboard_model.FAQ.objects.create(question=f'Question {n}?', answer='<p>Answer</p>')
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def questions(self):
+        return list(dashboard_model.FAQ.live.order_by('question').values_list('question', flat=True).cached())
+
+    def assertCachedQuestions(self, expected):
+        self.assertEqual(self.questions(), expected)
+        with assert_query_budget(0):
+            self.assertEqual(self.questions(), expected)
+
+    def test_results_are_cached(self):
+        self.assertCachedQuestions(['Question 0?', 'Question 1?', 'Question 2?'])
+
+    def test_update_invalidates(self):
+        self.assertCachedQuestions(['Question 0?', 'Question 1?', 'Question 2?'])
+        dashboard_model.FAQ.objects.filter(question='Question 1?').update(question='Question 3?')
+        self.assertCachedQuestions(['Question 0?', 'Question 2?', 'Question 3?'])
+
+    def test_delete_invalidates(self):
+        self.assertCachedQuestions(['Question 0?', 'Question 1?', 'Question 2?'])
+        dashboard_model.FAQ.objects.filter(question='Question 0?').delete()
+        self.assertCachedQuestions(['Question 1?', 'Question 2?'])
+
+    def test_bulk_update_invalidates(self):
+        self.assertCachedQuestions(['Question 0?', 'Question 1?', 'Question 2?'])
+        faq = dashboard_model.FAQ.objects.get(question='Question 2?')
+        faq.is_deleted = True
+        dashboard_model.FAQ.objects.bulk_update([faq], ['is_deleted'])
+        self.assertCachedQuestions(['Question 0?', 'Question 1?'])
+
+    def test_bulk_create_invalidates(self):
+        self.assertCachedQuestions(['Question 0?', 'Question 1?', 'Question 2?'])
+        dashboard_model.FAQ.objects.bulk_create([dashboard_model.FAQ(question='Question 3?', answer='<p>Answer</p>')])
+        self.assertCachedQuestions(['Question 0?', 'Question 1?', 'Question 2?', 'Question 3?'])
+
+    def test_writes_to_joined_tables_invalidate(self):
+        services = dashboard_model.Services.objects.create(name='Service', description='Service', slug='service')
+        dashboard_model.ServiceItems.objects.create(services=services, title='Item', description='Item')
+
+        def home_items():
+            return list(dashboard_model.ServiceItems.live.filter(services__is_home=True).values_list('title', flat=True).cached())
+
+        self.assertEqual(home_items(), [])
+        dashboard_model.Services.objects.filter(pk=services.pk).update(is_home=True)
+        self.assertEqual(home_items(), ['Item'])
+
+
+@override_settings(**API_TEST_SETTINGS, STATIC_API_AUTOBUILD=True)
+class StaticAPIPrebuildTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        dashboard_model.FAQ.objects.create(question='Question?', answer='<p>Answer</p>')
+        dashboard_model.Blog.objects.create(
+            title='Blog', introduction='<p>Intro</p>', description='<p>Body</p>', slug='blog',
+        )
+        for n in range(2):
+            dashboard_model.CaseStudy.objects.create(
+                hero_title=f'Case {n}', hero_subtitle='Subtitle', about_description='About',
+                approach_description='Approach', slug=f'case-{n}',
+            )
+
+    def setUp(self):
+        caches['default'].clear()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.builder = StaticAPIBuilder(root=root.name, host='testserver')
+        # regenerate() runs on the batch thread in production and closes its connections
+        patcher = mock.patch('client.prebuild.connections')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def files(self):
+        """Each written file's inode; write_atomic replaces a file with a new one."""
+        return {
+            os.path.relpath(os.path.join(directory, name), self.builder.root): os.stat(os.path.join(directory, name)).st_ino
+            for directory, _, names in os.walk(self.builder.root) for name in names
+        }
+
+    def test_save_regenerates_the_affected_files_only(self):
+        self.builder.build()
+        before = self.files()
+        self.assertIn('api/v1/client/case-study/case-0.json', before)
+
+        case_study = dashboard_model.CaseStudy.objects.get(slug='case-1')
+        case_study.hero_title = 'Case 1 edited'
+        with mock.patch('client.prebuild._regenerator') as regenerator, self.captureOnCommitCallbacks(execute=True):
+            case_study.save()
+        items = regenerator.add.call_args.args[0]
+        self.assertEqual(items, {
+            ('case-study', '/api/v1/client/case-study/case-1'), ('case-studies', None), ('sitemap', None),
+        })
+
+        self.builder.regenerate(items)
+        after = self.files()
+        self.assertEqual(set(before), set(after))
+        self.assertEqual({name for name in after if after[name] != before[name]}, {
+            'api/v1/client/case-study/case-1.json',
+            'api/v1/client/case-study/index.json',
+            'api/v1/client/dynamic-sitemap/index.json',
+        })
+        with open(os.path.join(self.builder.root, 'api/v1/client/case-study/case-1.json')) as f:
+            self.assertEqual(json.load(f)['data']['hero_title'], 'Case 1 edited')
+
+    def test_deleted_details_are_removed(self):
+        self.builder.build()
+        dashboard_model.CaseStudy.objects.filter(slug='case-0').update(is_deleted=True)
+        self.builder.regenerate({('case-study', '/api/v1/client/case-study/case-0')})
+        self.assertNotIn('api/v1/client/case-study/case-0.json', self.files())
+        self.assertIn('api/v1/client/case-study/case-1.json', self.files())
+
+
+@override_settings(**API_TEST_SETTINGS)
+class SnapshotTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for n in range(3):
+            dashboard_model.FAQ.objects.create(question=f'Question {n}?', answer='<p>Answer</p>', is_deleted=n == 2)
+        for n in range(2):
+            services = dashboard_model.Services.objects.create(
+                name=f'Service {n}', description='Service', slug=f'service-{n}', is_deleted=n == 1,
+            )
+            dashboard_model.ServiceItems.objects.create(services=services, title=f'Item {n}', description='Item')
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.path = os.path.join(root.name, 'content.sqlite3')
+
+    def published(self, sql):
+        with contextlib.closing(sqlite3.connect(self.path)) as connection:
+            return [row[0] for row in connection.execute(sql)]
+
+    def open_snapshot(self):
+        """The snapshot database as SNAPSHOT_MODE configures it."""
+        connections.settings[SNAPSHOT_ALIAS] = connections.configure_settings({
+            'default': connections.settings['default'],
+            SNAPSHOT_ALIAS: {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': f"file:{self.path}?mode=ro&immutable=1",
+                'OPTIONS': {'uri': True},
+            },
+        })[SNAPSHOT_ALIAS]
+        connection_created.connect(on_snapshot_connection, dispatch_uid='snapshot-connection-test')
+
+        def close():
+            connection_created.disconnect(dispatch_uid='snapshot-connection-test')
+            connections[SNAPSHOT_ALIAS].close()
+            del connections[SNAPSHOT_ALIAS]
+            del connections.settings[SNAPSHOT_ALIAS]
+
+        self.addCleanup(close)
+        return connections[SNAPSHOT_ALIAS]
+
+    def test_only_published_rows_are_copied(self):
+        counts = publish_snapshot(self.path)
+        self.assertEqual(counts['dashboard.FAQ'], 2)
+        self.assertEqual(self.published('SELECT question FROM faq ORDER BY question'), ['Question 0?', 'Question 1?'])
+        self.assertEqual(self.published('SELECT slug FROM services'), ['service-0'])
+        # Items of a soft-deleted service are orphans on the public site
+        self.assertEqual(self.published('SELECT title FROM service_items'), ['Item 0'])
+        self.assertEqual(self.published("SELECT name FROM sqlite_master WHERE name = 'enquiry'"), [])
+
+    def test_router_sends_public_reads_to_the_snapshot(self):
+        router = SnapshotRouter()
+        self.assertEqual(router.db_for_read(dashboard_model.FAQ), SNAPSHOT_ALIAS)
+        self.assertIsNone(router.db_for_read(dashboard_model.Enquiry))
+        self.assertIsNone(router.db_for_write(dashboard_model.FAQ))
+        self.assertIs(router.allow_migrate(SNAPSHOT_ALIAS, 'dashboard', 'faq'), False)
+        self.assertIsNone(router.allow_migrate('default', 'dashboard', 'faq'))
+
+    def test_new_snapshots_are_picked_up_without_a_restart(self):
+        publish_snapshot(self.path)
+        with self.settings(SNAPSHOT_PATH=self.path):
+            connection = self.open_snapshot()
+            check_snapshot()
+            self.assertEqual(dashboard_model.FAQ.live.using(SNAPSHOT_ALIAS).count(), 2)
+
+            dashboard_model.FAQ.objects.create(question='Question 3?', answer='<p>Answer</p>')
+            versions = get_table_versions(['faq'])
+            publish_snapshot(self.path)
+            check_snapshot()
+            self.assertIsNone(connection.connection)
+            self.assertGreater(get_table_versions(['faq']), versions)
+            self.assertEqual(dashboard_model.FAQ.live.using(SNAPSHOT_ALIAS).count(), 3)
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """FastJSONRenderer writes the bytes DRF's JSONRenderer would."""
+    backends = ('orjson', 'stdlib')
+
+    def payload(self):
+        return {
+            'decimal': Decimal('12.50'),
+            'datetime': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            'naive': datetime(2024, 5, 1, 12, 30),
+            'date': date(2024, 5, 1),
+            'time': dt_time(9, 15, 30, 250000),
+            'duration': timedelta(hours=1, seconds=5),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Video'),
+            'text': 'Caf\u00e9 \u2028 \u2029 </script>',
+            'nested': [{'id': 1, 'ok': True, 'none': None, 'float': 1.5}],
+            'tuple': (1, 2),
+        }
+
+    def assertRendersLikeDRF(self, data, expected=None, accepted_media_type=None):
+        expected = JSONRenderer().render(data if expected is None else expected, accepted_media_type)
+        for backend in self.backends:
+            with self.subTest(backend=backend), self.settings(JSON_RENDERER_BACKEND=backend):
+                self.assertEqual(FastJSONRenderer().render(data, accepted_media_type), expected)
+
+    def test_types(self):
+        self.assertRendersLikeDRF(self.payload())
+
+    def test_pre_encoded_json(self):
+        content = JSONRenderer().render(self.payload())
+        data = {'StatusCode': 6000, 'body': PreEncodedJSON(content), 'items': [PreEncodedJSON(b'[1,2]')]}
+        self.assertRendersLikeDRF(data, {'StatusCode': 6000, 'body': json.loads(content), 'items': [[1, 2]]})
+        self.assertRendersLikeDRF(PreEncodedJSON(content), self.payload())
+
+    def test_indent(self):
+        content = JSONRenderer().render(self.payload())
+        for indent in (0, 2, 4):
+            with self.subTest(indent=indent):
+                accepted_media_type = f'application/json; indent={indent}'
+                self.assertRendersLikeDRF(self.payload(), accepted_media_type=accepted_media_type)
+                self.assertRendersLikeDRF(
+                    {'body': PreEncodedJSON(content)}, {'body': json.loads(content)}, accepted_media_type,
+                )
+
+    def test_empty(self):
+        self.assertRendersLikeDRF(None)
+        self.assertRendersLikeDRF({})
+
+
+class MediaURLTests(SimpleTestCase):
+    """MediaURL fields render what DRF's request.build_absolute_uri(file.url) does."""
+
+    class DRFSerializer(serializers.ModelSerializer):
+        class Meta:
+            model = dashboard_model.Testimonial
+            fields = ['image', 'video', 'thumbnail']
+
+    class MediaSerializer(MediaURLSerializerMixin, serializers.ModelSerializer):
+        class Meta:
+            model = dashboard_model.Testimonial
+            fields = ['image', 'video', 'thumbnail']
+
+    instances = [
+        dashboard_model.Testimonial(image='testimonials/photo.webp', video='testimonials/clip one.mp4', thumbnail=''),
+        dashboard_model.Testimonial(image='testimonials/caf\u00e9 #1.webp', video=None, thumbnail='thumbs/t.webp'),
+    ]
+
+    def assertMatchesDRF(self, context):
+        for instance in self.instances:
+            self.assertEqual(
+                self.MediaSerializer(instance, context=context).data, self.DRFSerializer(instance, context=context).data,
+            )
+
+    def test_with_a_request(self):
+        factory = RequestFactory()
+        requests = [
+            factory.get('/api/v1/client/testimonial/'),
+            factory.get('/api/v1/client/testimonial/', secure=True, HTTP_HOST='api.example.com'),
+            factory.get('/api/v1/client/testimonial/', HTTP_HOST='localhost:8000'),
+        ]
+        for request in requests:
+            with self.subTest(host=request.get_host(), secure=request.is_secure()):
+                self.assertMatchesDRF({'request': request})
+
+    def test_without_a_request(self):
+        self.assertMatchesDRF({})
+
+    @override_settings(MEDIA_VARIANT_HOSTS={'image': ['https://img1.example.com', 'https://img2.example.com/'], 'file': []})
+    def test_variant_hosts(self):
+        request = RequestFactory().get('/api/v1/client/testimonial/')
+        data = self.MediaSerializer(self.instances[0], context={'request': request}).data
+        self.assertRegex(data['image'], r'^https://img[12]\.example\.com/media/testimonials/photo\.webp$')
+        self.assertEqual(data['video'], 'http://testserver/media/testimonials/clip%20one.mp4')
+        self.assertEqual(self.MediaSerializer(self.instances[0], context={'request': request}).data, data)
+
+
+@override_settings(**API_TEST_SETTINGS)
+class RouteGroupTests(TestCase):
+
+    def run_stack(self, method, path, **extra):
+        """Which of session, user and messages the middleware stack gave a request."""
+        request = RequestFactory().generic(method, path, **extra)
+        seen = {}
+
+        def view(request):
+            seen.update(
+                session=hasattr(request, 'session'), user=hasattr(request, 'user'), messages=hasattr(request, '_messages'),
+            )
+            return HttpResponse()
+
+        RouteGroupMiddleware(SessionMiddleware(AuthenticationMiddleware(MessageMiddleware(view))))(request)
+        return seen
+
+    def csrf_rejects(self, method, path):
+        request = RequestFactory().generic(method, path)
+        request.route_group = match_route_group(path, method)
+        def view(request):
+            return HttpResponse()
+
+        response = CsrfViewMiddleware(view).process_view(request, view, (), {})
+        return response is not None and response.status_code == 403
+
+    def test_public_api_gets_skip_session_and_auth(self):
+        for path in ('/api/v1/client/faq/', '/api/v1/academy/blogs/'):
+            with self.subTest(path=path):
+                self.assertEqual(self.run_stack('GET', path), {'session': False, 'user': False, 'messages': False})
+                self.assertFalse(self.csrf_rejects('GET', path))
+
+    def test_other_routes_run_the_full_stack(self):
+        for method, path in (('GET', '/admin/'), ('GET', '/api/v1/dashboard/blogs/'), ('POST', '/api/v1/client/enquiry/')):
+            with self.subTest(method=method, path=path):
+                self.assertEqual(self.run_stack(method, path), {'session': True, 'user': True, 'messages': True})
+
+    def test_csrf_is_never_skipped_for_unsafe_methods(self):
+        for path in ('/api/v1/client/enquiry/', '/admin/login/', '/api/v1/dashboard/blogs/'):
+            with self.subTest(path=path):
+                self.assertTrue(self.csrf_rejects('POST', path))
+
+    def test_admin_keeps_its_session_and_csrf_cookie(self):
+        response = Client(enforce_csrf_checks=True).get('/admin/login/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('csrftoken', response.cookies)
+        self.assertEqual(Client(enforce_csrf_checks=True).post('/admin/login/', {}).status_code, 403)
+
+    def test_public_api_ignores_bearer_tokens(self):
+        response = self.client.get('/api/v1/client/faq/', HTTP_AUTHORIZATION='Bearer not-a-token')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('csrftoken', response.cookies)
+
+        request = APIRequestFactory().get('/api/v1/dashboard/blogs/', HTTP_AUTHORIZATION='Bearer not-a-token')
+        request.route_group = match_route_group(request.path_info, 'GET')
+        with self.assertRaises(InvalidToken):
+            RouteGroupJWTAuthentication().authenticate(Request(request))
+
+
+class UUID7Tests(SimpleTestCase):
+
+    def setUp(self):
+        self.addCleanup(self.restore_state, ids._last_ms, ids._counter)
+
+    @staticmethod
+    def restore_state(last_ms, counter):
+        ids._last_ms, ids._counter = last_ms, counter
+
+    def frozen_clock(self, ms):
+        """Pin uuid7's clock to ``ms``; later than any id made so far so it's used as is."""
+        clock = mock.Mock()
+        clock.time_ns.return_value = ms * 1_000_000
+        patcher = mock.patch.object(ids, 'time', clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return clock
+
+    @staticmethod
+    def fields(value):
+        """``(timestamp ms, counter)`` of a uuid7."""
+        return value.int >> 80, (value.int >> 64) & 0xFFF
+
+    def test_version_variant_and_timestamp(self):
+        before = time.time_ns() // 1_000_000
+        value = ids.uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+        self.assertLessEqual(before, self.fields(value)[0])
+        self.assertLessEqual(self.fields(value)[0], time.time_ns() // 1_000_000)
+        self.assertEqual(uuid.UUID(str(value)), value)
+
+    def test_ids_increase_within_a_millisecond(self):
+        ms = time.time_ns() // 1_000_000 + 60_000
+        self.frozen_clock(ms)
+        values = [ids.uuid7() for _ in range(100)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), 100)
+        self.assertEqual({self.fields(value)[0] for value in values}, {ms})
+        self.assertLess(self.fields(values[0])[1], 0x800)
+
+    def test_counter_overflow_borrows_the_next_millisecond(self):
+        ms = time.time_ns() // 1_000_000 + 120_000
+        self.frozen_clock(ms)
+        values = [ids.uuid7() for _ in range(0x1000 + 10)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), len(values))
+        overflowed = [value for value in values if self.fields(value)[0] == ms + 1]
+        self.assertTrue(overflowed)
+        self.assertEqual(self.fields(overflowed[0])[1], 0)
+        self.assertEqual({self.fields(value)[0] for value in values}, {ms, ms + 1})
+
+    def test_ids_increase_when_the_clock_goes_back(self):
+        ms = time.time_ns() // 1_000_000 + 180_000
+        clock = self.frozen_clock(ms)
+        first = ids.uuid7()
+        clock.time_ns.return_value = (ms - 5_000) * 1_000_000
+        self.assertGreater(ids.uuid7(), first)
+
+
+@override_settings(**API_TEST_SETTINGS)
+class FragmentCacheTests(TestCase):
+    """Editing a row re-serializes that row only, whichever write path edits it."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for n in range(3):
+            dashboard_model.Testimonial.objects.create(name=f'Client {n}', description='<p>Great</p>')
+
+    def setUp(self):
+        caches['default'].clear()
+        self.rows = list(dashboard_model.Testimonial.live.order_by('name'))
+        self.render()
+
+    def render(self):
+        """The names rendered and how many rows were serialized rather than read from the cache."""
+        with mock.patch.object(
+            dashboard_serializer.TestimonialSerializer, 'to_representation', autospec=True, side_effect=dashboard_serializer.TestimonialSerializer.to_representation,
+        ) as serialized:
+            data = dashboard_serializer.TestimonialSerializer(dashboard_model.Testimonial.live.order_by('name'), many=True).data
+        return [row['name'] for row in data], serialized.call_count
+
+    def test_unchanged_rows_are_served_from_the_cache(self):
+        self.assertEqual(self.render(), (['Client 0', 'Client 1', 'Client 2'], 0))
+
+    def test_save_reserializes_the_saved_row_only(self):
+        self.rows[1].name = 'Client 1 edited'
+        self.rows[1].save()
+        self.assertEqual(self.render(), (['Client 0', 'Client 1 edited', 'Client 2'], 1))
+
+    def test_update_reserializes_the_updated_rows_only(self):
+        dashboard_model.Testimonial.objects.filter(pk=self.rows[2].pk).update(name='Client 2 edited')
+        self.assertEqual(self.render(), (['Client 0', 'Client 1', 'Client 2 edited'], 1))
+
+    def test_bulk_update_reserializes_the_updated_rows_only(self):
+        self.rows[0].name = 'Client 0 edited'
+        dashboard_model.Testimonial.objects.bulk_update([self.rows[0]], ['name'])
+        self.assertEqual(self.render(), (['Client 0 edited', 'Client 1', 'Client 2'], 1))
+
+
+@override_settings(**API_TEST_SETTINGS)
+class ClientQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        dashboard_model.HomepageContent.objects.create(
+            our_metrics_description='Metrics', box1_number=1, box1_description='One',
+            box2_number=2, box2_description='Two', box3_number=3, box3_description='Three',
+        )
+        for n in range(12):
+            dashboard_model.Brand.objects.create(name=f'Brand {n}', logo=f'brands/{n}.png')
+            dashboard_model.Testimonial.objects.create(name=f'Client {n}', description='<p>Great</p>')
+            dashboard_model.FAQ.objects.create(question=f'Question {n}?', answer='<p>Answer</p>')
+            dashboard_model.Blog.objects.create(
+                title=f'Blog {n}', introduction='<p>Intro</p>', description='<p>Body</p>', slug=f'blog-{n}',
+            )
+            dashboard_model.Gallery.objects.create(image=f'gallery/{n}.webp')
+            dashboard_model.OurApproach.objects.create(title=f'Approach {n}')
+            dashboard_model.OurProces.objects.create(title=f'Step {n}', description='Step')
+            dashboard_model.SEO.objects.create(path=f'/page-{n}/')
+            dashboard_model.JobPost.objects.create(job_title=f'Job {n}', contents='<p>Job</p>')
+        for n in range(4):
+            services = dashboard_model.Services.objects.create(
+                name=f'Service {n}', description='Service', slug=f'service-{n}', is_home=n < 3,
+            )
+            case_study = dashboard_model.CaseStudy.objects.create(
+                hero_title=f'Case {n}', hero_subtitle='Subtitle', about_description='About',
+                approach_description='Approach', slug=f'case-{n}',
+            )
+            for m in range(3):
+                dashboard_model.ServiceItems.objects.create(services=services, title=f'Item {m}', description='Item')
+                dashboard_model.ExpertiseItem.objects.create(case_study=case_study, expertise_items=f'Expertise {m}')
+                dashboard_model.CaseStudyImages.objects.create(case_study=case_study, image=f'case_study/{m}.webp')
+        cls.job = dashboard_model.JobPost.objects.first()
+
+    def test_brand(self):
+        self.get_within_budget('/api/v1/client/brand/')
+
+    def test_our_metrics(self):
+        self.get_within_budget('/api/v1/client/our-metrics/')
+
+    def test_testimonial(self):
+        self.get_within_budget('/api/v1/client/testimonial/')
+
+    def test_testimonial_cursor(self):
+        self.get_within_budget('/api/v1/client/testimonial/?cursor=')
+
+    def test_faq(self):
+        self.get_within_budget('/api/v1/client/faq/')
+
+    def test_blogs(self):
+        self.get_within_budget('/api/v1/client/blogs/?page=2')
+
+    def test_blogs_cursor(self):
+        self.get_within_budget('/api/v1/client/blogs/?cursor=')
+
+    def test_blog_detail(self):
+        self.get_within_budget('/api/v1/client/blog/blog-3')
+
+    def test_gallery(self):
+        self.get_within_budget('/api/v1/client/gallery/')
+
+    def test_gallery_cursor(self):
+        self.get_within_budget('/api/v1/client/gallery/?cursor=')
+
+    def test_our_approach(self):
+        self.get_within_budget('/api/v1/client/our-approach/')
+
+    def test_our_proces(self):
+        self.get_within_budget('/api/v1/client/our-proces/')
+
+    def test_seo(self):
+        self.get_within_budget('/api/v1/client/seo/')
+
+    def test_homepage(self):
+        self.get_within_budget('/api/v1/client/homepage/')
+
+    def test_homepage_sections(self):
+        self.assertEqual(view_query_budget('/api/v1/client/homepage/?sections=brand,faq,brand'), 2)
+        data = self.get_within_budget('/api/v1/client/homepage/?sections=brand,faq,brand').json()['data']
+        self.assertEqual(list(data), ['brand', 'faq'])
+
+    def test_homepage_listing_projection(self):
+        data = self.get_within_budget('/api/v1/client/homepage/?sections=faq,our-approach&projection=listing').json()['data']
+        self.assertEqual(set(data['faq'][0]), {'id', 'question'})
+        self.assertEqual(set(data['our-approach'][0]), {'id', 'title'})
+
+    def test_homepage_unknown_sections(self):
+        with assert_query_budget(view_query_budget('/api/v1/client/homepage/?sections=faq,nope')):
+            response = self.client.get('/api/v1/client/homepage/?sections=faq,nope')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], 'Unknown sections: nope')
+
+    def test_services(self):
+        self.get_within_budget('/api/v1/client/services/')
+
+    def test_services_home(self):
+        self.get_within_budget('/api/v1/client/services/?is_home=1')
+
+    def test_service_detail(self):
+        self.get_within_budget('/api/v1/client/services/service-1')
+
+    def test_soft_deleted_details_are_not_found(self):
+        dashboard_model.Blog.objects.filter(slug='blog-4').update(is_deleted=True)
+        dashboard_model.CaseStudy.objects.filter(slug='case-2').update(is_deleted=True)
+        dashboard_model.Services.objects.filter(slug='service-2').update(is_deleted=True)
+        for path in ('/api/v1/client/blog/blog-4', '/api/v1/client/case-study/case-2', '/api/v1/client/services/service-2'):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 404)
+
+    def test_case_studies(self):
+        self.get_within_budget('/api/v1/client/case-study/')
+
+    def test_case_study_detail(self):
+        self.get_within_budget('/api/v1/client/case-study/case-1')
+
+    def test_job_posts(self):
+        self.get_within_budget('/api/v1/client/job-post/')
+
+    def test_job_post_detail(self):
+        self.get_within_budget(f'/api/v1/client/job-post/{self.job.pk}')
+
+    def test_dynamic_sitemap(self):
+        self.get_within_budget('/api/v1/client/dynamic-sitemap/')
+
+    def test_cached_responses_run_no_queries(self):
+        self.get_within_budget('/api/v1/client/services/')
+        with assert_query_budget(0):
+            self.client.get('/api/v1/client/services/')
+
+
+@override_settings(**API_TEST_SETTINGS)
+class ResponseCompressionTests(TestCase):
+    path = '/api/v1/client/faq/'
+
+    @classmethod
+    def setUpTestData(cls):
+        for n in range(12):
+            dashboard_model.FAQ.objects.create(question=f'Question {n}?', answer='<p>Answer</p>' * 20)
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def get(self, encoding):
+        with mock.patch('client.caching.compress_variants', wraps=compress_variants) as precompressed:
+            response = self.client.get(self.path, HTTP_ACCEPT_ENCODING=encoding)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(gzip.decompress(response.content))['StatusCode'], 6000)
+        return response, precompressed.call_count
+
+    def test_stored_payloads_are_compressed_once(self):
+        self.assertEqual(self.get('gzip')[1], 1)
+        response, precompressed = self.get('gzip')
+        self.assertEqual(precompressed, 0)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    @override_settings(API_RESPONSE_CACHE=False)
+    def test_uncached_payloads_are_compressed_on_the_fly(self):
+        response, precompressed = self.get('gzip')
+        self.assertEqual(precompressed, 0)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+
+@override_settings(**API_TEST_SETTINGS)
+class ListingProjectionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        dashboard_model.OurApproach.objects.create(title='Approach', description='Long description')
+        case_study = dashboard_model.CaseStudy.objects.create(
+            hero_title='Case', hero_subtitle='Subtitle', about_description='<p>About</p>',
+            approach_description='<p>Approach</p>', slug='case',
+        )
+        dashboard_model.ExpertiseItem.objects.create(case_study=case_study, expertise_items='Expertise')
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def test_every_public_serializer_declares_a_listing_projection(self):
+        for module in (dashboard_serializer, academy_serializer):
+            for serializer_class in vars(module).values():
+                if not (
+                    isinstance(serializer_class, type) and issubclass(serializer_class, SparseFieldsetMixin)
+                    and serializer_class.__module__ == module.__name__
+                ):
+                    continue
+                with self.subTest(serializer=serializer_class.__name__):
+                    meta = serializer_class.Meta
+                    self.assertLessEqual(set(meta.listing_fields), set(meta.fields))
+                    rich_text = {
+                        field.name for field in meta.model._meta.concrete_fields if isinstance(field, CKEditor5Field)
+                    }
+                    self.assertFalse(rich_text & set(meta.listing_fields))
+
+    def test_listing_projection_is_opt_in(self):
+        full = self.client.get('/api/v1/client/our-approach/').json()['data'][0]
+        listing = self.client.get('/api/v1/client/our-approach/?projection=listing').json()['data'][0]
+        self.assertIn('description', full)
+        self.assertEqual(set(listing), {'id', 'title'})
+
+    def test_listing_projection_defers_heavy_columns_of_details(self):
+        request = RequestFactory().get('/api/v1/client/case-study/case', {'projection': 'listing'})
+        request.query_params = request.GET
+        queryset = plan_queryset(
+            dashboard_model.CaseStudy.live.filter(slug='case'), dashboard_serializer.CaseStudyDetailSerializer,
+            context={'request': request},
+        )
+        self.assertLessEqual({'about_description', 'approach_description'}, queryset.first().get_deferred_fields())
+
+        data = self.client.get('/api/v1/client/case-study/case?projection=listing').json()['data']
+        self.assertNotIn('about_description', data)
+        self.assertEqual([item['expertise_items'] for item in data['expertise_items']], ['Expertise'])
+
+
+@override_settings(**API_TEST_SETTINGS)
+class KeysetPaginationTests(TestCase):
+    path = '/api/v1/client/testimonial/'
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        for n in range(25):
+            # Pairs of rows share a date_added, so ties are broken on id
+            dashboard_model.Testimonial.objects.create(
+                name=f'Client {n}', description='<p>Great</p>', date_added=now - timedelta(minutes=n // 2),
+            )
+        cls.expected = [
+            str(pk) for pk in dashboard_model.Testimonial.objects.order_by('-date_added', '-id').values_list('pk', flat=True)
+        ]
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def get_page(self, cursor):
+        response = self.client.get(self.path, {'cursor': cursor or '', 'page_size': 10})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def crafted_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip('=')
+
+    def test_cursors_walk_every_row_forward_and_back(self):
+        pages = []
+        cursor = ''
+        while cursor is not None:
+            page = self.get_page(cursor)
+            pages.append([row['id'] for row in page['data']])
+            cursor = page['pagination']['next_cursor']
+        self.assertEqual([len(ids) for ids in pages], [10, 10, 5])
+        self.assertEqual(sum(pages, []), self.expected)
+
+        previous = page['pagination']['previous_cursor']
+        self.assertEqual([row['id'] for row in self.get_page(previous)['data']], pages[1])
+
+    def test_cursor_reports_count(self):
+        self.assertEqual(self.get_page('')['pagination']['total_items'], 25)
+
+    def test_invalid_cursors_are_rejected(self):
+        now = timezone.now()
+        cursors = [
+            'not-a-cursor!',
+            self.crafted_cursor(['list']),
+            self.crafted_cursor({'d': now.isoformat(), 'i': 'not-a-uuid', 'r': 0}),
+            self.crafted_cursor({'d': now.isoformat(), 'i': 42, 'r': 0}),
+            self.crafted_cursor({'d': now.replace(tzinfo=None).isoformat(), 'i': str(uuid.uuid4()), 'r': 0}),
+            self.crafted_cursor({'d': 'yesterday', 'i': str(uuid.uuid4()), 'r': 0}),
+            self.crafted_cursor({'i': str(uuid.uuid4()), 'r': 0}),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.path, {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['StatusCode'], 6001)
+
+
+@override_settings(**{**API_TEST_SETTINGS, 'API_SECTION_WORKERS': 4})
+class ConcurrentSectionQueryTests(TransactionTestCase):
+    """Queries run on run_concurrently's pool threads count towards the request."""
+
+    def setUp(self):
+        caches['default'].clear()
+        for n in range(3):
+            dashboard_model.Brand.objects.create(name=f'Brand {n}', logo=f'brands/{n}.png')
+            dashboard_model.FAQ.objects.create(question=f'Question {n}?', answer='<p>Answer</p>')
+            dashboard_model.Blog.objects.create(
+                title=f'Blog {n}', introduction='<p>Intro</p>', description='<p>Body</p>', slug=f'blog-{n}',
+            )
+
+    def reported_queries(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return int(re.search(r'desc="(\d+) queries"', response['Server-Timing']).group(1))
+
+    def serial_queries(self, path):
+        caches['default'].clear()
+        with self.settings(API_SECTION_WORKERS=1), assert_query_budget(None) as recorder:
+            self.client.get(path)
+        return recorder.count
+
+    def test_homepage_sections(self):
+        self.assertEqual(self.reported_queries('/api/v1/client/homepage/'), self.serial_queries('/api/v1/client/homepage/'))
+
+    def test_blog_detail_and_related_blogs(self):
+        self.assertEqual(self.reported_queries('/api/v1/client/blog/blog-1'), 2)
+
+    def test_assert_query_budget_sees_pool_threads(self):
+        with assert_query_budget(None) as recorder:
+            self.client.get('/api/v1/client/blog/blog-1')
+        self.assertEqual(recorder.count, 2)
+
+
+class FakeCursor:
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql):
+        if self.connection.broken:
+            raise ConnectionError("server closed the connection")
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Just enough of a DB-API connection for the pool."""
+
+    def __init__(self):
+        self.broken = False
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+
+    def make_pool(self, **options):
+        options = {
+            'max_size': 2, 'timeout': 1.0, 'max_idle': 300.0, 'max_lifetime': 3600.0, 'check_interval': 30.0,
+            **options,
+        }
+        return ConnectionPool('default', **options)
+
+    def test_released_connections_are_reused(self):
+        pool = self.make_pool()
+        entry = pool.acquire(FakeConnection)
+        pool.release(entry)
+        self.assertIs(pool.acquire(FakeConnection), entry)
+        stats = pool.get_stats()
+        self.assertEqual((stats['created'], stats['reused'], stats['in_use'], stats['size']), (1, 1, 1, 1))
+
+    def test_acquire_times_out_when_the_pool_is_full(self):
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        pool.acquire(FakeConnection)
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(FakeConnection)
+        self.assertEqual(pool.get_stats()['timeouts'], 1)
+
+    def test_waiters_get_the_next_released_connection(self):
+        pool = self.make_pool(max_size=1)
+        entry = pool.acquire(FakeConnection)
+        releaser = threading.Timer(0.05, pool.release, (entry,))
+        releaser.start()
+        self.assertIs(pool.acquire(FakeConnection), entry)
+        releaser.join()
+        self.assertGreater(pool.get_stats()['wait_max'], 0)
+
+    def test_unhealthy_connections_are_replaced(self):
+        pool = self.make_pool(check_interval=0)
+        entry = pool.acquire(FakeConnection)
+        pool.release(entry)
+        entry.connection.broken = True
+        replacement = pool.acquire(FakeConnection)
+        self.assertIsNot(replacement, entry)
+        self.assertTrue(entry.connection.closed)
+        stats = pool.get_stats()
+        self.assertEqual((stats['health_check_failures'], stats['size']), (1, 1))
+
+    def test_unusable_and_expired_connections_are_closed_on_release(self):
+        pool = self.make_pool(max_lifetime=0.01)
+        unusable = pool.acquire(FakeConnection)
+        pool.release(unusable, reusable=False)
+        expired = pool.acquire(FakeConnection)
+        time.sleep(0.02)
+        pool.release(expired)
+        self.assertTrue(unusable.connection.closed and expired.connection.closed)
+        stats = pool.get_stats()
+        self.assertEqual((stats['size'], stats['idle'], stats['closed']), (0, 0, 2))
+
+    def test_failed_connects_free_their_slot(self):
+        pool = self.make_pool(max_size=1)
+
+        def connect():
+            raise ConnectionError("connection refused")
+
+        with self.assertRaises(ConnectionError):
+            pool.acquire(connect)
+        self.assertIsInstance(pool.acquire(FakeConnection).connection, FakeConnection)
+
+
+@override_settings(DATABASE_REPLICAS=['replica1', 'replica2'], DATABASE_REPLICA_MAX_LAG=5, DATABASE_PIN_SECONDS=15)
+@mock.patch('utils.replicas.get_replica_lags', return_value={'replica1': 0.5, 'replica2': 0.1})
+class ReplicaRoutingTests(SimpleTestCase):
+    router = ReplicaRouter()
+
+    def request(self, method, path, cookies=None, write=False):
+        """Run a request through the middleware; returns the aliases read from and the response."""
+        request = RequestFactory().generic(method, path)
+        request.COOKIES.update(cookies or {})
+        request.route_group = match_route_group(request.path_info, method)
+        reads = []
+
+        def view(request):
+            reads.append(self.router.db_for_read(dashboard_model.Blog))
+            if write:
+                self.assertEqual(self.router.db_for_write(dashboard_model.Enquiry), 'default')
+            reads.append(self.router.db_for_read(dashboard_model.Blog))
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return reads, response
+
+    def test_public_reads_use_one_replica_per_request(self, lags):
+        reads, response = self.request('GET', '/api/v1/client/blogs/')
+        self.assertIn(reads[0], ('replica1', 'replica2'))
+        self.assertEqual(reads[0], reads[1])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_round_robin_spreads_requests_over_replicas(self, lags):
+        self.assertEqual({self.request('GET', '/api/v1/client/faq/')[0][0] for _ in range(4)}, {'replica1', 'replica2'})
+
+    @override_settings(DATABASE_REPLICA_SELECTION='least-lag')
+    def test_least_lag_picks_the_closest_replica(self, lags):
+        self.assertEqual(self.request('GET', '/api/v1/client/faq/')[0], ['replica2', 'replica2'])
+
+    def test_lagging_and_unreachable_replicas_are_skipped(self, lags):
+        lags.return_value = {'replica1': None, 'replica2': 30.0}
+        self.assertEqual(self.request('GET', '/api/v1/client/faq/')[0], ['default', 'default'])
+
+    def test_other_requests_use_the_primary(self, lags):
+        self.assertEqual(self.request('GET', '/admin/')[0], ['default', 'default'])
+        self.assertEqual(self.request('POST', '/api/v1/client/enquiry/')[0], ['default', 'default'])
+
+    def test_writes_move_reads_to_the_primary_and_pin_the_client(self, lags):
+        reads, response = self.request('GET', '/api/v1/client/faq/', write=True)
+        self.assertNotEqual(reads[0], 'default')
+        self.assertEqual(reads[1], 'default')
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], 15)
+
+    def test_pinned_clients_read_from_the_primary(self, lags):
+        self.assertEqual(self.request('GET', '/api/v1/client/faq/', cookies={PIN_COOKIE: '1'})[0], ['default', 'default'])
+
+    def test_no_routing_outside_requests(self, lags):
+        self.assertIsNone(get_routing_state())
+        self.assertIsNone(self.router.db_for_read(dashboard_model.Blog))
+        self.assertEqual(self.router.db_for_write(dashboard_model.Blog), 'default')
+
+    def test_in_process_sub_requests_are_routed_like_their_path(self, lags):
+        with routed_as('/api/v1/academy/faq/', 'GET', {}):
+            self.assertIn(self.router.db_for_read(dashboard_model.FAQ), ('replica1', 'replica2'))
+        with routed_as('/api/v1/academy/faq/', 'GET', {PIN_COOKIE: '1'}):
+            self.assertEqual(self.router.db_for_read(dashboard_model.FAQ), 'default')
+        self.assertIsNone(get_routing_state())
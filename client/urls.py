@@ -1,27 +1,30 @@
 from django.urls import path
 from . import views
+from client.asyncviews import api_view
 urlpatterns = [
-    path('brand/', views.BrandAPIView.as_view(), name='brand-get'),
-    path('our-metrics/', views.HomepageContentAPIView.as_view(), name='metrix-get'),
-    path('testimonial/', views.TestimonialAPIView.as_view(), name='testimonial-get'),
-    path('faq/', views.FaqAPIView.as_view(), name='faq-get'),
-    path('blogs/', views.BlogsAPIView.as_view(), name='blog-get'),
-    path('blog/<slug:slug>', views.BlogsAPIView.as_view(), name='blog-details'),
-    path('gallery/', views.GalleryAPIView.as_view(), name='gallery-get'),
-    path('our-approach/', views.OurApproachAPIView.as_view(), name='our-approach-get'),
-    path('our-proces/', views.OurProcesAPIView.as_view(), name='our-proces-get'),
-    path('seo/', views.SeoListAPIView.as_view(), name='seo-get'),
+    path('brand/', api_view(views.BrandAPIView), name='brand-get'),
+    path('our-metrics/', api_view(views.HomepageContentAPIView), name='metrix-get'),
+    path('testimonial/', api_view(views.TestimonialAPIView), name='testimonial-get'),
+    path('faq/', api_view(views.FaqAPIView), name='faq-get'),
+    path('blogs/', api_view(views.BlogsAPIView), name='blog-get'),
+    path('blog/<slug:slug>', api_view(views.BlogsAPIView), name='blog-details'),
+    path('gallery/', api_view(views.GalleryAPIView), name='gallery-get'),
+    path('our-approach/', api_view(views.OurApproachAPIView), name='our-approach-get'),
+    path('our-proces/', api_view(views.OurProcesAPIView), name='our-proces-get'),
+    path('seo/', api_view(views.SeoListAPIView), name='seo-get'),
+    path('homepage/', api_view(views.HomepageAPIView), name='homepage-get'),
+    path('batch/', views.BatchAPIView.as_view(), name='batch'),
 
-    path('services/', views.ServicesAPIView.as_view(), name='services-get'),
-    path('services/<slug:slug>', views.ServicesAPIView.as_view(), name='services-get'),
+    path('services/', api_view(views.ServicesAPIView), name='services-get'),
+    path('services/<slug:slug>', api_view(views.ServicesAPIView), name='services-get'),
     
-    path('case-study/', views.CaseStudyAPIView.as_view(), name='our-case-study-get'),
-    path('case-study/<slug:slug>', views.CaseStudyAPIView.as_view(), name='our-case-study-details'),
+    path('case-study/', api_view(views.CaseStudyAPIView), name='our-case-study-get'),
+    path('case-study/<slug:slug>', api_view(views.CaseStudyAPIView), name='our-case-study-details'),
     
     path('enquiry/', views.ServiceEnquiryAPIView.as_view(), name="user-enquiry"),
     path('job-enquiry/', views.JobEnquiryAPIView.as_view(), name="job-enquiry"),
-    path('job-post/', views.JobPostAPIView.as_view(), name="job-post-enquiry"),
-    path('job-post/<uuid:id>', views.JobPostAPIView.as_view(), name="job-post-enquiry"),
+    path('job-post/', api_view(views.JobPostAPIView), name="job-post-enquiry"),
+    path('job-post/<uuid:id>', api_view(views.JobPostAPIView), name="job-post-enquiry"),
 
     path('dynamic-sitemap/', views.DynamicSiteMapAPIView.as_view(), name="dynamicsite-map"),
 
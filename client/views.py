@@ -8,10 +8,23 @@ from rest_framework.pagination import PageNumberPagination
 from dashboard import serializer as dashboard_serializer
 from dashboard import models as dashboard_model
 
+from client.caching import add_surrogate_keys, cached_response, cached_value
+from client.inprocess import call_get
+from utils.concurrency import run_concurrently
+from utils.mail import send_mail_in_background
+from utils.pagination import InvalidCursor, KeysetPagination, keyset_query_budget
+from utils.prefetch import plan_queryset
+from utils.queries import view_query_budget
+from utils.replicas import routed_as
+from utils import surrogate
+
 from django.conf import settings
-from django.core.mail import send_mail
 from django.template.loader import get_template
+from django.urls import Resolver404
 
+from functools import partial
+from urllib.parse import urlsplit
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,22 +34,41 @@ class CustomPageNumberPagination(PageNumberPagination):
     page_size_query_param = 'page_size' 
     max_page_size = 50  
 
+
+def keyset_response_data(request, queryset, serializer_class, message):
+    """
+    Response data for a ``?cursor=`` request, paginated with KeysetPagination.
+    """
+    paginator = KeysetPagination()
+    try:
+        page = paginator.paginate_queryset(queryset, request)
+    except InvalidCursor as e:
+        return {
+            "StatusCode": 6001,
+            "details": "Error",
+            "message": str(e),
+        }, status.HTTP_400_BAD_REQUEST
+
+    serializer = serializer_class(page, many=True, context={'request': request})
+    response_data = {
+        "StatusCode" : 6000,
+        "details" : "Success",
+        "data" : serializer.data,
+        "pagination": paginator.get_pagination_data(),
+        "message" : message
+    }
+    return response_data, status.HTTP_200_OK
+
 class BrandAPIView(APIView):
     """
     API view for fetching brand's data for users.
     """
+    cache_models = (dashboard_model.Brand,)
+    query_budget = 1
+
     def get(self, request):
         try:
-            queryset = dashboard_model.Brand.objects.filter(is_deleted=False)
-            serializer = dashboard_serializer.BrandSerializer(queryset, many=True, context={'request': request})
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "message" : "Brand data fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request))
         except Exception as e:
             logger.error(f"Error retrieving Brand data: {str(e)}")
             return Response({
@@ -47,23 +79,32 @@ class BrandAPIView(APIView):
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_response_data(self, request):
+        queryset = plan_queryset(
+            dashboard_model.Brand.live.all(), dashboard_serializer.BrandSerializer,
+            context={'request': request}
+        ).cached()
+        serializer = dashboard_serializer.BrandSerializer(queryset, many=True, context={'request': request})
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "message" : "Brand data fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
+
 
 class HomepageContentAPIView(APIView):
     """
     API view for fetching homepage metrix data for users.
     """
+    cache_models = (dashboard_model.HomepageContent,)
+    query_budget = 1
+
     def get(self, request):
         try:
-            queryset = dashboard_model.HomepageContent.objects.filter(is_deleted=False).first()
-            serializer = dashboard_serializer.HomepageContentSerializer(queryset, context={'request': request})
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "message" : "Homepage Metrix data fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request))
         except Exception as e:
             logger.error(f"Error retrieving homepage metrix data: {str(e)}")
             return Response({
@@ -74,22 +115,28 @@ class HomepageContentAPIView(APIView):
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_response_data(self, request):
+        queryset = dashboard_model.HomepageContent.live.cached().first()
+        serializer = dashboard_serializer.HomepageContentSerializer(queryset, context={'request': request})
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "message" : "Homepage Metrix data fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
+
 class TestimonialAPIView(APIView):
     """
     API view for fetching testimonial data for users.
     """
+    cache_models = (dashboard_model.Testimonial,)
+    query_budget = keyset_query_budget(1)
+
     def get(self, request):
         try:
-            queryset = dashboard_model.Testimonial.objects.filter(is_deleted=False)
-            serializer = dashboard_serializer.TestimonialSerializer(queryset, many=True, context={'request': request})
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "message" : "Testimonial data fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request))
         except Exception as e:
             logger.error(f"Error retrieving Testimonial data: {str(e)}")
             return Response({
@@ -100,23 +147,36 @@ class TestimonialAPIView(APIView):
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_response_data(self, request):
+        queryset = plan_queryset(
+            dashboard_model.Testimonial.live.all(), dashboard_serializer.TestimonialSerializer,
+            required=('date_added',), context={'request': request}
+        )
+        if KeysetPagination.is_requested(request):
+            return keyset_response_data(
+                request, queryset, dashboard_serializer.TestimonialSerializer, "Testimonial data fetched successfully"
+            )
+        serializer = dashboard_serializer.TestimonialSerializer(queryset, many=True, context={'request': request})
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "message" : "Testimonial data fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
+
 
 class FaqAPIView(APIView):
     """
     API view for fetching faq data for users.
     """
+    cache_models = (dashboard_model.FAQ,)
+    query_budget = 1
+
     def get(self, request):
         try:
-            queryset = dashboard_model.FAQ.objects.filter(is_deleted=False)
-            serializer = dashboard_serializer.FAQSerializer(queryset, many=True, context={'request': request})
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "message" : "Faq data fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request))
         except Exception as e:
             logger.error(f"Error retrieving Faq data: {str(e)}")
             return Response({
@@ -127,6 +187,21 @@ class FaqAPIView(APIView):
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_response_data(self, request):
+        queryset = plan_queryset(
+            dashboard_model.FAQ.live.all(), dashboard_serializer.FAQSerializer,
+            context={'request': request}
+        ).cached()
+        serializer = dashboard_serializer.FAQSerializer(queryset, many=True, context={'request': request})
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "message" : "Faq data fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
+
 
 class BlogsAPIView(APIView):
     """
@@ -135,62 +210,12 @@ class BlogsAPIView(APIView):
     pagination_class = CustomPageNumberPagination
     model = dashboard_model.Blog
     serializers_class = dashboard_serializer.BlogSerializer
+    cache_models = (dashboard_model.Blog,)
+    query_budget = 2
 
     def get(self, request, slug = None):
         try:
-            if slug:
-                instance = self.get_object(slug)
-                if not instance:
-                    return Response({
-                        "StatusCode": 6002,
-                        "details": "Error",
-                        "message": "Blog not found",
-                    }, status=status.HTTP_404_NOT_FOUND)
-
-                serializer = dashboard_serializer.BlogDetailSerializer(
-                    instance, 
-                    context={'request': request}
-                )
-
-                related_blogs = self.model.objects.filter(is_deleted=False).exclude(slug=slug)[:3]
-                related_serializer = dashboard_serializer.BlogRelatedSerializer(
-                    related_blogs, 
-                    many=True, 
-                    context={'request': request}
-                )
-                response_data = {
-                    "StatusCode": 6000,
-                    "details": "Success",
-                    "data": serializer.data,
-                    "related_blogs": related_serializer.data,
-                    "message": "Blog details retrieved successfully"
-                }
-                return Response(response_data, status=status.HTTP_200_OK)
-
-            queryset = self.model.objects.filter(is_deleted=False)
-            paginator = self.pagination_class()
-            page = paginator.paginate_queryset(queryset, request)
-
-            serializer = self.serializers_class(
-                    page, 
-                    many=True, 
-                    context={'request': request}
-                )
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "pagination": {
-                        "total_items": paginator.page.paginator.count,
-                        "total_pages": paginator.page.paginator.num_pages,
-                        "current_page": paginator.page.number,
-                        "next": paginator.get_next_link(),
-                        "previous": paginator.get_previous_link()
-                    },
-                "message" : "Blog's data fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request, slug))
         except Exception as e:
             logger.error(f"Error retrieving Blog's: {str(e)}")
             return Response({
@@ -201,9 +226,80 @@ class BlogsAPIView(APIView):
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_response_data(self, request, slug = None):
+        if slug:
+            # The detail and the related blogs are independent queries
+            instance, related_blogs = run_concurrently(
+                lambda: self.get_object(slug),
+                lambda: self.get_related_blogs(request, slug),
+            )
+            if not instance:
+                return {
+                    "StatusCode": 6002,
+                    "details": "Error",
+                    "message": "Blog not found",
+                }, status.HTTP_404_NOT_FOUND
+
+            # Related blogs change whenever any blog does
+            add_surrogate_keys(request, surrogate.object_key(self.model, instance.pk), surrogate.model_key(self.model))
+            serializer = dashboard_serializer.BlogDetailSerializer(
+                instance,
+                context={'request': request}
+            )
+            response_data = {
+                "StatusCode": 6000,
+                "details": "Success",
+                "data": serializer.data,
+                "related_blogs": related_blogs,
+                "message": "Blog details retrieved successfully"
+            }
+            return response_data, status.HTTP_200_OK
+
+        queryset = plan_queryset(
+            self.model.live.all(), self.serializers_class,
+            required=('date_added',), context={'request': request}
+        )
+        if KeysetPagination.is_requested(request):
+            return keyset_response_data(request, queryset, self.serializers_class, "Blog's data fetched successfully")
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(queryset, request)
+
+        serializer = self.serializers_class(
+                page,
+                many=True,
+                context={'request': request}
+            )
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "pagination": {
+                    "total_items": paginator.page.paginator.count,
+                    "total_pages": paginator.page.paginator.num_pages,
+                    "current_page": paginator.page.number,
+                    "next": paginator.get_next_link(),
+                    "previous": paginator.get_previous_link()
+                },
+            "message" : "Blog's data fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
+
+    def get_related_blogs(self, request, slug):
+        related_blogs = plan_queryset(
+            self.model.live.exclude(slug=slug),
+            dashboard_serializer.BlogRelatedSerializer,
+            context={'request': request}
+        )[:3]
+        return dashboard_serializer.BlogRelatedSerializer(related_blogs, many=True, context={'request': request}).data
+
     def get_object(self, slug):
         try:
-            return self.model.objects.filter(slug=slug).first()
+            return plan_queryset(
+                self.model.live.filter(slug=slug), dashboard_serializer.BlogDetailSerializer,
+                context={'request': self.request}
+            ).first()
         except Exception as e:
             logger.error(f"Error retrieving object: {str(e)}")
             return None
@@ -213,18 +309,12 @@ class OurApproachAPIView(APIView):
     """
     API view for fetching our approach for users.
     """
+    cache_models = (dashboard_model.OurApproach,)
+    query_budget = 1
+
     def get(self, request):
         try:
-            queryset = dashboard_model.OurApproach.objects.filter(is_deleted=False)
-            serializer = dashboard_serializer.OurApproachSerializer(queryset, many=True, context={'request': request})
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "message" : "our approach fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request))
         except Exception as e:
             logger.error(f"Error retrieving our approach: {str(e)}")
             return Response({
@@ -235,22 +325,31 @@ class OurApproachAPIView(APIView):
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_response_data(self, request):
+        queryset = plan_queryset(
+            dashboard_model.OurApproach.live.all(), dashboard_serializer.OurApproachSerializer,
+            context={'request': request}
+        )
+        serializer = dashboard_serializer.OurApproachSerializer(queryset, many=True, context={'request': request})
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "message" : "our approach fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
+
 class OurProcesAPIView(APIView):
     """
     API view for fetching our proces for users.
     """
+    cache_models = (dashboard_model.OurProces,)
+    query_budget = 1
+
     def get(self, request):
         try:
-            queryset = dashboard_model.OurProces.objects.filter(is_deleted=False)
-            serializer = dashboard_serializer.OurProcesSerializer(queryset, many=True, context={'request': request})
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "message" : "Our Proces fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request))
         except Exception as e:
             logger.error(f"Error retrieving Our Proces: {str(e)}")
             return Response({
@@ -260,6 +359,21 @@ class OurProcesAPIView(APIView):
                 "message": "Failed to retrieve Our Proces",
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def get_response_data(self, request):
+        queryset = plan_queryset(
+            dashboard_model.OurProces.live.all(), dashboard_serializer.OurProcesSerializer,
+            context={'request': request}
+        )
+        serializer = dashboard_serializer.OurProcesSerializer(queryset, many=True, context={'request': request})
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "message" : "Our Proces fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
         
 
 class CaseStudyAPIView(APIView):
@@ -268,46 +382,16 @@ class CaseStudyAPIView(APIView):
     """
     model = dashboard_model.CaseStudy
     serializers_class = dashboard_serializer.CaseStudySerializer
+    cache_models = (dashboard_model.CaseStudy, dashboard_model.ExpertiseItem, dashboard_model.CaseStudyImages)
+
+    @staticmethod
+    def query_budget(request, slug=None):
+        # A detail also loads its expertise items and images
+        return 3 if slug else 1
 
     def get(self, request, slug = None):
         try:
-            if slug:
-                instance = self.get_object(slug)
-                if not instance:
-                    return Response({
-                        "StatusCode": 6002,
-                        "details": "Error",
-                        "message": "Case Study not found",
-                    }, status=status.HTTP_404_NOT_FOUND)
-
-                serializer = dashboard_serializer.CaseStudyDetailSerializer(
-                    instance, 
-                    context={'request': request}
-                )
-
-                response_data = {
-                    "StatusCode": 6000,
-                    "details": "Success",
-                    "data": serializer.data,
-                    "message": "Case Study details retrieved successfully"
-                }
-                return Response(response_data, status=status.HTTP_200_OK)
-
-            queryset = self.model.objects.filter(is_deleted=False).order_by('-date_added')
-            
-            serializer = self.serializers_class(
-                    queryset, 
-                    many=True, 
-                    context={'request': request}
-                )
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "message" : "Case Study's data fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request, slug))
         except Exception as e:
             logger.error(f"Error retrieving Case Study's: {str(e)}")
             return Response({
@@ -318,9 +402,55 @@ class CaseStudyAPIView(APIView):
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_response_data(self, request, slug = None):
+        if slug:
+            instance = self.get_object(slug)
+            if not instance:
+                return {
+                    "StatusCode": 6002,
+                    "details": "Error",
+                    "message": "Case Study not found",
+                }, status.HTTP_404_NOT_FOUND
+
+            add_surrogate_keys(request, surrogate.object_key(self.model, instance.pk))
+            serializer = dashboard_serializer.CaseStudyDetailSerializer(
+                instance,
+                context={'request': request}
+            )
+
+            response_data = {
+                "StatusCode": 6000,
+                "details": "Success",
+                "data": serializer.data,
+                "message": "Case Study details retrieved successfully"
+            }
+            return response_data, status.HTTP_200_OK
+
+        queryset = plan_queryset(
+            self.model.live.order_by('-date_added'), self.serializers_class,
+            context={'request': request}
+        )
+
+        serializer = self.serializers_class(
+                queryset,
+                many=True,
+                context={'request': request}
+            )
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "message" : "Case Study's data fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
+
     def get_object(self, slug):
         try:
-            return self.model.objects.filter(slug=slug).first()
+            return plan_queryset(
+                self.model.live.filter(slug=slug), dashboard_serializer.CaseStudyDetailSerializer,
+                context={'request': self.request}
+            ).first()
         except Exception as e:
             logger.error(f"Error retrieving object: {str(e)}")
             return None
@@ -333,56 +463,16 @@ class ServicesAPIView(APIView):
     # pagination_class = CustomPageNumberPagination
     model = dashboard_model.Services
     serializers_class = dashboard_serializer.ServicesListingSerializer
+    cache_models = (dashboard_model.Services, dashboard_model.ServiceItems)
+
+    @staticmethod
+    def query_budget(request, slug=None):
+        # Listings and details also load the service items, ?is_home doesn't
+        return 1 if request.GET.get('is_home') else 2
 
     def get(self, request, slug = None):
         try:
-            is_home = request.query_params.get('is_home', None)
-            if is_home:
-                queryset = self.model.objects.values('id', 'name', 'home_page_descrption', 'slug').filter(is_deleted=False, is_home = True)[:3]
-                response_data = {
-                    "StatusCode": 6000,
-                    "details": "Success",
-                    "data": queryset,
-                    "message": "Services retrieved successfully"
-                }
-                return Response(response_data, status=status.HTTP_200_OK)
-            if slug:
-                instance = self.get_object(slug)
-                if not instance:
-                    return Response({
-                        "StatusCode": 6002,
-                        "details": "Error",
-                        "message": "Services not found",
-                    }, status=status.HTTP_404_NOT_FOUND)
-
-                serializer = dashboard_serializer.ServicesDetailSerializer(
-                    instance, 
-                    context={'request': request}
-                )
-
-                response_data = {
-                    "StatusCode": 6000,
-                    "details": "Success",
-                    "data": serializer.data,
-                    "message": "Services details retrieved successfully"
-                }
-                return Response(response_data, status=status.HTTP_200_OK)
-
-            queryset = self.model.objects.filter(is_deleted=False)
-
-            serializer = self.serializers_class(
-                    queryset, 
-                    many=True, 
-                    context={'request': request}
-                )
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "message" : "Services data fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request, slug))
         except Exception as e:
             logger.error(f"Error retrieving Services: {str(e)}")
             return Response({
@@ -393,9 +483,65 @@ class ServicesAPIView(APIView):
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_response_data(self, request, slug = None):
+        is_home = request.query_params.get('is_home', None)
+        if is_home:
+            queryset = self.model.live.values('id', 'name', 'home_page_descrption', 'slug').filter(is_home=True).cached()[:3]
+            response_data = {
+                "StatusCode": 6000,
+                "details": "Success",
+                "data": list(queryset),
+                "message": "Services retrieved successfully"
+            }
+            return response_data, status.HTTP_200_OK
+        if slug:
+            instance = self.get_object(slug)
+            if not instance:
+                return {
+                    "StatusCode": 6002,
+                    "details": "Error",
+                    "message": "Services not found",
+                }, status.HTTP_404_NOT_FOUND
+
+            add_surrogate_keys(request, surrogate.object_key(self.model, instance.pk))
+            serializer = dashboard_serializer.ServicesDetailSerializer(
+                instance,
+                context={'request': request}
+            )
+
+            response_data = {
+                "StatusCode": 6000,
+                "details": "Success",
+                "data": serializer.data,
+                "message": "Services details retrieved successfully"
+            }
+            return response_data, status.HTTP_200_OK
+
+        queryset = plan_queryset(
+            self.model.live.all(), self.serializers_class,
+            context={'request': request}
+        )
+
+        serializer = self.serializers_class(
+                queryset,
+                many=True,
+                context={'request': request}
+            )
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "message" : "Services data fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
+
     def get_object(self, slug):
         try:
-            return self.model.objects.filter(slug=slug).first()
+            return plan_queryset(
+                self.model.live.filter(slug=slug), dashboard_serializer.ServicesDetailSerializer,
+                context={'request': self.request}
+            ).first()
         except Exception as e:
             logger.error(f"Error retrieving object: {str(e)}")
             return None
@@ -404,22 +550,12 @@ class GalleryAPIView(APIView):
     """
     API view for fetching Gallery for users.
     """
+    cache_models = (dashboard_model.Gallery,)
+    query_budget = keyset_query_budget(1)
+
     def get(self, request):
         try:
-            is_home = request.query_params.get('is_home', None)
-            if is_home:
-                queryset = dashboard_model.Gallery.objects.filter(is_deleted=False)[:6]
-            else:
-                queryset = dashboard_model.Gallery.objects.filter(is_deleted=False)
-            serializer = dashboard_serializer.GallerySerializer(queryset, many=True, context={'request': request})
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "message" : "Gallery images fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request))
         except Exception as e:
             logger.error(f"Error retrieving Gallery: {str(e)}")
             return Response({
@@ -429,6 +565,28 @@ class GalleryAPIView(APIView):
                 "message": "Failed to retrieve Gallery",
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def get_response_data(self, request):
+        is_home = request.query_params.get('is_home', None)
+        queryset = plan_queryset(
+            dashboard_model.Gallery.live.all(), dashboard_serializer.GallerySerializer,
+            required=('date_added',), context={'request': request}
+        )
+        if is_home:
+            queryset = queryset[:6]
+        elif KeysetPagination.is_requested(request):
+            return keyset_response_data(
+                request, queryset, dashboard_serializer.GallerySerializer, "Gallery images fetched successfully"
+            )
+        serializer = dashboard_serializer.GallerySerializer(queryset, many=True, context={'request': request})
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "message" : "Gallery images fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
         
         
 class ServiceEnquiryAPIView(APIView):
@@ -446,7 +604,7 @@ class ServiceEnquiryAPIView(APIView):
                     'date_added': serializer.data['date_added']
                 }
                 template = get_template('enquiry.html').render(context, request=request)
-                send_mail(
+                send_mail_in_background(
                     'Enquiry Data from adbox.in',
                     None, 
                     settings.EMAIL_HOST_USER,
@@ -485,39 +643,12 @@ class JobPostAPIView(APIView):
     """
     model = dashboard_model.JobPost
     serializer_class = dashboard_serializer.JobPostSerializer
+    cache_models = (dashboard_model.JobPost,)
+    query_budget = 1
+
     def get(self, request, id=None):
         try:
-            if id:
-                instance = self.get_object(id)
-                if not instance:
-                    return Response({
-                        "StatusCode": 6002,
-                        "details": "Error",
-                        "message": "Services not found",
-                    }, status=status.HTTP_404_NOT_FOUND)
-
-                serializer = self.serializer_class(
-                    instance, 
-                    context={'request': request}
-                )
-
-                response_data = {
-                    "StatusCode": 6000,
-                    "details": "Success",
-                    "data": serializer.data,
-                    "message": "Services details retrieved successfully"
-                }
-                return Response(response_data, status=status.HTTP_200_OK)
-            queryset = self.model.objects.filter(is_deleted=False)
-            serializer = self.serializer_class(queryset, many=True, context={'request': request})
-
-            response_data = {
-                "StatusCode" : 6000,
-                "details" : "Success",
-                "data" : serializer.data,
-                "message" : "Job list fetched successfully"
-            }
-            return Response(response_data,status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request, id))
         except Exception as e:
             logger.error(f"Error retrieving Job list: {str(e)}")
             return Response({
@@ -527,10 +658,50 @@ class JobPostAPIView(APIView):
                 "message": "Failed to retrieve Job list",
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
+
+    def get_response_data(self, request, id=None):
+        if id:
+            instance = self.get_object(id)
+            if not instance:
+                return {
+                    "StatusCode": 6002,
+                    "details": "Error",
+                    "message": "Services not found",
+                }, status.HTTP_404_NOT_FOUND
+
+            add_surrogate_keys(request, surrogate.object_key(self.model, instance.pk))
+            serializer = self.serializer_class(
+                instance,
+                context={'request': request}
+            )
+
+            response_data = {
+                "StatusCode": 6000,
+                "details": "Success",
+                "data": serializer.data,
+                "message": "Services details retrieved successfully"
+            }
+            return response_data, status.HTTP_200_OK
+        queryset = plan_queryset(
+            self.model.live.all(), self.serializer_class,
+            context={'request': request}
+        )
+        serializer = self.serializer_class(queryset, many=True, context={'request': request})
+
+        response_data = {
+            "StatusCode" : 6000,
+            "details" : "Success",
+            "data" : serializer.data,
+            "message" : "Job list fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
+
     def get_object(self, id):
         try:
-            return self.model.objects.filter(id=id).first()
+            return plan_queryset(
+                self.model.objects.filter(id=id), self.serializer_class,
+                context={'request': self.request}
+            ).first()
         except Exception as e:
             logger.error(f"Error retrieving object: {str(e)}")
             return None
@@ -553,7 +724,7 @@ class JobEnquiryAPIView(APIView):
                     'date_added': application.date_added,
                 }
                 template = get_template('career_enquiry.html').render(context, request=request)
-                send_mail(
+                send_mail_in_background(
                     'Job Enquiry from adbox.in',
                     None, 
                     settings.EMAIL_HOST_USER,
@@ -592,24 +763,12 @@ class SeoListAPIView(APIView):
     """
     model = dashboard_model.SEO
     serializer_class = dashboard_serializer.SEOSerializer
+    cache_models = (dashboard_model.SEO,)
+    query_budget = 1
 
     def get(self, request):
-        path = request.query_params.get('path', None)
         try:
-            if path:
-                queryset = self.model.objects.filter(path=path)
-            else:
-                queryset = self.model.objects.filter(is_deleted=False)
-            
-            serializer = self.serializer_class(queryset, many=True, context={'request': request})
-
-            response_data = {
-                "StatusCode": 6000,
-                "detail": "Success",
-                "data": serializer.data,
-                "message": "SEO's Data fetched successfully"
-            }
-            return Response(response_data, status=status.HTTP_200_OK)
+            return cached_response(request, self.cache_models, lambda: self.get_response_data(request))
 
         except Exception as e:
             logger.error(f"Error fetching SEO details: {str(e)}")
@@ -620,23 +779,34 @@ class SeoListAPIView(APIView):
                 "message": f"Something went wrong: {str(e)}"
             }
             return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def get_response_data(self, request):
+        path = request.query_params.get('path', None)
+        if path:
+            queryset = self.model.objects.filter(path=path).cached()
+        else:
+            queryset = self.model.live.cached()
+
+        serializer = self.serializer_class(queryset, many=True, context={'request': request})
+
+        response_data = {
+            "StatusCode": 6000,
+            "detail": "Success",
+            "data": serializer.data,
+            "message": "SEO's Data fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
         
 class DynamicSiteMapAPIView(APIView):
     """
     Get Dynamic Site Map for user side.
     """
+    cache_models = (dashboard_model.Services, dashboard_model.CaseStudy, dashboard_model.Blog)
+    query_budget = 3
 
     def get(self, request):
         try:
-            urls = []
-
-            services = dashboard_model.Services.objects.filter(is_deleted=False).values_list('slug', flat=True)
-            case_studies = dashboard_model.CaseStudy.objects.filter(is_deleted=False).values_list('slug', flat=True)
-            blogs = dashboard_model.Blog.objects.filter(is_deleted=False).values_list('slug', flat=True)
-
-            urls.extend(self.set_correct_url("services/", slug) for slug in services)
-            urls.extend(self.set_correct_url("case-study/", slug) for slug in case_studies)
-            urls.extend(self.set_correct_url("blogs/", slug) for slug in blogs)
+            urls = cached_value("sitemap-urls", self.cache_models, self.get_urls)
 
             response_data = {
                 "StatusCode": 6000,
@@ -644,7 +814,8 @@ class DynamicSiteMapAPIView(APIView):
                 "data": urls,
                 "message": "Dynamic Site Map fetched successfully"
             }
-            return Response(response_data, status=status.HTTP_200_OK)
+            response = Response(response_data, status=status.HTTP_200_OK)
+            return surrogate.tag_response(response, [surrogate.model_key(model) for model in self.cache_models])
 
         except Exception as e:
             logger.error(f"Error fetching Dynamic Site Map: {str(e)}")
@@ -656,8 +827,246 @@ class DynamicSiteMapAPIView(APIView):
             }
             return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_urls(self):
+        urls = []
+
+        services = dashboard_model.Services.live.values_list('slug', flat=True).cached()
+        case_studies = dashboard_model.CaseStudy.live.values_list('slug', flat=True).cached()
+        blogs = dashboard_model.Blog.live.values_list('slug', flat=True).cached()
+
+        urls.extend(self.set_correct_url("services/", slug) for slug in services)
+        urls.extend(self.set_correct_url("case-study/", slug) for slug in case_studies)
+        urls.extend(self.set_correct_url("blogs/", slug) for slug in blogs)
+        return urls
+
     @staticmethod
     def set_correct_url(base_url, slug):
         return f"{base_url}{slug}"
 
 
+
+
+class HomepageAPIView(APIView):
+    """
+    API view for fetching every homepage section in a single request.
+
+    ``?sections=brand,faq`` limits the response to the listed sections so
+    other pages can reuse it. The bundle is cached and invalidated as a unit.
+    """
+    sections = {
+        'brand': ((dashboard_model.Brand,), 'get_brand'),
+        'our-metrics': ((dashboard_model.HomepageContent,), 'get_our_metrics'),
+        'testimonial': ((dashboard_model.Testimonial,), 'get_testimonial'),
+        'faq': ((dashboard_model.FAQ,), 'get_faq'),
+        'services': ((dashboard_model.Services,), 'get_services'),
+        'gallery': ((dashboard_model.Gallery,), 'get_gallery'),
+        'our-approach': ((dashboard_model.OurApproach,), 'get_our_approach'),
+        'our-proces': ((dashboard_model.OurProces,), 'get_our_proces'),
+    }
+
+    @classmethod
+    def query_budget(cls, request):
+        # Each section is a single planned query; unknown sections run none
+        names, unknown = cls.get_sections(request)
+        return 0 if unknown else len(names)
+
+    def get(self, request):
+        try:
+            names, unknown = self.get_sections(request)
+            if unknown:
+                return Response({
+                    "StatusCode": 6001,
+                    "details": "Error",
+                    "data": {},
+                    "message": f"Unknown sections: {', '.join(unknown)}"
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            return cached_response(request, self.get_cache_models(names), lambda: self.get_response_data(request, names))
+        except Exception as e:
+            logger.error(f"Error retrieving homepage data: {str(e)}")
+            return Response({
+                "StatusCode": 6002,
+                "api": request.get_full_path(),
+                "details": "Error",
+                "message": "Failed to retrieve homepage data",
+                "error": str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def get_cache_models(self, names):
+        cache_models = []
+        for name in names:
+            cache_models.extend(model for model in self.sections[name][0] if model not in cache_models)
+        return cache_models
+
+    @classmethod
+    def get_sections(cls, request):
+        """
+        ``(names, unknown)`` for the request's ``?sections=``, in request order.
+
+        Parsed once per request: the query budget and the view share the result.
+        """
+        request = getattr(request, '_request', request)
+        if not hasattr(request, 'homepage_sections'):
+            sections = request.GET.get('sections', None)
+            names = []
+            for name in (sections.split(',') if sections else cls.sections):
+                name = name.strip()
+                if name and name not in names:
+                    names.append(name)
+            request.homepage_sections = (
+                [name for name in names if name in cls.sections],
+                [name for name in names if name not in cls.sections],
+            )
+        return request.homepage_sections
+
+    def get_response_data(self, request, names):
+        context = {'request': request}
+        response_data = {
+            "StatusCode": 6000,
+            "details": "Success",
+            # Sections are independent queries
+            "data": dict(zip(names, run_concurrently(
+                *(partial(getattr(self, self.sections[name][1]), context) for name in names)
+            ))),
+            "message": "Homepage data fetched successfully"
+        }
+        return response_data, status.HTTP_200_OK
+
+    def get_brand(self, context):
+        serializer_class = dashboard_serializer.BrandSerializer
+        queryset = plan_queryset(dashboard_model.Brand.live.all(), serializer_class, context=context).cached()
+        return serializer_class(queryset, many=True, context=context).data
+
+    def get_our_metrics(self, context):
+        serializer_class = dashboard_serializer.HomepageContentSerializer
+        queryset = plan_queryset(dashboard_model.HomepageContent.live.all(), serializer_class, context=context)
+        return serializer_class(queryset.cached().first(), context=context).data
+
+    def get_testimonial(self, context):
+        serializer_class = dashboard_serializer.TestimonialSerializer
+        queryset = plan_queryset(dashboard_model.Testimonial.live.all(), serializer_class, context=context)
+        return serializer_class(queryset, many=True, context=context).data
+
+    def get_faq(self, context):
+        serializer_class = dashboard_serializer.FAQSerializer
+        queryset = plan_queryset(dashboard_model.FAQ.live.all(), serializer_class, context=context).cached()
+        return serializer_class(queryset, many=True, context=context).data
+
+    def get_services(self, context):
+        # Same payload as services/?is_home=1
+        queryset = dashboard_model.Services.live.values('id', 'name', 'home_page_descrption', 'slug').filter(is_home=True).cached()[:3]
+        return list(queryset)
+
+    def get_gallery(self, context):
+        # Same payload as gallery/?is_home=1
+        serializer_class = dashboard_serializer.GallerySerializer
+        queryset = plan_queryset(dashboard_model.Gallery.live.all(), serializer_class, context=context)[:6]
+        return serializer_class(queryset, many=True, context=context).data
+
+    def get_our_approach(self, context):
+        serializer_class = dashboard_serializer.OurApproachSerializer
+        queryset = plan_queryset(dashboard_model.OurApproach.live.all(), serializer_class, context=context)
+        return serializer_class(queryset, many=True, context=context).data
+
+    def get_our_proces(self, context):
+        serializer_class = dashboard_serializer.OurProcesSerializer
+        queryset = plan_queryset(dashboard_model.OurProces.live.all(), serializer_class, context=context)
+        return serializer_class(queryset, many=True, context=context).data
+
+
+class BatchAPIView(APIView):
+    """
+    API view for running several public GET requests in one round trip.
+
+    Takes ``{"paths": ["/api/v1/client/blog/<slug>", "/api/v1/client/faq/", ...]}``
+    and runs each path's view in-process, concurrently on the shared section
+    pool, without another pass through the middleware stack. Results come back in request order, each
+    with its own status, so one failing path does not fail the batch.
+    """
+    allowed_prefixes = ('/api/v1/client/', '/api/v1/academy/')
+
+    @classmethod
+    def query_budget(cls, request):
+        # The batched views' own budgets; views without one only answer POST
+        # and run no queries for a GET
+        paths = cls.get_paths(request)
+        if paths is None:
+            return 0
+        budget = 0
+        for path in paths:
+            if cls.is_allowed(path, request.path):
+                try:
+                    budget += view_query_budget(path) or 0
+                except Resolver404:
+                    pass
+        return budget
+
+    @staticmethod
+    def get_paths(request):
+        """The valid ``paths`` list of a JSON batch body, or ``None``."""
+        try:
+            paths = json.loads(request.body).get('paths')
+        except (ValueError, AttributeError):
+            return None
+        if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+            return None
+        if len(paths) > settings.BATCH_MAX_REQUESTS:
+            return None
+        return paths
+
+    @classmethod
+    def is_allowed(cls, path, batch_path):
+        return path.startswith(cls.allowed_prefixes) and not path.startswith(batch_path)
+
+    def post(self, request):
+        try:
+            paths = request.data.get('paths') if isinstance(request.data, dict) else None
+            if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+                return Response({
+                    "StatusCode": 6001,
+                    "details": "Error",
+                    "data": [],
+                    "message": "paths must be a list of strings"
+                }, status=status.HTTP_400_BAD_REQUEST)
+            if len(paths) > settings.BATCH_MAX_REQUESTS:
+                return Response({
+                    "StatusCode": 6001,
+                    "details": "Error",
+                    "data": [],
+                    "message": f"At most {settings.BATCH_MAX_REQUESTS} paths per batch"
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            host = request.get_host()
+            results = run_concurrently(*(partial(self.run, path, host, request.scheme) for path in paths))
+
+            response_data = {
+                "StatusCode": 6000,
+                "details": "Success",
+                "data": results,
+                "message": "Batch processed successfully"
+            }
+            return Response(response_data, status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.error(f"Error processing batch: {str(e)}")
+            return Response({
+                "StatusCode": 6002,
+                "api": request.get_full_path(),
+                "details": "Error",
+                "message": "Failed to process batch",
+                "error": str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def run(self, path, host, scheme):
+        if not self.is_allowed(path, self.request.path):
+            return {"path": path, "status": status.HTTP_400_BAD_REQUEST, "body": None}
+        try:
+            # Read from the database the same GET made on its own would
+            with routed_as(urlsplit(path).path, 'GET', self.request.COOKIES):
+                response = call_get(path, host, scheme=scheme)
+            body = getattr(response, 'data', None)
+            return {"path": path, "status": response.status_code, "body": body}
+        except Resolver404:
+            return {"path": path, "status": status.HTTP_404_NOT_FOUND, "body": None}
+        except Exception as e:
+            logger.error(f"Error processing batch item {path}: {str(e)}")
+            return {"path": path, "status": status.HTTP_500_INTERNAL_SERVER_ERROR, "body": None}
@@ -1,20 +1,42 @@
 from django.db import models
+from django.db.models import Q
 import uuid
 from django.utils import timezone
 from django_ckeditor_5.fields import CKEditor5Field
 from django.utils.translation import gettext_lazy as _ 
 from utils.helper import OptimalImageField
+from utils.ids import uuid7
+from utils.querycache import CachingManager, LiveManager
 from django.core.exceptions import ValidationError
 from django.utils.html import format_html
 
 
+# Partial index condition matching the rows BaseModel.live returns. The apps
+# keep no migrations in the repository: deploys run makemigrations and then
+# migrate, which is what creates these indexes (and drops replaced ones) in
+# the database. On large PostgreSQL tables, edit the generated migration to
+# use AddIndexConcurrently (with atomic = False) before applying it.
+LIVE = Q(is_deleted=False)
+
+
+def indexed_is_deleted():
+    """
+    ``is_deleted`` with its own index, for tables without a LIVE partial
+    index, so the admin's is_deleted filter stays indexed.
+    """
+    return models.BooleanField(default=False, db_index=True)
+
 # Create your models here.
 
 class BaseModel(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     date_added = models.DateTimeField(db_index=True, default=timezone.now, editable=True)
     date_updated = models.DateTimeField(auto_now=True)
-    is_deleted = models.BooleanField(default=False, db_index=True)
+    is_deleted = models.BooleanField(default=False)
+
+    objects = CachingManager()
+    # Public reads, served by the partial indexes on LIVE
+    live = LiveManager()
 
     class Meta:
         abstract = True
@@ -25,6 +47,17 @@ class BaseModel(models.Model):
         super(BaseModel, self).save(*args, **kwargs)
 
 
+class TimeOrderedBaseModel(BaseModel):
+    """
+    BaseModel with time-ordered (UUIDv7) ids, for tables that are mostly
+    appended to. Existing rows keep their ids; the column type is unchanged.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+
+    class Meta:
+        abstract = True
+
+
 class Brand(BaseModel):
     name = models.CharField(max_length=255, blank = True, null = True)
     logo = models.FileField(upload_to='brands')
@@ -35,6 +68,10 @@ class Brand(BaseModel):
         verbose_name = 'Brand'
         verbose_name_plural = 'Brands'
         ordering = ('-date_added',)
+        indexes = [
+            # Public listing order
+            models.Index(fields=['-date_added', '-id'], name='brand_live_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.name if self.name else str(self.id)
@@ -92,6 +129,10 @@ class Testimonial(BaseModel):
         verbose_name = 'Testimonial'
         verbose_name_plural = 'Testimonials'
         ordering = ('-date_added',)
+        indexes = [
+            # Keyset pagination and public listing order
+            models.Index(fields=['-date_added', '-id'], name='testimonial_keyset_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.name if self.name else str(self.id)
@@ -105,6 +146,10 @@ class FAQ(BaseModel):
         verbose_name = 'FAQ'
         verbose_name_plural = "FAQs"
         ordering = ('-date_added',)
+        indexes = [
+            # Public listing order
+            models.Index(fields=['-date_added', '-id'], name='faq_live_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.question if self.question else str(self.id)
@@ -129,6 +174,12 @@ class Blog(BaseModel):
         verbose_name = 'Blog'
         verbose_name_plural = 'Blogs'
         ordering = ('-date_added',)
+        indexes = [
+            # Keyset pagination and public listing order
+            models.Index(fields=['-date_added', '-id'], name='blogs_keyset_idx', condition=LIVE),
+            # Detail pages
+            models.Index(fields=['slug'], name='blogs_slug_live_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.title if self.title else str(self.id)
@@ -144,6 +195,7 @@ class HomepageContent(BaseModel):
     
     box3_number = models.IntegerField(help_text="Number for the third metric box.")
     box3_description = models.TextField(help_text="Description for the third metric box.")
+    is_deleted = indexed_is_deleted()
 
     class Meta:
         db_table = "homepage_content"
@@ -158,7 +210,7 @@ class HomepageContent(BaseModel):
     def __str__(self):
         return "Homepage Content"
 
-class Gallery(BaseModel):
+class Gallery(TimeOrderedBaseModel):
     image = OptimalImageField(
         upload_to='gallery/',
         size_threshold_kb=600,  
@@ -172,6 +224,10 @@ class Gallery(BaseModel):
         verbose_name = 'Gallery'
         verbose_name_plural = 'Galleries'
         ordering = ('-date_added',)
+        indexes = [
+            # Keyset pagination and public listing order
+            models.Index(fields=['-date_added', '-id'], name='gallery_keyset_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.image_alt if self.image_alt else str(self.id)
@@ -186,6 +242,10 @@ class OurApproach(BaseModel):
         verbose_name = 'Our Approach'
         verbose_name_plural = "Our Approach"
         ordering = ('-date_added',)
+        indexes = [
+            # Public listing order
+            models.Index(fields=['-date_added', '-id'], name='our_approach_live_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.title if self.title else str(self.id)
@@ -201,6 +261,10 @@ class OurProces(BaseModel):
         verbose_name = 'Our Proces'
         verbose_name_plural = "Our Proces"
         ordering = ('-date_added',)
+        indexes = [
+            # Public listing order
+            models.Index(fields=['-date_added', '-id'], name='our_proces_live_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.title if self.title else str(self.id)
@@ -246,6 +310,12 @@ class CaseStudy(BaseModel):
         db_table = "case_study"
         verbose_name = "Case Study"
         verbose_name_plural = "Case Studies"
+        indexes = [
+            # Public listing order
+            models.Index(fields=['-date_added', '-id'], name='case_study_live_idx', condition=LIVE),
+            # Detail pages
+            models.Index(fields=['slug'], name='case_study_slug_live_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.hero_title
@@ -258,6 +328,10 @@ class ExpertiseItem(BaseModel):
         db_table = "expertise_item"
         verbose_name = "Expertise Item"
         verbose_name_plural = "Expertise Items"
+        indexes = [
+            # Prefetched per case study
+            models.Index(fields=['case_study'], name='expertise_item_live_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.expertise_items
@@ -276,6 +350,10 @@ class CaseStudyImages(BaseModel):
         db_table = "case_study_images"
         verbose_name = "CaseStudy Image"
         verbose_name_plural = "CaseStudy Imagess"
+        indexes = [
+            # Prefetched per case study
+            models.Index(fields=['case_study'], name='case_study_images_live_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.image_alt if self.image_alt else str(self.id)
@@ -294,6 +372,12 @@ class Services(BaseModel):
         db_table = "services"
         verbose_name = "Service"
         verbose_name_plural = "Services"
+        indexes = [
+            # Homepage services
+            models.Index(fields=['is_home'], name='services_home_live_idx', condition=LIVE),
+            # Detail pages
+            models.Index(fields=['slug'], name='services_slug_live_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.name if self.name else str(self.id)
@@ -309,6 +393,10 @@ class ServiceItems(BaseModel):
         db_table = "service_items"
         verbose_name = "Service Item"
         verbose_name_plural = "Service Items"
+        indexes = [
+            # Prefetched per service
+            models.Index(fields=['services'], name='service_items_live_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return self.title if self.title else str(self.id)
@@ -338,6 +426,7 @@ class JobPost(BaseModel):
     )
     meta_title = models.CharField(max_length=300, blank=True, null=True)
     meta_description = models.TextField(blank=True, null=True)
+    is_deleted = indexed_is_deleted()
     class Meta:
         db_table = "job_post"
         verbose_name = "Job Post"
@@ -346,13 +435,14 @@ class JobPost(BaseModel):
     def __str__(self):
         return self.job_title if self.job_title else str(self.id)
 
-class Applications(BaseModel):
+class Applications(TimeOrderedBaseModel):
     position = models.ForeignKey(JobPost, on_delete=models.CASCADE)
     name = models.CharField(max_length=255, blank=True, null=True)
     number = models.CharField(max_length=100, blank=True, null=True)
     email = models.EmailField(blank=True, null=True)
     location = models.CharField(max_length=255, blank=True, null=True)
     cv = models.FileField(upload_to='applications',blank=True, null=True)
+    is_deleted = indexed_is_deleted()
 
     class Meta:
         db_table = "appplications"
@@ -362,11 +452,12 @@ class Applications(BaseModel):
     def __str__(self):
         return self.name if self.name else str(self.id)
 
-class Enquiry(BaseModel):
+class Enquiry(TimeOrderedBaseModel):
     name = models.CharField(max_length=255, blank=True, null=True)
     number = models.CharField(max_length=100, blank=True, null=True)
     email = models.EmailField(blank=True, null=True)
     message = models.TextField(blank=True, null=True)
+    is_deleted = indexed_is_deleted()
 
     class Meta:
         db_table = "enquiry"
@@ -386,6 +477,12 @@ class SEO(BaseModel):
         verbose_name = ('SEO')
         verbose_name_plural = ('SEO')
         ordering = ('date_added',)
+        indexes = [
+            # Public listing order
+            models.Index(fields=['-date_added', '-id'], name='seo_live_idx', condition=LIVE),
+            # Looked up by path whether deleted or not
+            models.Index(fields=['path'], name='seo_path_idx'),
+        ]
 
     def __str__(self):
         return self.path if self.path else str(self.id)
\ No newline at end of file
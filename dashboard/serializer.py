@@ -1,22 +1,29 @@
 from rest_framework import serializers
 from .models import *
+from utils.fragments import FragmentCacheListSerializer
+from utils.media import MediaURLSerializerMixin
+from utils.sparse import SparseFieldsetMixin
 
 
-class BrandSerializer(serializers.ModelSerializer):
+class BrandSerializer(SparseFieldsetMixin, MediaURLSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Brand
         fields = ['id', 'logo','name', 'image_alt']
+        listing_fields = fields
 
-class HomepageContentSerializer(serializers.ModelSerializer):
+class HomepageContentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = HomepageContent
         fields = ['id', 'our_metrics_description', 'box1_number', 'box1_description', 
             'box2_number', 'box2_description', 'box3_number', 'box3_description'] 
+        listing_fields = fields
 
-class TestimonialSerializer(serializers.ModelSerializer):
+class TestimonialSerializer(SparseFieldsetMixin, MediaURLSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Testimonial
         fields = ['id', 'type', 'name', 'image', 'image_alt', 'description', 'work_category', 'video', 'thumbnail']
+        listing_fields = ['id', 'type', 'name', 'image', 'image_alt', 'work_category', 'video', 'thumbnail']
+        list_serializer_class = FragmentCacheListSerializer
 
     def validate(self, data):
         testimonial_type = data.get('type', '').strip().lower()
@@ -31,109 +38,128 @@ class TestimonialSerializer(serializers.ModelSerializer):
 
         return data
 
-class FAQSerializer(serializers.ModelSerializer):
+class FAQSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = FAQ
         fields = ['id', 'question', 'answer']
+        listing_fields = ['id', 'question']
 
 
-class BlogSerializer(serializers.ModelSerializer):
+class BlogSerializer(SparseFieldsetMixin, MediaURLSerializerMixin, serializers.ModelSerializer):
     date_added = serializers.SerializerMethodField()
     class Meta:
         model = Blog
         fields = ['id', 'title', 'image', 'image_alt', 'introduction', 'slug', 'date_added']
+        listing_fields = ['id', 'title', 'image', 'image_alt', 'slug', 'date_added']
+        list_serializer_class = FragmentCacheListSerializer
 
     def get_date_added(self, obj):
         return obj.date_added.strftime("%d %b %Y") if obj.date_added else None
 
 
-class BlogRelatedSerializer(serializers.ModelSerializer):
+class BlogRelatedSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     date_added = serializers.SerializerMethodField()
     class Meta:
         model = Blog
         fields = ['id', 'title', 'slug', 'date_added']
+        listing_fields = fields
 
     def get_date_added(self, obj):
         return obj.date_added.strftime("%d %b %Y") if obj.date_added else None
 
 
-class BlogDetailSerializer(serializers.ModelSerializer):
+class BlogDetailSerializer(SparseFieldsetMixin, MediaURLSerializerMixin, serializers.ModelSerializer):
     date_added = serializers.SerializerMethodField()
 
     class Meta:
         model = Blog
         fields = ['id', 'title', 'image', 'image_alt', 'introduction', 'slug',
             'description', 'meta_title', 'meta_description', 'date_added']
+        listing_fields = ['id', 'title', 'image', 'image_alt', 'slug', 'meta_title', 'meta_description', 'date_added']
 
     def get_date_added(self, obj):
         return obj.date_added.strftime("%d %b %Y") if obj.date_added else None
 
 
-class GallerySerializer(serializers.ModelSerializer):
+class GallerySerializer(SparseFieldsetMixin, MediaURLSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Gallery
         fields = ['id', 'image', 'image_alt']
+        listing_fields = fields
 
-class OurApproachSerializer(serializers.ModelSerializer):
+class OurApproachSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = OurApproach
         fields = ['id', 'title', 'description']
+        listing_fields = ['id', 'title']
 
-class OurProcesSerializer(serializers.ModelSerializer):
+class OurProcesSerializer(SparseFieldsetMixin, MediaURLSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = OurProces
         fields = ['id', 'icon', 'title', 'description', 'image_alt']
+        listing_fields = ['id', 'icon', 'title', 'image_alt']
 
-class CaseStudySerializer(serializers.ModelSerializer):
+class CaseStudySerializer(SparseFieldsetMixin, MediaURLSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = CaseStudy
         fields = ['id', 'hero_title', 'hero_image', 'slug', 'image_alt']
+        listing_fields = fields
+        list_serializer_class = FragmentCacheListSerializer
 
-class ExpertiseItemSerializer(serializers.ModelSerializer):
+class ExpertiseItemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ExpertiseItem
         fields = ['id', 'case_study', 'expertise_items']
+        listing_fields = fields
 
-class CaseStudyImagesSerializer(serializers.ModelSerializer):
+class CaseStudyImagesSerializer(SparseFieldsetMixin, MediaURLSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = CaseStudyImages
         fields = ['id', 'case_study', 'image', 'image_alt']
+        listing_fields = fields
 
-class CaseStudyDetailSerializer(serializers.ModelSerializer):
+class CaseStudyDetailSerializer(SparseFieldsetMixin, MediaURLSerializerMixin, serializers.ModelSerializer):
     expertise_items = ExpertiseItemSerializer(many=True, source='expertiseitem_set')
     case_study_images = CaseStudyImagesSerializer(many=True, source='casestudyimages_set')
     class Meta:
         model = CaseStudy
         fields = ['id', 'hero_title', 'hero_subtitle', 'bg_image', 'bg_image_alt', 'location',
             'about_description', 'approach_description', 'expertise_items', 'case_study_images','meta_title', 'meta_description']
+        listing_fields = ['id', 'hero_title', 'hero_subtitle', 'bg_image', 'bg_image_alt', 'location',
+            'expertise_items', 'case_study_images', 'meta_title', 'meta_description']
 
-class ServiceItemsSerializer(serializers.ModelSerializer):
+class ServiceItemsSerializer(SparseFieldsetMixin, MediaURLSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ServiceItems
         fields = ['id', 'services', 'title', 'icon', 'description', 'image_alt']
+        listing_fields = ['id', 'services', 'title', 'icon', 'image_alt']
 
-class ServicesListingSerializer(serializers.ModelSerializer):
+class ServicesListingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     service_items = ServiceItemsSerializer(many=True, source='serviceitems_set')
     class Meta:
         model = Services
         fields = ['id', 'name', 'title', 'description', 'slug', 'service_items', 'meta_title', 'meta_description']
+        list_serializer_class = FragmentCacheListSerializer
+        listing_fields = ['id', 'name', 'title', 'slug', 'service_items', 'meta_title', 'meta_description']
 
     def get_service_items(self, obj):
         items = obj.serviceitems_set.all()[:3]
         return ServiceItemsSerializer(items, many=True).data
 
-class ServicesDetailSerializer(serializers.ModelSerializer):
+class ServicesDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     service_items = ServiceItemsSerializer(many=True, source='serviceitems_set')
 
     class Meta:
         model = Services
         fields = ['id', 'name', 'title', 'description', 'slug', 'service_items',  'meta_title', 'meta_description']
+        listing_fields = ['id', 'name', 'title', 'slug', 'service_items', 'meta_title', 'meta_description']
 
 
-class JobPostSerializer(serializers.ModelSerializer):
+class JobPostSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = JobPost
         fields =  ['id', 'job_title', 'job_description','contents', 'location', 'job_type', 'meta_title', 'meta_description']
+        listing_fields = ['id', 'job_title', 'location', 'job_type', 'meta_title', 'meta_description']
 
 class ApplicationsSerializer(serializers.ModelSerializer):
     date_added = serializers.SerializerMethodField()
@@ -155,7 +181,8 @@ class EnquirySerializer(serializers.ModelSerializer):
     def get_date_added(self, obj):
         return obj.date_added.strftime("%d %b %Y") if obj.date_added else None
 
-class SEOSerializer(serializers.ModelSerializer):
+class SEOSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = SEO  
-        fields = ['id', 'page', 'path', 'meta_title','meta_description']
\ No newline at end of file
+        fields = ['id', 'page', 'path', 'meta_title','meta_description']
+        listing_fields = fields
\ No newline at end of file
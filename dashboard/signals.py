@@ -0,0 +1,20 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from dashboard.models import BaseModel
+from utils.cache import bump_table_version
+from utils.surrogate import instance_keys, purge_keys
+
+
+@receiver([post_save, post_delete])
+def bump_content_version(sender, instance, **kwargs):
+    """Invalidate cached data derived from a table whenever one of its rows changes."""
+    if isinstance(instance, BaseModel):
+        bump_table_version(sender._meta.db_table, using=kwargs.get('using'))
+
+
+@receiver([post_save, post_delete])
+def purge_cdn(sender, instance, **kwargs):
+    """Purge CDN copies of every response tagged with the changed row."""
+    if isinstance(instance, BaseModel):
+        purge_keys(instance_keys(instance))
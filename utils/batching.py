@@ -0,0 +1,69 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class DebouncedBatch:
+    """
+    Collect items and hand them to ``callback`` in batches on a daemon thread.
+
+    A batch is flushed once no new item has arrived for ``debounce`` seconds,
+    or ``max_delay`` seconds after its first item, whichever comes first.
+    Duplicate items within a batch are collapsed.
+    """
+
+    def __init__(self, callback, debounce=2.0, max_delay=10.0, name='debounced-batch'):
+        self.callback = callback
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.name = name
+        self._pending = set()
+        self._first_at = None
+        self._last_at = None
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def add(self, items):
+        with self._condition:
+            now = time.monotonic()
+            if not self._pending:
+                self._first_at = now
+            self._pending.update(items)
+            self._last_at = now
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def flush(self):
+        """Hand everything pending to the callback right away, in this thread."""
+        with self._condition:
+            items, self._pending = self._pending, set()
+        if items:
+            self._call(items)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    # An add() racing the timeout leaves items pending without
+                    # a notify reaching us, so check again before exiting
+                    if not self._condition.wait(timeout=60) and not self._pending:
+                        # Idle long enough; a new thread starts on the next add
+                        self._thread = None
+                        return
+                now = time.monotonic()
+                due = min(self._last_at + self.debounce, self._first_at + self.max_delay)
+                if now < due:
+                    self._condition.wait(timeout=due - now)
+                    continue
+                items, self._pending = self._pending, set()
+            self._call(items)
+
+    def _call(self, items):
+        try:
+            self.callback(items)
+        except Exception as e:
+            logger.error(f"Error processing {self.name} batch: {str(e)}")
@@ -0,0 +1,250 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from utils.batching import DebouncedBatch
+
+import logging
+import threading
+import time
+import uuid
+import weakref
+
+logger = logging.getLogger(__name__)
+
+
+def _table_version_key(table):
+    return f"table-version:{table}"
+
+
+def get_table_versions(tables, cache_alias='default'):
+    """
+    Return the current write version of each table, in order.
+
+    Versions are counters kept in the cache backend and bumped on every write
+    to the table, so any value derived from those tables can be keyed on them.
+    """
+    cache = caches[cache_alias]
+    keys = [_table_version_key(table) for table in tables]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        if key not in found:
+            # Seed from the clock so a flushed cache never reuses old versions
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+        versions.append(found[key])
+    return tuple(versions)
+
+
+def get_local_table_versions(tables, cache_alias='default'):
+    """
+    ``get_table_versions`` answered from this process's cache tier alone.
+
+    Returns ``None`` when that would need I/O: the backend has no local tier,
+    or a version isn't held in it.
+    """
+    get_many_local = getattr(caches[cache_alias], 'get_many_local', None)
+    if get_many_local is None:
+        return None
+    keys = [_table_version_key(table) for table in tables]
+    found = get_many_local(keys)
+    if found is None or len(found) < len(keys):
+        return None
+    return tuple(found[key] for key in keys)
+
+
+def _incr_table_version(table, cache_alias):
+    cache = caches[cache_alias]
+    key = _table_version_key(table)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, time.time_ns(), timeout=None):
+            cache.incr(key)
+
+
+def bump_table_version(table, cache_alias='default', using=None):
+    """
+    Mark everything derived from ``table`` as stale.
+
+    Inside a transaction the version is bumped again on commit, otherwise
+    another request could cache the pre-commit rows under the new version.
+    With read replicas it is bumped once more when they have had
+    ``DATABASE_REPLICA_MAX_LAG`` to catch up, for the same reason.
+    """
+    _incr_table_version(table, cache_alias)
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: _incr_table_version(table, cache_alias), using=using)
+        transaction.on_commit(lambda: _bump_after_replica_lag(table, cache_alias), using=using)
+    else:
+        _bump_after_replica_lag(table, cache_alias)
+
+
+_lag_batch = None
+_lag_batch_lock = threading.Lock()
+# Last write to each (table, cache alias) queued for a replica-lag bump
+_lagged_writes = {}
+
+
+def _replica_lag_batch(max_lag):
+    """Process-wide batch of delayed bumps, flushed ``max_lag`` after its first write."""
+    global _lag_batch
+    with _lag_batch_lock:
+        if _lag_batch is None or _lag_batch.max_delay != max_lag:
+            _lag_batch = DebouncedBatch(
+                lambda items: _bump_lagged(items, max_lag),
+                debounce=max_lag, max_delay=max_lag, name='replica-lag-bump',
+            )
+        return _lag_batch
+
+
+def _bump_lagged(items, max_lag):
+    now = time.monotonic()
+    for table, cache_alias in items:
+        _incr_table_version(table, cache_alias)
+    # Writes made after the batch's first one haven't had max_lag yet
+    recent = [item for item in items if now - _lagged_writes.get(item, 0) < max_lag]
+    if recent:
+        _replica_lag_batch(max_lag).add(recent)
+
+
+def _bump_after_replica_lag(table, cache_alias):
+    """Bump once more after ``DATABASE_REPLICA_MAX_LAG``, at most once per table per lag window."""
+    max_lag = settings.DATABASE_REPLICA_MAX_LAG
+    if settings.DATABASE_REPLICAS and max_lag > 0:
+        _lagged_writes[(table, cache_alias)] = time.monotonic()
+        _replica_lag_batch(max_lag).add([(table, cache_alias)])
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent recomputation of the same cache key.
+
+    Only one caller recomputes a given key: threads of this process queue on a
+    local lock and other processes on a lock held in the cache backend. While
+    the value is being rebuilt, callers holding a stale copy get it back
+    immediately; callers with nothing to serve wait briefly for the result.
+
+    Entries are stored as ``{'value', 'version', 'expires'}`` and kept for
+    ``stale_timeout`` seconds after they stop being fresh, so a version bump
+    leaves the previous value available to serve during the rebuild.
+    """
+
+    def __init__(self, cache_alias='default', timeout=None, stale_timeout=None,
+                 lock_timeout=30, wait_timeout=5, poll_interval=0.05):
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self.stale_timeout = stale_timeout
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._locks = weakref.WeakValueDictionary()
+        self._locks_guard = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def _local_lock(self, key):
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    @staticmethod
+    def _is_fresh(entry, version):
+        if entry is None or entry['version'] != version:
+            return False
+        return entry['expires'] is None or entry['expires'] > time.time()
+
+    def get(self, key, builder, version=None, timeout=None):
+        """
+        Return the cached value for ``key``, calling ``builder`` at most once
+        across all concurrent callers when it is missing or stale.
+        """
+        entry = self.cache.get(key)
+        if self._is_fresh(entry, version):
+            return entry['value']
+
+        lock = self._local_lock(key)
+        if entry is not None:
+            acquired = lock.acquire(blocking=False)
+        else:
+            acquired = lock.acquire(timeout=self.wait_timeout)
+        if not acquired:
+            if entry is not None:
+                return entry['value']
+            logger.warning(f"Timed out waiting for rebuild of {key}, building locally")
+            return self._store(key, builder(), version, timeout)
+
+        try:
+            # Another thread may have finished the rebuild while we waited
+            entry = self.cache.get(key) or entry
+            if self._is_fresh(entry, version):
+                return entry['value']
+            return self._build(key, builder, version, timeout, entry)
+        finally:
+            lock.release()
+
+    def get_local(self, key, version=None):
+        """
+        The fresh value for ``key`` if this process's cache tier holds it.
+
+        Never blocks; returns ``None`` whenever ``get`` would need I/O.
+        """
+        get_many_local = getattr(self.cache, 'get_many_local', None)
+        if get_many_local is None:
+            return None
+        entry = (get_many_local([key]) or {}).get(key)
+        return entry['value'] if self._is_fresh(entry, version) else None
+
+    def invalidate(self, key):
+        """Mark ``key`` stale while keeping its value available to serve."""
+        entry = self.cache.get(key)
+        if entry is not None:
+            entry['expires'] = 0
+            self.cache.set(key, entry, self._cache_timeout(None))
+
+    def _build(self, key, builder, version, timeout, stale):
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        if self.cache.add(lock_key, token, self.lock_timeout):
+            try:
+                return self._store(key, builder(), version, timeout)
+            finally:
+                if self.cache.get(lock_key) == token:
+                    self.cache.delete(lock_key)
+
+        if stale is not None:
+            return stale['value']
+
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            entry = self.cache.get(key)
+            if self._is_fresh(entry, version):
+                return entry['value']
+        logger.warning(f"Timed out waiting for rebuild of {key}, building locally")
+        return self._store(key, builder(), version, timeout)
+
+    def _cache_timeout(self, timeout):
+        timeout = self.timeout if timeout is None else timeout
+        if timeout is None:
+            return None
+        return timeout + (self.stale_timeout or 0)
+
+    def _store(self, key, value, version, timeout):
+        fresh_for = self.timeout if timeout is None else timeout
+        self.cache.set(key, {
+            'value': value,
+            'version': version,
+            'expires': time.time() + fresh_for if fresh_for is not None else None,
+        }, self._cache_timeout(timeout))
+        return value
+
+
+content_cache = SingleFlight(
+    timeout=getattr(settings, 'API_CACHE_TIMEOUT', 60 * 60),
+    stale_timeout=getattr(settings, 'API_CACHE_STALE_TIMEOUT', 60 * 60 * 24),
+)
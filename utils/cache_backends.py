@@ -0,0 +1,274 @@
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from collections import OrderedDict
+import pickle
+import threading
+import time
+
+_MISSING = object()
+
+SEQUENCE_KEY = "two-tier:sequence"
+
+
+def _log_key(sequence):
+    return f"two-tier:log:{sequence}"
+
+
+class TwoTierCache(BaseCache):
+    """
+    A bounded per-process LRU (L1) in front of a shared cache (L2).
+
+    Reads are served from L1 when possible and fall through to L2 otherwise.
+    Writes go to L2 first and are then recorded in an invalidation log kept
+    in L2: a sequence counter plus one ``two-tier:log:<n>`` entry per written
+    key. Every worker compares the counter with the last one it has seen at
+    most once per ``SYNC_INTERVAL`` seconds and evicts the logged keys from
+    its L1, or its whole L1 when it has fallen too far behind. L1 entries
+    also expire after ``L1_TIMEOUT`` seconds regardless.
+
+    The L2 must be shared by every worker, or the log never reaches them:
+    a ``LocMemCache`` or ``DummyCache`` L2 is refused unless ``LOCAL_L2`` is
+    set, which is meant for tests.
+
+    OPTIONS:
+        L2: alias of the shared cache in ``CACHES``
+        LOCAL_L2: allow a per-process L2 (tests only)
+        L1_MAX_ENTRIES: entries kept per process before evicting the least recently used
+        L1_TIMEOUT: upper bound on how long an entry lives in L1
+        SYNC_INTERVAL: seconds between checks of the invalidation log
+        LOG_SIZE: logged writes a worker may lag behind before flushing its L1
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._l2_alias = options.get('L2', 'shared')
+        self._local_l2 = bool(options.get('LOCAL_L2', False))
+        self._l2_checked = False
+        self._l1_max_entries = int(options.get('L1_MAX_ENTRIES', 1024))
+        self._l1_timeout = float(options.get('L1_TIMEOUT', 30))
+        self._sync_interval = float(options.get('SYNC_INTERVAL', 1))
+        self._log_size = int(options.get('LOG_SIZE', 1000))
+        self._l1 = OrderedDict()
+        self._lock = threading.RLock()
+        self._sequence = None
+        self._next_sync = 0
+        self._stats = {'l1_hits': 0, 'l1_misses': 0, 'l2_hits': 0, 'l2_misses': 0}
+
+    @property
+    def l2(self):
+        l2 = caches[self._l2_alias]
+        if not self._l2_checked:
+            if isinstance(l2, (LocMemCache, DummyCache)) and not self._local_l2:
+                raise ImproperlyConfigured(
+                    f"TwoTierCache needs an L2 shared between processes, '{self._l2_alias}' is "
+                    f"{type(l2).__name__}; set OPTIONS['LOCAL_L2'] only in tests."
+                )
+            self._l2_checked = True
+        return l2
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._stats[name] += n
+
+    def get_stats(self):
+        """Hit and miss counters of both tiers since the process started."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['l1_entries'] = len(self._l1)
+        return stats
+
+    # L1 bookkeeping
+
+    def _l1_get(self, key):
+        with self._lock:
+            entry = self._l1.get(key)
+            if entry is None:
+                return _MISSING
+            expires, pickled = entry
+            if expires <= time.monotonic():
+                del self._l1[key]
+                return _MISSING
+            self._l1.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def _l1_set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        timeout = self.get_backend_timeout(timeout)
+        ttl = self._l1_timeout if timeout is None else min(timeout, self._l1_timeout)
+        if ttl <= 0:
+            self._l1_delete(key)
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._l1[key] = (time.monotonic() + ttl, pickled)
+            self._l1.move_to_end(key)
+            while len(self._l1) > self._l1_max_entries:
+                self._l1.popitem(last=False)
+
+    def _l1_delete(self, key):
+        with self._lock:
+            self._l1.pop(key, None)
+
+    # Cross-worker invalidation
+
+    def _sync(self):
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + self._sync_interval
+        sequence = self.l2.get(SEQUENCE_KEY)
+        with self._lock:
+            seen = self._sequence
+            if sequence == seen:
+                return
+            self._sequence = sequence
+        if seen is None or sequence is None or sequence < seen or sequence - seen > self._log_size:
+            with self._lock:
+                self._l1.clear()
+            return
+        log_keys = [_log_key(n) for n in range(seen + 1, sequence + 1)]
+        logged = self.l2.get_many(log_keys)
+        with self._lock:
+            if len(logged) < len(log_keys):
+                # Entries expired or not written yet; start over
+                self._l1.clear()
+                return
+            for key in logged.values():
+                self._l1.pop(key, None)
+
+    def _publish(self, *keys):
+        if not keys:
+            return
+        l2 = self.l2
+        # Reserve one sequence number per key with a single increment
+        try:
+            last = l2.incr(SEQUENCE_KEY, len(keys))
+        except ValueError:
+            # Seed from the clock so a flushed L2 never repeats a sequence a worker has seen
+            l2.add(SEQUENCE_KEY, time.time_ns(), timeout=None)
+            last = l2.incr(SEQUENCE_KEY, len(keys))
+        first = last - len(keys) + 1
+        l2.set_many(
+            {_log_key(first + offset): key for offset, key in enumerate(keys)},
+            timeout=max(self._l1_timeout * 2, 60),
+        )
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        made_key = self.make_and_validate_key(key, version=version)
+        self._sync()
+        value = self._l1_get(made_key)
+        if value is not _MISSING:
+            self._count('l1_hits')
+            return value
+        self._count('l1_misses')
+        value = self.l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self._count('l2_misses')
+            return default
+        self._count('l2_hits')
+        self._l1_set(made_key, value)
+        return value
+
+    def get_many(self, keys, version=None):
+        self._sync()
+        found = {}
+        missing = []
+        for key in keys:
+            made_key = self.make_and_validate_key(key, version=version)
+            value = self._l1_get(made_key)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        self._count('l1_hits', len(found))
+        self._count('l1_misses', len(missing))
+        if missing:
+            fetched = self.l2.get_many(missing, version=version)
+            self._count('l2_hits', len(fetched))
+            self._count('l2_misses', len(missing) - len(fetched))
+            for key, value in fetched.items():
+                self._l1_set(self.make_and_validate_key(key, version=version), value)
+            found.update(fetched)
+        return found
+
+    def get_many_local(self, keys, version=None):
+        """
+        The values of ``keys`` held in L1, without any I/O.
+
+        Returns ``None`` when L1 is due to be synced with the invalidation
+        log, so callers never see values ``get_many`` would not return.
+        """
+        if time.monotonic() >= self._next_sync:
+            return None
+        found = {}
+        for key in keys:
+            value = self._l1_get(self.make_and_validate_key(key, version=version))
+            if value is not _MISSING:
+                found[key] = value
+        self._count('l1_hits', len(found))
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        made_key = self.make_and_validate_key(key, version=version)
+        self.l2.set(key, value, timeout=timeout, version=version)
+        self._publish(made_key)
+        self._l1_set(made_key, value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.l2.set_many(data, timeout=timeout, version=version)
+        made_keys = [self.make_and_validate_key(key, version=version) for key in data]
+        self._publish(*made_keys)
+        for key, made_key in zip(data, made_keys):
+            if key not in failed:
+                self._l1_set(made_key, data[key], timeout)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        made_key = self.make_and_validate_key(key, version=version)
+        added = self.l2.add(key, value, timeout=timeout, version=version)
+        if added:
+            self._publish(made_key)
+            self._l1_set(made_key, value, timeout)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        made_key = self.make_and_validate_key(key, version=version)
+        self._l1_delete(made_key)
+        return self.l2.touch(key, timeout=timeout, version=version)
+
+    def delete(self, key, version=None):
+        made_key = self.make_and_validate_key(key, version=version)
+        deleted = self.l2.delete(key, version=version)
+        self._publish(made_key)
+        self._l1_delete(made_key)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        made_keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        self.l2.delete_many(keys, version=version)
+        self._publish(*made_keys)
+        for made_key in made_keys:
+            self._l1_delete(made_key)
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def incr(self, key, delta=1, version=None):
+        made_key = self.make_and_validate_key(key, version=version)
+        value = self.l2.incr(key, delta, version=version)
+        self._publish(made_key)
+        self._l1_set(made_key, value)
+        return value
+
+    def clear(self):
+        # Dropping the sequence counter makes every worker flush its L1
+        self.l2.clear()
+        with self._lock:
+            self._l1.clear()
+            self._sequence = None
@@ -0,0 +1,141 @@
+"""
+Response compression.
+
+``CompressionMiddleware`` compresses JSON and other text responses of at
+least ``API_COMPRESSION_MIN_SIZE`` bytes with the best encoding in
+``API_COMPRESSION_ENCODINGS`` the client accepts (brotli needs the
+``brotli`` package) and marks every compressible response
+``Vary: Accept-Encoding``. HTML is left alone so pages carrying CSRF tokens
+are not exposed to BREACH.
+
+Cached API payloads are compressed once, when they are built, with
+``compress_variants``; the stored bytes are then sent as they are on every
+cache hit.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from utils.renderers import PreEncodedJSON
+
+import gzip
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+def available_encodings():
+    """``API_COMPRESSION_ENCODINGS`` that can be produced here, in order of preference."""
+    return [
+        encoding for encoding in settings.API_COMPRESSION_ENCODINGS
+        if encoding == 'gzip' or (encoding == 'br' and brotli is not None)
+    ]
+
+
+def choose_encoding(accept_encoding):
+    """The encoding to answer an ``Accept-Encoding`` header with, or ``None``."""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(content, encoding, levels=None):
+    levels = levels or settings.API_COMPRESSION_LEVELS
+    if encoding == 'br':
+        return brotli.compress(content, quality=levels['br'])
+    # mtime=0 keeps the output identical for identical content
+    return gzip.compress(content, compresslevel=levels['gzip'], mtime=0)
+
+
+def compress_variants(content):
+    """
+    ``{encoding: compressed content}`` for every available encoding.
+
+    Used for cached payloads, so it compresses harder than on-the-fly
+    compression does. Empty below the size threshold or when compressing
+    doesn't make the content smaller.
+    """
+    if len(content) < settings.API_COMPRESSION_MIN_SIZE:
+        return {}
+    variants = {}
+    for encoding in available_encodings():
+        compressed = compress(content, encoding, settings.API_CACHED_COMPRESSION_LEVELS)
+        if len(compressed) < len(content):
+            variants[encoding] = compressed
+    return variants
+
+
+def is_compressible(response):
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    return content_type in settings.API_COMPRESSION_CONTENT_TYPES
+
+
+class CompressionMiddleware:
+    """Compress responses, reusing the compressed variants of cached payloads."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def precompressed(self, response, encoding):
+        """The cached compressed variant of the response body, when there is one."""
+        data = getattr(response, 'data', None)
+        renderer = getattr(response, 'accepted_renderer', None)
+        if not isinstance(data, PreEncodedJSON) or not data.variants or getattr(renderer, 'format', None) != 'json':
+            return None
+        return data.variants.get(encoding)
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding') or not is_compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        compressed = self.precompressed(response, encoding)
+        if compressed is None:
+            content = response.content
+            if len(content) < settings.API_COMPRESSION_MIN_SIZE:
+                return response
+            compressed = compress(content, encoding)
+            if len(compressed) >= len(content):
+                return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # The representation changed; it is still semantically the same
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.db import close_old_connections
+
+from utils.queries import record_in_thread
+
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import threading
+
+_executor = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.API_SECTION_WORKERS, thread_name_prefix='api-section'
+                )
+    return _executor
+
+
+def _run(call):
+    _worker.active = True
+    try:
+        with record_in_thread():
+            return call()
+    finally:
+        _worker.active = False
+        # Worker threads never see request_finished
+        close_old_connections()
+
+
+def run_concurrently(*calls):
+    """
+    Call independent functions concurrently and return their results in order.
+
+    The first runs on the calling thread, the others on a shared pool, each
+    with its own database connection and a copy of the caller's context (the
+    request's database routing and query recording included). With ``API_SECTION_WORKERS`` at 1
+    they simply run one after the other, and so do calls made from a pool
+    thread, which could otherwise wait on a pool taken up by their callers.
+    """
+    if settings.API_SECTION_WORKERS <= 1 or len(calls) < 2 or getattr(_worker, 'active', False):
+        return [call() for call in calls]
+    futures = [_get_executor().submit(contextvars.copy_context().run, _run, call) for call in calls[1:]]
+    first = calls[0]()
+    return [first] + [future.result() for future in futures]
@@ -0,0 +1,13 @@
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+from utils.db_pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, SQLiteDatabaseWrapper):
+    """SQLite with pooled connections (see utils.db_pool), a stand-in for PostgreSQL locally."""
+
+    def get_new_connection(self, conn_params):
+        if self.is_in_memory_db():
+            # Never closed, and each connection is its own database
+            return SQLiteDatabaseWrapper.get_new_connection(self, conn_params)
+        return super().get_new_connection(conn_params)
@@ -0,0 +1,243 @@
+"""
+Database connection pooling.
+
+Django opens a connection per thread and, with ``CONN_MAX_AGE`` at 0, closes
+it at the end of every request. The backends in ``utils.db_backends`` keep a
+bounded pool of open connections per process instead: closing a connection
+hands it back to the pool and the next ``connect()`` on any thread takes it
+from there. Connections idle for longer than ``CHECK_INTERVAL`` are checked
+with a ``SELECT 1`` before reuse, and broken ones, ones still in a failed
+transaction and ones older than ``MAX_LIFETIME`` are closed rather than
+returned. When all ``MAX_SIZE`` connections are in use, ``connect()`` waits up
+to ``TIMEOUT`` seconds for one and then raises ``PoolTimeout``.
+
+Configured per database with a ``POOL`` entry next to ``ENGINE``::
+
+    'POOL': {'MAX_SIZE': 10, 'TIMEOUT': 10, 'MAX_IDLE': 300, 'MAX_LIFETIME': 3600, 'CHECK_INTERVAL': 30}
+
+Keep ``CONN_MAX_AGE`` at 0 with a pooled engine, so connections go back to
+the pool when each request finishes.
+"""
+from django.db.utils import OperationalError
+
+from contextlib import closing
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_OPTIONS = {
+    'MAX_SIZE': 10,
+    'TIMEOUT': 10.0,
+    'MAX_IDLE': 300.0,
+    'MAX_LIFETIME': 3600.0,
+    'CHECK_INTERVAL': 30.0,
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class PooledConnection:
+    """A DB-API connection and when it was opened and last returned."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = self.released_at = time.monotonic()
+
+
+class ConnectionPool:
+    """A bounded, thread-safe LIFO pool of DB-API connections."""
+
+    def __init__(self, alias, max_size, timeout, max_idle, max_lifetime, check_interval):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_interval = check_interval
+        self._idle = []
+        self._size = 0
+        self._in_use = 0
+        self._condition = threading.Condition()
+        self._stats = {
+            'created': 0, 'closed': 0, 'checkouts': 0, 'reused': 0,
+            'health_check_failures': 0, 'timeouts': 0, 'wait_total': 0.0, 'wait_max': 0.0,
+        }
+
+    def _discard(self, entry):
+        try:
+            entry.connection.close()
+        except Exception as e:
+            logger.error(f"Closing pooled connection to {self.alias} failed: {e}")
+
+    def _healthy(self, entry):
+        if time.monotonic() - entry.released_at < self.check_interval:
+            return True
+        try:
+            with closing(entry.connection.cursor()) as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    def _expired(self, entry, now):
+        return bool(self.max_lifetime) and now - entry.created_at >= self.max_lifetime
+
+    def _trim(self, now):
+        """Take connections idle for longer than ``max_idle`` out of the pool; the caller closes them."""
+        # The least recently returned connections are at the bottom of the stack
+        trimmed = []
+        while self._idle and now - self._idle[0].released_at >= self.max_idle:
+            trimmed.append(self._idle.pop(0))
+        self._size -= len(trimmed)
+        self._stats['closed'] += len(trimmed)
+        return trimmed
+
+    def acquire(self, connect):
+        """
+        A pooled connection, opening one with ``connect()`` when none is idle
+        and the pool isn't full.
+        """
+        started = time.monotonic()
+        with self._condition:
+            trimmed = self._trim(started)
+            while not self._idle and self._size >= self.max_size:
+                remaining = started + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeout(
+                        f"No connection to {self.alias} free after {self.timeout}s "
+                        f"({self.max_size} in use)"
+                    )
+                self._condition.wait(remaining)
+            entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                # Reserve the slot before connecting outside the lock
+                self._size += 1
+            self._in_use += 1
+            waited = time.monotonic() - started
+            self._stats['checkouts'] += 1
+            self._stats['wait_total'] += waited
+            self._stats['wait_max'] = max(self._stats['wait_max'], waited)
+        for stale in trimmed:
+            self._discard(stale)
+
+        if entry is not None:
+            if self._healthy(entry):
+                with self._condition:
+                    self._stats['reused'] += 1
+                return entry
+            self._discard(entry)
+            with self._condition:
+                self._stats['health_check_failures'] += 1
+                self._stats['closed'] += 1
+        try:
+            entry = PooledConnection(connect())
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._stats['created'] += 1
+        return entry
+
+    def release(self, entry, reusable=True):
+        """Return a connection taken with ``acquire()``, closing it unless it can be reused."""
+        now = time.monotonic()
+        if not reusable or self._expired(entry, now):
+            self._discard(entry)
+            with self._condition:
+                self._size -= 1
+                self._in_use -= 1
+                self._stats['closed'] += 1
+                self._condition.notify()
+            return
+        entry.released_at = now
+        with self._condition:
+            self._idle.append(entry)
+            self._in_use -= 1
+            self._condition.notify()
+
+    def close_all(self):
+        """Close the idle connections; ones in use are closed when they come back."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._stats['closed'] += len(idle)
+        for entry in idle:
+            self._discard(entry)
+
+    def get_stats(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats.update(
+                size=self._size, in_use=self._in_use, idle=len(self._idle), max_size=self.max_size,
+                wait_avg=stats['wait_total'] / stats['checkouts'] if stats['checkouts'] else 0.0,
+            )
+        return stats
+
+
+def get_pool(alias, settings_dict):
+    """The process's pool for ``alias``, created on first use and again after a fork."""
+    key = (alias, os.getpid())
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                options = {**DEFAULT_POOL_OPTIONS, **settings_dict.get('POOL', {})}
+                pool = _pools[key] = ConnectionPool(
+                    alias,
+                    max_size=int(options['MAX_SIZE']),
+                    timeout=float(options['TIMEOUT']),
+                    max_idle=float(options['MAX_IDLE']),
+                    max_lifetime=float(options['MAX_LIFETIME']),
+                    check_interval=float(options['CHECK_INTERVAL']),
+                )
+    return pool
+
+
+def get_pool_stats():
+    """``{alias: stats}`` for the pools of this process."""
+    pid = os.getpid()
+    return {alias: pool.get_stats() for (alias, pool_pid), pool in list(_pools.items()) if pool_pid == pid}
+
+
+class PooledDatabaseWrapperMixin:
+    """Take connections from the alias's pool and give them back on close."""
+    pooled_connection = None
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict)
+
+    def get_new_connection(self, conn_params):
+        connect = super().get_new_connection
+        self.pooled_connection = self.pool.acquire(lambda: connect(conn_params))
+        return self.pooled_connection.connection
+
+    def reset_pooled_connection(self):
+        """Leave the connection as a new one would be; ``False`` when it can't be reused."""
+        try:
+            if self.in_atomic_block or not self.get_autocommit():
+                self.connection.rollback()
+            if self.errors_occurred and not self.is_usable():
+                return False
+        except Exception:
+            return False
+        return True
+
+    def _close(self):
+        entry, self.pooled_connection = self.pooled_connection, None
+        if entry is None or entry.connection is not self.connection:
+            return super()._close()
+        self.pool.release(entry, self.reset_pooled_connection())
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models
+from rest_framework import serializers
+
+from utils.cache import get_table_versions
+
+import hashlib
+
+
+def _nested_tables(serializer, seen=None):
+    """Tables of every nested serializer under ``serializer``."""
+    seen = set() if seen is None else seen
+    for field in serializer.fields.values():
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(nested, serializers.ModelSerializer):
+            table = nested.Meta.model._meta.db_table
+            if table not in seen:
+                seen.add(table)
+                _nested_tables(nested, seen)
+    return seen
+
+
+def _field_signature(serializer):
+    """Names of the fields ``serializer`` renders, nested ones included."""
+    names = []
+    for name, field in serializer.fields.items():
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(nested, serializers.ModelSerializer):
+            names.append(f"{name}({_field_signature(nested)})")
+        else:
+            names.append(name)
+    return ','.join(names)
+
+
+class FragmentCacheListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer that caches the representation of each row.
+
+    Fragments are keyed on the child serializer class, the row's model, pk
+    and ``date_updated``, the request's host (representations embed absolute
+    URLs), the rendered field set (sparse fieldsets) and the write versions
+    of the tables of nested serializers. A list fetches all its fragments in
+    one ``get_many`` and only serializes the rows that missed, so editing one
+    row re-serializes only that row. ``CachingQuerySet.update()`` and
+    ``bulk_update()`` set ``date_updated`` so bulk edits move the key too.
+
+    Set it as ``Meta.list_serializer_class`` on a ModelSerializer.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        if not items:
+            return []
+
+        child = self.child
+        prefix = self._key_prefix()
+        keys = [self._fragment_key(prefix, item) for item in items]
+
+        cache = caches['default']
+        found = cache.get_many([key for key in keys if key])
+        fresh = {}
+        representation = []
+        for key, item in zip(keys, items):
+            if key in found:
+                representation.append(found[key])
+                continue
+            value = child.to_representation(item)
+            if key:
+                fresh[key] = value
+            representation.append(value)
+        if fresh:
+            cache.set_many(fresh, settings.FRAGMENT_CACHE_TIMEOUT)
+        return representation
+
+    def _key_prefix(self):
+        child_class = type(self.child)
+        request = self.context.get('request')
+        base_url = request.build_absolute_uri('/') if request is not None else ''
+        tables = sorted(_nested_tables(self.child))
+        return (
+            f"{child_class.__module__}.{child_class.__qualname__}:{base_url}:"
+            f"{_field_signature(self.child)}:{get_table_versions(tables) if tables else ''}"
+        )
+
+    @staticmethod
+    def _fragment_key(prefix, item):
+        date_updated = getattr(item, 'date_updated', None)
+        if getattr(item, 'pk', None) is None or date_updated is None:
+            return None
+        fingerprint = f"{prefix}:{item._meta.label}:{item.pk}:{date_updated.isoformat()}"
+        return "fragment:" + hashlib.md5(fingerprint.encode()).hexdigest()
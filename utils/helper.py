@@ -1,6 +1,5 @@
 from django.db import models
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from PIL import Image
 import io
 import os
 import sys
@@ -90,6 +89,9 @@ class OptimalImageField(models.ImageField):
 
     def process_image(self, image_file):
         """Process image based on size and format"""
+        # Pillow is only needed here; importing it lazily keeps it out of worker boot
+        from PIL import Image
+
         original_size_kb = self._get_file_size_kb(image_file)
         
         # Open image and get info
@@ -165,7 +167,8 @@ class OptimalImageField(models.ImageField):
     def pre_save(self, model_instance, add):
         file = getattr(model_instance, self.attname)
         
-        if file and hasattr(file, 'name'):
+        # Only new uploads: files already in storage were processed when they were saved
+        if file and hasattr(file, 'name') and not getattr(file, '_committed', True):
             processed_file = self.process_image(file)
             setattr(model_instance, self.attname, processed_file)
             
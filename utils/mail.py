@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import transaction
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=settings.MAIL_WORKERS, thread_name_prefix='mail')
+    return _executor
+
+
+def _send(args, kwargs):
+    try:
+        send_mail(*args, **kwargs)
+    except Exception as e:
+        logger.error(f"Error sending mail '{args[0] if args else kwargs.get('subject')}': {str(e)}")
+
+
+def send_mail_in_background(*args, **kwargs):
+    """
+    ``send_mail`` on a worker thread, once the current transaction commits.
+
+    The request returns without waiting on SMTP; failures are logged.
+    """
+    transaction.on_commit(lambda: _get_executor().submit(_send, args, kwargs))
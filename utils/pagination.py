@@ -0,0 +1,176 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.models import Q
+from rest_framework.utils.urls import replace_query_param
+
+from utils.cache import get_table_versions
+from utils.querycache import _query_tables
+
+import base64
+import binascii
+import hashlib
+import json
+import uuid
+from datetime import datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def cached_count(queryset, timeout=None):
+    """
+    ``queryset.count()`` cached until a table it reads is written to.
+    """
+    sql, params = queryset.query.sql_with_params()
+    tables = sorted(_query_tables(queryset.query))
+    fingerprint = repr((queryset.db, sql, params, tables, get_table_versions(tables)))
+    key = "row-count:" + hashlib.md5(fingerprint.encode()).hexdigest()
+    cache = caches['default']
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, settings.QUERYSET_CACHE_TIMEOUT if timeout is None else timeout)
+    return count
+
+
+def estimated_count(queryset):
+    """
+    Row estimate from the PostgreSQL planner, without scanning the table.
+
+    Returns ``None`` on other databases.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    plan = queryset.order_by().explain(format='json')
+    return int(json.loads(plan)[0]['Plan']['Plan Rows'])
+
+
+def keyset_query_budget(max_queries):
+    """
+    A view ``query_budget`` of ``max_queries``, plus the count of ``?cursor=`` requests.
+    """
+    def budget(request, **kwargs):
+        return max_queries + 1 if KeysetPagination.cursor_query_param in request.GET else max_queries
+    return budget
+
+
+class KeysetPagination:
+    """
+    Cursor pagination over ``(date_added, id)``, newest first.
+
+    Each page is fetched with a ``WHERE (date_added, id) < (last row)`` range
+    scan on the matching index instead of an OFFSET, so deep pages cost the
+    same as the first one. Cursors are opaque base64 tokens carrying the
+    boundary row and direction.
+
+    Counting is controlled with ``?count=``: ``none`` skips it, ``cached``
+    (the default) caches it until the table is written to, ``estimate`` asks
+    the PostgreSQL planner and ``exact`` runs ``COUNT(*)``.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    count_mode = 'cached'
+    count_modes = ('none', 'cached', 'estimate', 'exact')
+
+    @classmethod
+    def is_requested(cls, request):
+        return cls.cursor_query_param in request.query_params
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def encode_cursor(self, instance, reverse):
+        position = {
+            'd': instance.date_added.isoformat(),
+            'i': str(instance.pk),
+            'r': int(reverse),
+        }
+        token = base64.urlsafe_b64encode(json.dumps(position, separators=(',', ':')).encode())
+        return token.decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            date_added = datetime.fromisoformat(position['d'])
+            pk = uuid.UUID(position['i'])
+            reverse = bool(position['r'])
+        except (binascii.Error, ValueError, KeyError, TypeError, AttributeError):
+            raise InvalidCursor("Invalid cursor")
+        if date_added.tzinfo is None:
+            raise InvalidCursor("Invalid cursor")
+        return (date_added, pk), reverse
+
+    def paginate_queryset(self, queryset, request):
+        self.request = request
+        size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        page = queryset.order_by(*(('date_added', 'id') if reverse else ('-date_added', '-id')))
+        if position is not None:
+            date_added, pk = position
+            if reverse:
+                after = Q(date_added__gt=date_added) | Q(date_added=date_added, id__gt=pk)
+            else:
+                after = Q(date_added__lt=date_added) | Q(date_added=date_added, id__lt=pk)
+            page = page.filter(after)
+
+        rows = list(page[:size + 1])
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.next_cursor = self.encode_cursor(rows[-1], False) if rows and self.has_next else None
+        self.previous_cursor = self.encode_cursor(rows[0], True) if rows and self.has_previous else None
+        self.total_items = self.get_count(queryset, request)
+        return rows
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param, self.count_mode)
+        if mode not in self.count_modes:
+            mode = self.count_mode
+        if mode == 'none':
+            return None
+        queryset = queryset.order_by()
+        if mode == 'exact':
+            return queryset.count()
+        if mode == 'estimate':
+            estimate = estimated_count(queryset)
+            if estimate is not None:
+                return estimate
+        return cached_count(queryset)
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_pagination_data(self):
+        previous_link = self.get_link(self.previous_cursor)
+        if self.has_previous and self.previous_cursor is None:
+            # Past the last row: point back at the first page
+            previous_link = self.get_link('')
+        return {
+            "total_items": self.total_items,
+            "next_cursor": self.next_cursor,
+            "previous_cursor": self.previous_cursor,
+            "next": self.get_link(self.next_cursor),
+            "previous": previous_link,
+        }
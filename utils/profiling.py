@@ -0,0 +1,213 @@
+"""
+Per-request CPU profiling.
+
+With ``PROFILING_ENABLED`` on, ``ProfilingMiddleware`` runs a request under
+cProfile when it carries a valid profiling token, in the ``X-Profile`` header
+or the ``?profile=`` query flag, or when it is picked by random sampling at
+``PROFILING_SAMPLE_RATE``. Tokens are signed, expire after
+``PROFILING_TOKEN_MAX_AGE`` seconds and are handed out to staff on the
+admin's profiles page, so they also work on the anonymous public API. The
+query flag changes the URL and so misses the response cache; send the
+header to profile what a cache hit costs.
+
+Each profile is written to ``PROFILING_DIR`` as a pstats file (open it with
+``python -m pstats`` or snakeviz) next to a JSON file with the URL, status,
+timings and ``Server-Timing`` of the request; the oldest are deleted beyond
+``PROFILING_MAX_FILES``. The profile covers the request's own thread: work
+handed to ``run_concurrently`` workers shows up as waiting. Under ASGI one
+request is profiled at a time, and other requests served by the event loop
+meanwhile are included in its profile.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.admin import site
+from django.core import signing
+from django.http import FileResponse, Http404
+from django.template.response import TemplateResponse
+from django.utils import timezone
+from django.utils.text import slugify
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+TOKEN_SALT = 'utils.profiling'
+TOKEN_HEADER = 'HTTP_X_PROFILE'
+TOKEN_PARAM = 'profile'
+PROFILE_NAME = re.compile(r'^[\w-]+\.prof$')
+
+# cProfile can't profile two requests at once on the event loop's thread
+_async_profiling = False
+
+
+def make_token():
+    """A profiling token valid for ``PROFILING_TOKEN_MAX_AGE`` seconds."""
+    return signing.dumps('profile', salt=TOKEN_SALT)
+
+
+def token_is_valid(token):
+    try:
+        return signing.loads(token, salt=TOKEN_SALT, max_age=settings.PROFILING_TOKEN_MAX_AGE) == 'profile'
+    except signing.BadSignature:
+        return False
+
+
+def profiling_trigger(request):
+    """Why ``request`` should be profiled (``'token'`` or ``'sample'``), or ``None``."""
+    token = request.META.get(TOKEN_HEADER) or request.GET.get(TOKEN_PARAM)
+    if token and token_is_valid(token):
+        return 'token'
+    if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+        return 'sample'
+    return None
+
+
+def save_profile(profiler, request, response, trigger, duration):
+    """Write the profile and its metadata; returns the profile's name."""
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    started = timezone.now()
+    path = slugify(request.path.replace('/', '-'))[:60] or 'root'
+    name = f"{started:%Y%m%d-%H%M%S}-{request.method.lower()}-{path}-{uuid.uuid4().hex[:8]}.prof"
+    profile_path = os.path.join(settings.PROFILING_DIR, name)
+    profiler.dump_stats(profile_path)
+    meta = {
+        'name': name,
+        'created': started.isoformat(),
+        'method': request.method,
+        'url': request.get_full_path(),
+        'host': request.get_host(),
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000, 2),
+        'trigger': trigger,
+        'server_timing': response.get('Server-Timing', ''),
+    }
+    with open(profile_path[:-len('.prof')] + '.json', 'w') as f:
+        json.dump(meta, f)
+    prune_profiles()
+    return name
+
+
+def list_profiles():
+    """Metadata of the stored profiles, newest first."""
+    try:
+        names = [name for name in os.listdir(settings.PROFILING_DIR) if PROFILE_NAME.match(name)]
+    except FileNotFoundError:
+        return []
+    profiles = []
+    for name in sorted(names, reverse=True):
+        path = os.path.join(settings.PROFILING_DIR, name)
+        try:
+            with open(path[:-len('.prof')] + '.json') as f:
+                meta = json.load(f)
+            meta['size_kb'] = os.path.getsize(path) / 1024
+        except (OSError, ValueError):
+            meta = {'name': name}
+        profiles.append(meta)
+    return profiles
+
+
+def prune_profiles():
+    profiles = list_profiles()
+    for meta in profiles[settings.PROFILING_MAX_FILES:]:
+        path = os.path.join(settings.PROFILING_DIR, meta['name'])
+        for stale in (path, path[:-len('.prof')] + '.json'):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def profile_path(name):
+    path = os.path.join(settings.PROFILING_DIR, name)
+    if not PROFILE_NAME.match(name) or not os.path.exists(path):
+        raise Http404
+    return path
+
+
+class ProfilingMiddleware:
+    """Profile requests picked by token or sampling; see the module docstring."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def finish(self, profiler, request, response, trigger, started):
+        try:
+            name = save_profile(profiler, request, response, trigger, time.perf_counter() - started)
+            response['X-Profile-Id'] = name
+        except Exception as e:
+            logger.error(f"Saving the profile of {request.get_full_path()} failed: {e}")
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        trigger = settings.PROFILING_ENABLED and profiling_trigger(request)
+        if not trigger:
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        return self.finish(profiler, request, response, trigger, started)
+
+    async def __acall__(self, request):
+        global _async_profiling
+        trigger = settings.PROFILING_ENABLED and not _async_profiling and profiling_trigger(request)
+        if not trigger:
+            return await self.get_response(request)
+
+        _async_profiling = True
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiler.disable()
+            _async_profiling = False
+        return self.finish(profiler, request, response, trigger, started)
+
+
+def profile_list(request):
+    """Admin page listing the stored profiles, with a fresh token for triggering new ones."""
+    context = {
+        **site.each_context(request),
+        'title': 'Request profiles',
+        'profiles': list_profiles(),
+        'token': make_token(),
+        'token_max_age': settings.PROFILING_TOKEN_MAX_AGE,
+        'enabled': settings.PROFILING_ENABLED,
+        'sample_rate': settings.PROFILING_SAMPLE_RATE,
+    }
+    return TemplateResponse(request, 'admin/profiles.html', context)
+
+
+def profile_download(request, name):
+    """The pstats file, or its top functions as text with ``?format=text``."""
+    path = profile_path(name)
+    if request.GET.get('format') != 'text':
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
+    sort = request.GET.get('sort')
+    if sort not in ('cumulative', 'tottime', 'calls'):
+        sort = 'cumulative'
+    output = io.StringIO()
+    pstats.Stats(path, stream=output).strip_dirs().sort_stats(sort).print_stats(60)
+    return FileResponse(io.BytesIO(output.getvalue().encode()), content_type='text/plain; charset=utf-8')
@@ -0,0 +1,217 @@
+"""
+Per-request query instrumentation and query budgets.
+
+``QueryInstrumentationMiddleware`` counts the queries each request runs, their
+total time and how many were repeats of an earlier statement, reports them in
+a ``Server-Timing`` header and logs them. Views declare how many queries they
+may run with a ``query_budget`` attribute (or the ``query_budget`` decorator on
+function views), a number or a function of the request and the view's
+keyword arguments when listings and details differ; going over it is
+logged as an error, or raised with
+``QUERY_BUDGET_STRICT`` on, as the test settings should do. Under ASGI only
+the total request time is reported. Queries that ``run_concurrently`` runs on
+its pool threads are counted with the request's.
+
+In tests, ``assert_query_budget`` checks a block of code directly::
+
+    with assert_query_budget(view_query_budget('/api/v1/client/services/')):
+        client.get('/api/v1/client/services/')
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.urls import resolve
+
+from client.inprocess import build_get_request
+
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_active_recordings = ContextVar('query_recordings', default=())
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryRecorder:
+    """Database execute wrapper that records every statement it sees."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            # Pool threads of the same request record concurrently
+            with self._lock:
+                self.duration += duration
+                self.count += 1
+                self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        """Statements run more than once, the usual sign of an N+1."""
+        return {sql: count for sql, count in self.statements.items() if count > 1}
+
+    @property
+    def duplicate_count(self):
+        return sum(count - 1 for count in self.duplicates.values())
+
+    def wrap_connections(self, stack, aliases=None):
+        for alias in aliases or connections:
+            stack.enter_context(connections[alias].execute_wrapper(self))
+
+    @contextmanager
+    def record(self, aliases=None):
+        """Record the queries this thread runs in the block, and pool threads it hands work to."""
+        token = _active_recordings.set(_active_recordings.get() + ((self, aliases),))
+        try:
+            with ExitStack() as stack:
+                self.wrap_connections(stack, aliases)
+                yield self
+        finally:
+            _active_recordings.reset(token)
+
+
+@contextmanager
+def record_in_thread():
+    """
+    Record this thread's queries with the recorders active in the current context.
+
+    For threads running work on behalf of a recorded block, with a copy of
+    its context, whose database connections are their own.
+    """
+    with ExitStack() as stack:
+        for recorder, aliases in _active_recordings.get():
+            recorder.wrap_connections(stack, aliases)
+        yield
+
+
+def query_budget(max_queries):
+    """Declare the most queries a view may run per request."""
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+def get_query_budget(view_func, request, view_kwargs):
+    view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+    budget = getattr(view_func, 'query_budget', None)
+    if budget is None and view_class is not None:
+        budget = getattr(view_class, 'query_budget', None)
+    if callable(budget):
+        budget = budget(request, **view_kwargs)
+    return budget
+
+
+def view_query_budget(path):
+    """The budget declared by the view serving ``path``."""
+    request = build_get_request(path, 'testserver')
+    match = resolve(request.path_info)
+    return get_query_budget(match.func, request, match.kwargs)
+
+
+def _format_duplicates(recorder):
+    return '\n'.join(f"  {count}x {sql}" for sql, count in recorder.duplicates.items())
+
+
+@contextmanager
+def assert_query_budget(max_queries, aliases=None):
+    """Fail if the block runs more than ``max_queries`` queries."""
+    recorder = QueryRecorder()
+    with recorder.record(aliases):
+        yield recorder
+    if max_queries is not None and recorder.count > max_queries:
+        message = f"{recorder.count} queries run, budget is {max_queries}"
+        if recorder.duplicates:
+            message += f"; repeated statements:\n{_format_duplicates(recorder)}"
+        raise AssertionError(message)
+
+
+class QueryInstrumentationMiddleware:
+    """Record the queries of every request and check them against the view's budget."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Otherwise Django would run process_view on a worker thread
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.QUERY_INSTRUMENTATION:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with recorder.record():
+            response = self.get_response(request)
+        return self.report(request, response, recorder, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        if not settings.QUERY_INSTRUMENTATION:
+            return await self.get_response(request)
+
+        # Queries run on worker threads, whose connections can't be wrapped
+        # from here: under ASGI only the total time is reported.
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        if settings.QUERY_SERVER_TIMING:
+            self.add_server_timing(response, [f'total;dur={(time.perf_counter() - started) * 1000:.1f}'])
+        return response
+
+    def add_server_timing(self, response, metrics):
+        response['Server-Timing'] = ', '.join(filter(None, [response.get('Server-Timing'), *metrics]))
+
+    def report(self, request, response, recorder, total):
+        if settings.QUERY_SERVER_TIMING:
+            self.add_server_timing(response, [
+                f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"',
+                f'dup;desc="{recorder.duplicate_count} duplicate queries"' if recorder.duplicate_count else None,
+                f'total;dur={total * 1000:.1f}',
+            ])
+
+        path = request.get_full_path()
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and recorder.count > budget:
+            message = f"Query budget exceeded on {path}: {recorder.count} queries, budget is {budget}"
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(f"{message}\n{_format_duplicates(recorder)}")
+            logger.error(message)
+        elif recorder.duplicate_count:
+            logger.warning(
+                f"{recorder.duplicate_count} duplicate queries on {path}:\n{_format_duplicates(recorder)}"
+            )
+        logger.debug(
+            f"{request.method} {path}: {recorder.count} queries in {recorder.duration * 1000:.1f}ms, "
+            f"{total * 1000:.1f}ms total"
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func, request, view_kwargs)
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func, request, view_kwargs)
+        return None
@@ -0,0 +1,145 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import models
+from django.db.models.sql.query import Query
+from django.utils import timezone
+
+from utils.cache import bump_table_version, get_table_versions
+
+import hashlib
+
+_DEFAULT = object()
+
+
+def _walk(node):
+    yield node
+    if isinstance(node, Query):
+        return
+    if hasattr(node, 'children'):
+        children = node.children
+    elif hasattr(node, 'get_source_expressions'):
+        children = node.get_source_expressions()
+    else:
+        children = ()
+    for child in children:
+        if child is not None:
+            yield from _walk(child)
+
+
+def _query_tables(query):
+    """Every table ``query`` reads from, including joins and subqueries."""
+    tables = {join.table_name for join in query.alias_map.values()}
+    tables.add(query.get_meta().db_table)
+    for expression in [query.where, *query.annotations.values()]:
+        for node in _walk(expression):
+            inner = node if isinstance(node, Query) else getattr(node, 'query', None)
+            if isinstance(inner, Query) and inner is not query:
+                tables |= _query_tables(inner)
+    return tables
+
+
+class CachingQuerySet(models.QuerySet):
+    """
+    QuerySet whose results can be cached with ``.cached()``.
+
+    Cached results are keyed on the compiled SQL and params plus the write
+    version of every table the query reads from, so they are served without a
+    database round trip until a row in one of those tables changes. Versions
+    are bumped by the model save/delete signals and by the bulk write paths
+    of this queryset (``update``, ``delete``, ``bulk_create``, ``bulk_update``).
+    ``update`` and ``bulk_update`` also set ``date_updated``, as ``save()``
+    does through ``auto_now``, since per-row fragments are keyed on it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache_results = False
+        self._cache_timeout = None
+
+    def cached(self, timeout=_DEFAULT):
+        clone = self._chain()
+        clone._cache_results = True
+        clone._cache_timeout = settings.QUERYSET_CACHE_TIMEOUT if timeout is _DEFAULT else timeout
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._cache_results = self._cache_results
+        clone._cache_timeout = self._cache_timeout
+        return clone
+
+    def _fetch_all(self):
+        if self._result_cache is None and self._cache_results:
+            self._result_cache = self._fetch_cached()
+        super()._fetch_all()
+
+    def _fetch_cached(self):
+        query = self.query.clone()
+        try:
+            sql, params = query.get_compiler(using=self.db).as_sql()
+        except EmptyResultSet:
+            return []
+        tables = sorted(_query_tables(query))
+        versions = get_table_versions(tables)
+        fingerprint = repr((self.db, self._iterable_class.__name__, sql, params, tables, versions))
+        key = "queryset:" + hashlib.md5(fingerprint.encode()).hexdigest()
+
+        cache = caches['default']
+        results = cache.get(key)
+        if results is None:
+            results = list(self._iterable_class(self))
+            cache.set(key, results, self._cache_timeout)
+        return results
+
+    def _bump_version(self):
+        bump_table_version(self.model._meta.db_table, using=self.db)
+
+    def _has_date_updated(self):
+        return any(field.name == 'date_updated' for field in self.model._meta.concrete_fields)
+
+    def update(self, **kwargs):
+        if self._has_date_updated():
+            kwargs.setdefault('date_updated', timezone.now())
+        rows = super().update(**kwargs)
+        self._bump_version()
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        result = super().delete()
+        self._bump_version()
+        return result
+
+    delete.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        self._bump_version()
+        return objs
+
+    bulk_create.alters_data = True
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if self._has_date_updated() and 'date_updated' not in fields:
+            objs = list(objs)
+            now = timezone.now()
+            for obj in objs:
+                obj.date_updated = now
+            fields = [*fields, 'date_updated']
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        self._bump_version()
+        return rows
+
+    bulk_update.alters_data = True
+
+
+CachingManager = models.Manager.from_queryset(CachingQuerySet)
+
+
+class LiveManager(CachingManager):
+    """Rows that are not soft-deleted, the ones the public API serves."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
@@ -0,0 +1,111 @@
+"""
+JSON rendering for the API.
+
+``FastJSONRenderer`` encodes with orjson when it is installed and falls back
+to the stdlib encoder otherwise (``JSON_RENDERER_BACKEND`` forces one).
+Output matches DRF's ``JSONRenderer``: compact, UTF-8, datetimes and lazy
+strings formatted by DRF's encoder, U+2028/U+2029 escaped.
+
+Payloads that were encoded earlier, e.g. by the response cache, are wrapped
+in ``PreEncodedJSON`` and written out as they are.
+"""
+from django.conf import settings
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils import encoders
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class PreEncodedJSON:
+    """
+    JSON that has already been encoded to ``content`` bytes.
+
+    ``variants`` optionally maps content encodings to ``content`` already
+    compressed with them (see ``utils.compression``).
+    """
+
+    __slots__ = ('content', 'variants')
+
+    def __init__(self, content, variants=None):
+        self.content = content
+        self.variants = variants
+
+    def decode(self):
+        return json.loads(self.content)
+
+
+_drf_encoder = encoders.JSONEncoder()
+
+
+def _orjson_default(obj):
+    if isinstance(obj, PreEncodedJSON):
+        fragment = getattr(orjson, 'Fragment', None)
+        return fragment(obj.content) if fragment else orjson.loads(obj.content)
+    return _drf_encoder.default(obj)
+
+
+class _StdlibEncoder(encoders.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, PreEncodedJSON):
+            return obj.decode()
+        return super().default(obj)
+
+
+def _backend():
+    backend = getattr(settings, 'JSON_RENDERER_BACKEND', 'auto')
+    if backend == 'auto':
+        return 'orjson' if orjson is not None else 'stdlib'
+    if backend == 'orjson' and orjson is None:
+        return 'stdlib'
+    return backend
+
+
+def encode_json(data, indent=None, backend=None):
+    """Encode ``data`` to bytes the way ``FastJSONRenderer`` renders it."""
+    if indent is None and isinstance(data, PreEncodedJSON):
+        return data.content
+    # orjson only indents by two spaces and can't re-indent pre-encoded
+    # fragments, so indented output, which is only for people, uses the stdlib
+    if indent is None and (backend or _backend()) == 'orjson':
+        # Datetimes go through DRF's encoder so formatting matches JSONRenderer
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        content = orjson.dumps(data, default=_orjson_default, option=option)
+    else:
+        separators = (',', ':') if indent is None else (',', ': ')
+        content = json.dumps(
+            data, cls=_StdlibEncoder, indent=indent, ensure_ascii=False,
+            allow_nan=False, separators=separators,
+        ).encode('utf-8')
+    # Valid JSON, but not valid JavaScript; DRF escapes them too
+    if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+class FastJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def get_indent(self, accepted_media_type, renderer_context):
+        if accepted_media_type:
+            params = dict(
+                param.strip().split('=', 1) for param in accepted_media_type.split(';')[1:] if '=' in param
+            )
+            try:
+                # indent=0 means compact, as in DRF
+                return max(min(int(params['indent']), 8), 0) or None
+            except (KeyError, ValueError, TypeError):
+                pass
+        return renderer_context.get('indent', None)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        return encode_json(data, indent=indent)
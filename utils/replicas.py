@@ -0,0 +1,181 @@
+"""
+Read replicas for the public API.
+
+``ReplicaRoutingMiddleware`` lets the requests of route groups with
+``read_replica`` set read from one of ``DATABASE_REPLICAS``, picked once per
+request, and ``client.routers.ReplicaRouter`` sends their reads there. Every
+other request, the admin and all writes included, uses the primary.
+
+Reads go back to the primary as soon as the request writes anything, and a
+``db-pin`` cookie keeps that client's later requests on the primary for
+``DATABASE_PIN_SECONDS``, so nobody reads their own write from a replica
+that hasn't replayed it yet.
+
+``DATABASE_REPLICA_SELECTION`` is ``round-robin`` or ``least-lag``. Either
+way each replica's replication lag is checked at most every
+``DATABASE_REPLICA_LAG_INTERVAL`` seconds per process and replicas more than
+``DATABASE_REPLICA_MAX_LAG`` seconds behind, or unreachable, are skipped;
+with none left, reads use the primary. Only PostgreSQL reports lag; other
+backends (a local SQLite stand-in) count as up to date.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from utils.routing import get_route_group, match_route_group
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = 'db-pin'
+
+POSTGRESQL_LAG_SQL = (
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+_routing_state = ContextVar('replica_routing_state', default=None)
+_round_robin = itertools.count()
+_lags = {}
+_lags_lock = threading.Lock()
+
+
+class RoutingState:
+    """Database routing of the current request."""
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.replica = None
+        self.wrote = False
+
+    def db_for_read(self):
+        if not self.use_replica or self.wrote:
+            return DEFAULT_DB_ALIAS
+        if self.replica is None:
+            # One replica per request, so its reads see one snapshot
+            self.replica = choose_replica()
+        return self.replica
+
+
+def get_routing_state():
+    """The ``RoutingState`` of the current request, or ``None`` outside one."""
+    return _routing_state.get()
+
+
+def routing_state_for(group, cookies):
+    """The ``RoutingState`` of a request in route ``group`` sending ``cookies``."""
+    return RoutingState(use_replica=bool(group and group.get('read_replica')) and PIN_COOKIE not in cookies)
+
+
+@contextmanager
+def routed_as(path, method, cookies):
+    """
+    Route the reads in the block as a request to ``path`` would be.
+
+    For sub-requests run in-process, past ``ReplicaRoutingMiddleware``.
+    """
+    if not settings.DATABASE_REPLICAS:
+        yield None
+        return
+    state = routing_state_for(settings.ROUTE_GROUPS.get(match_route_group(path, method)), cookies)
+    token = _routing_state.set(state)
+    try:
+        yield state
+    finally:
+        _routing_state.reset(token)
+
+
+def measure_lag(alias):
+    """Seconds ``alias`` is behind the primary; ``None`` when it can't be reached."""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(POSTGRESQL_LAG_SQL)
+            lag = cursor.fetchone()[0]
+        return float(lag or 0)
+    except Exception as e:
+        logger.error(f"Replication lag check on {alias} failed: {e}")
+        connection.close()
+        return None
+
+
+def get_replica_lags():
+    """``{alias: lag}`` of every replica, measured again once the last check is old enough."""
+    now = time.monotonic()
+    lags = {}
+    for alias in settings.DATABASE_REPLICAS:
+        with _lags_lock:
+            checked_at, lag = _lags.get(alias, (None, None))
+            due = checked_at is None or now - checked_at >= settings.DATABASE_REPLICA_LAG_INTERVAL
+            if due:
+                # Claim the check; other threads keep the last value meanwhile
+                _lags[alias] = (now, lag)
+        if due:
+            lag = measure_lag(alias)
+            with _lags_lock:
+                _lags[alias] = (now, lag)
+        lags[alias] = lag
+    return lags
+
+
+def choose_replica():
+    """The replica to read from, or the primary when none is usable."""
+    usable = {
+        alias: lag for alias, lag in get_replica_lags().items()
+        if lag is not None and lag <= settings.DATABASE_REPLICA_MAX_LAG
+    }
+    if not usable:
+        return DEFAULT_DB_ALIAS
+    if settings.DATABASE_REPLICA_SELECTION == 'least-lag':
+        return min(usable, key=usable.get)
+    aliases = sorted(usable)
+    return aliases[next(_round_robin) % len(aliases)]
+
+
+class ReplicaRoutingMiddleware:
+    """Route the reads of read-only route groups to a replica and pin clients that write."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def pin(self, response, state):
+        if state.wrote and settings.DATABASE_PIN_SECONDS:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.DATABASE_PIN_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        if self.async_mode:
+            return self.__acall__(request)
+        state = routing_state_for(get_route_group(request), request.COOKIES)
+        token = _routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        return self.pin(response, state)
+
+    async def __acall__(self, request):
+        state = routing_state_for(get_route_group(request), request.COOKIES)
+        token = _routing_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        return self.pin(response, state)
@@ -0,0 +1,115 @@
+"""
+Route groups: lighter middleware for requests that don't need all of it.
+
+``RouteGroupMiddleware`` matches each request against ``ROUTE_GROUPS`` by
+path prefix and method and tags it with the group's name. The session, CSRF,
+authentication and messages middleware below are Django's own, except that
+they pass the request straight through when its group lists them in
+``skip_middleware``; ``RouteGroupJWTAuthentication`` likewise leaves the
+request anonymous when the group sets ``authenticate`` to ``False``.
+Requests outside every group, the admin included, run the full stack.
+
+The public ``client`` and ``academy`` GET endpoints are anonymous, so they
+skip all of it. CSRF is never skipped for unsafe methods.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import middleware as auth_middleware
+from django.contrib.messages import middleware as messages_middleware
+from django.contrib.sessions import middleware as sessions_middleware
+from django.middleware import csrf
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+def match_route_group(path, method):
+    """Name of the first group in ``ROUTE_GROUPS`` serving ``method`` on ``path``."""
+    for name, group in settings.ROUTE_GROUPS.items():
+        if method in group.get('methods', SAFE_METHODS) and path.startswith(tuple(group['prefixes'])):
+            return name
+    return None
+
+
+def get_route_group(request):
+    """The group settings of ``request``, or ``None`` when it is in no group."""
+    name = getattr(request, 'route_group', None)
+    return settings.ROUTE_GROUPS.get(name) if name else None
+
+
+class RouteGroupMiddleware:
+    """Tag each request with the route group it belongs to."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        request.route_group = match_route_group(request.path_info, request.method)
+        return self.get_response(request)
+
+
+class RouteGroupMixin:
+    """Skip this middleware for requests whose route group lists it."""
+
+    @classmethod
+    def wrapped_path(cls):
+        for base in cls.__mro__:
+            if base.__module__ != __name__:
+                return f"{base.__module__}.{base.__qualname__}"
+
+    def skipped(self, request):
+        group = get_route_group(request)
+        return group is not None and self.wrapped_path() in group.get('skip_middleware', ())
+
+    def __call__(self, request):
+        if self.skipped(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(RouteGroupMixin, sessions_middleware.SessionMiddleware):
+    pass
+
+
+class AuthenticationMiddleware(RouteGroupMixin, auth_middleware.AuthenticationMiddleware):
+    pass
+
+
+class MessageMiddleware(RouteGroupMixin, messages_middleware.MessageMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(RouteGroupMixin, csrf.CsrfViewMiddleware):
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if iscoroutinefunction(get_response):
+            # Otherwise Django would run process_view on a worker thread
+            self.process_view = self.aprocess_view
+
+    def skipped(self, request):
+        return request.method in SAFE_METHODS and super().skipped(request)
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if self.skipped(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+    async def aprocess_view(self, request, callback, callback_args, callback_kwargs):
+        if self.skipped(request):
+            return None
+        return await sync_to_async(super().process_view)(request, callback, callback_args, callback_kwargs)
+
+
+class RouteGroupJWTAuthentication(JWTAuthentication):
+    """JWT authentication that leaves requests of unauthenticated route groups anonymous."""
+
+    def authenticate(self, request):
+        group = get_route_group(request._request)
+        if group is not None and not group.get('authenticate', True):
+            return None
+        return super().authenticate(request)
@@ -0,0 +1,44 @@
+from rest_framework import serializers
+
+
+def _names(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    ModelSerializer mixin for sparse fieldsets on GET requests.
+
+    ``?fields=a,b`` keeps only those fields and ``?exclude=c`` drops fields of
+    the top-level serializer. ``?projection=listing`` switches every
+    serializer in the tree to its ``Meta.listing_fields``, the lighter set
+    every public serializer declares, which leaves out the rich-text
+    columns. The projection is opt-in, so responses without it keep their
+    full shape. Since ``plan_queryset`` plans from the same fields,
+    unselected columns and relations are not loaded either.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return fields
+        params = getattr(request, 'query_params', request.GET)
+
+        listing_fields = getattr(self.Meta, 'listing_fields', None)
+        if params.get('projection') == 'listing' and listing_fields is not None:
+            fields = {name: field for name, field in fields.items() if name in listing_fields}
+
+        if self._is_top_level():
+            selected = _names(params.get('fields'))
+            if selected:
+                fields = {name: field for name, field in fields.items() if name in selected}
+            for name in _names(params.get('exclude')):
+                fields.pop(name, None)
+        return fields
+
+    def _is_top_level(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
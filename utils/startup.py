@@ -0,0 +1,115 @@
+"""
+Worker start-up.
+
+``lazy_view`` keeps rarely used views with heavy imports (CKEditor's upload
+view pulls in Pillow) out of URLconf loading. ``warm_up`` does the work the
+first requests to a new worker would otherwise pay for: it loads and
+resolves the URLconf, builds every project serializer once and loads
+``WARMUP_PATHS`` in-process, which fills this worker's caches. ``wsgi.py``
+and ``asgi.py`` call it before the worker takes traffic when
+``WARMUP_ON_BOOT`` is on. ``manage.py profile_imports`` shows where boot
+time goes.
+"""
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver, resolve
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+
+from client.inprocess import render_get
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PROJECT_APPS = ('client', 'dashboard', 'academy')
+
+
+def lazy_view(dotted_path):
+    """
+    A view that imports ``dotted_path`` on its first call.
+
+    Attributes of the real view, such as ``csrf_exempt``, are not visible to
+    middleware, so use it only for views without them.
+    """
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path)
+        return view(request, *args, **kwargs)
+
+    wrapper.lazy_view_path = dotted_path
+    return wrapper
+
+
+def _subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def load_urls():
+    resolver = get_resolver()
+    resolver.url_patterns
+    resolver.reverse_dict
+    for path in settings.WARMUP_PATHS:
+        resolve(path.split('?')[0])
+
+
+def build_serializers():
+    """Build the fields of every project serializer, which fills Django's and DRF's model metadata caches."""
+    for serializer_class in set(_subclasses(serializers.Serializer)):
+        if serializer_class.__module__.split('.')[0] not in PROJECT_APPS:
+            continue
+        try:
+            serializer_class().fields
+        except Exception as e:
+            logger.debug(f"Could not build {serializer_class.__qualname__} on warmup: {e}")
+
+
+def load_paths():
+    for path in settings.WARMUP_PATHS:
+        response = render_get(path, settings.WARMUP_HOST, scheme=settings.WARMUP_SCHEME)
+        if inspect.isawaitable(response):
+            response = async_to_sync(_await)(response)
+            if callable(getattr(response, 'render', None)):
+                response.render()
+        if response.status_code >= 400:
+            logger.error(f"Warmup of {path} answered {response.status_code}")
+
+
+def _warm_up():
+    started = time.perf_counter()
+    for step in (load_urls, build_serializers, load_paths):
+        try:
+            step()
+        except Exception as e:
+            logger.error(f"Warmup step {step.__name__} failed: {e}")
+    # Hand connections back (to the pool, when pooled) before serving
+    connections.close_all()
+    logger.info(f"Worker warmed up in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+def warm_up():
+    """Load the URLconf, serializers and ``WARMUP_PATHS`` before taking traffic."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return _warm_up()
+    # Some ASGI servers import the application from inside their event loop,
+    # where the async views can't be run to completion. The worker isn't
+    # serving yet, so blocking the loop on a thread is fine.
+    thread = threading.Thread(target=_warm_up, name='warmup')
+    thread.start()
+    thread.join()
@@ -0,0 +1,138 @@
+from django.conf import settings
+from django.db import models, transaction
+from django.views.static import serve
+from utils.batching import DebouncedBatch
+
+import json
+import logging
+import threading
+import urllib.request
+
+logger = logging.getLogger(__name__)
+
+
+def model_key(model):
+    """Surrogate key shared by every response listing rows of ``model``."""
+    return model._meta.db_table
+
+
+def object_key(model, pk):
+    """Surrogate key of a response built around a single row."""
+    return f"{model._meta.db_table}/{pk}"
+
+
+def media_key(name):
+    return f"media/{name}"
+
+
+def instance_keys(instance):
+    """
+    Keys to purge when ``instance`` is saved or deleted: its own object key,
+    the list key of its table, the object keys of the rows it points to
+    (a case study detail embeds its expertise items) and its media files.
+    """
+    model = type(instance)
+    keys = {model_key(model), object_key(model, instance.pk)}
+    for field in model._meta.concrete_fields:
+        if isinstance(field, models.ForeignKey):
+            value = getattr(instance, field.attname)
+            if value is not None:
+                keys.add(object_key(field.related_model, value))
+        elif isinstance(field, models.FileField):
+            file = getattr(instance, field.attname)
+            if file and file.name:
+                keys.add(media_key(file.name))
+    return keys
+
+
+def tag_response(response, keys):
+    """Attach surrogate keys for Fastly-style and Cloudflare-style CDNs."""
+    if not keys:
+        return response
+    response['Surrogate-Key'] = ' '.join(keys)
+    response['Cache-Tag'] = ','.join(keys)
+    max_age = getattr(settings, 'CDN_SURROGATE_MAX_AGE', None)
+    if max_age:
+        response['Surrogate-Control'] = f"max-age={max_age}"
+    return response
+
+
+def serve_media(request, path, document_root=None, show_indexes=False):
+    """``django.views.static.serve`` with the file's surrogate key attached."""
+    response = serve(request, path, document_root=document_root, show_indexes=show_indexes)
+    return tag_response(response, ['media', media_key(path)])
+
+
+class PurgeDispatcher:
+    """
+    Batch and debounce surrogate-key purges to the CDN.
+
+    Keys are collected until no new key has arrived for ``debounce`` seconds
+    (or ``max_delay`` seconds after the first one, whichever comes first), and
+    then sent to ``url`` as ``{"surrogate_keys": [...]}`` in batches of at most
+    ``batch_size`` keys. Sending happens on a daemon thread, so model saves
+    never wait on the CDN.
+    """
+
+    def __init__(self, url, token=None, debounce=2.0, max_delay=10.0, batch_size=256, timeout=5):
+        self.url = url
+        self.token = token
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._batch = DebouncedBatch(
+            lambda keys: self._send(sorted(keys)),
+            debounce=debounce, max_delay=max_delay, name='cdn-purge',
+        )
+
+    def enqueue(self, keys):
+        self._batch.add(keys)
+
+    def flush(self):
+        """Send everything pending right away."""
+        self._batch.flush()
+
+    def _send(self, keys):
+        for start in range(0, len(keys), self.batch_size):
+            batch = keys[start:start + self.batch_size]
+            request = urllib.request.Request(
+                self.url,
+                data=json.dumps({"surrogate_keys": batch}).encode(),
+                headers={'Content-Type': 'application/json'},
+                method='POST',
+            )
+            if self.token:
+                request.add_header('Authorization', f"Bearer {self.token}")
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    response.read()
+            except Exception as e:
+                logger.error(f"Error purging {len(batch)} surrogate keys: {str(e)}")
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_purge_dispatcher():
+    """Process-wide dispatcher, or ``None`` when no purge endpoint is configured."""
+    global _dispatcher
+    url = getattr(settings, 'CDN_PURGE_URL', None)
+    if not url:
+        return None
+    with _dispatcher_lock:
+        if _dispatcher is None or _dispatcher.url != url:
+            _dispatcher = PurgeDispatcher(
+                url,
+                token=getattr(settings, 'CDN_PURGE_TOKEN', None),
+                debounce=getattr(settings, 'CDN_PURGE_DEBOUNCE', 2.0),
+                max_delay=getattr(settings, 'CDN_PURGE_MAX_DELAY', 10.0),
+            )
+        return _dispatcher
+
+
+def purge_keys(keys):
+    """Queue ``keys`` for purging once the current transaction commits."""
+    dispatcher = get_purge_dispatcher()
+    if dispatcher is not None and keys:
+        keys = set(keys)
+        transaction.on_commit(lambda: dispatcher.enqueue(keys))